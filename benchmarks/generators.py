@@ -0,0 +1,162 @@
+"""
+Seeded workload generators. The same (size, seed) always yields the same
+framework or dialogue, so timings from different runs are comparable.
+"""
+import math
+import random
+from typing import List, Tuple
+from warrant_mcp.core.types import SpeechAct
+
+Edges = List[Tuple[str, str]]
+
+def _names(n: int) -> List[str]:
+    return [f"a{i}" for i in range(n)]
+
+def erdos_renyi(n: int, p: float, seed: int) -> Tuple[List[str], Edges]:
+    """
+    Every ordered pair (self-attacks included) is an attack with
+    probability p. Gaps between attacks are drawn geometrically
+    (Batagelj & Brandes 2005), so sparse graphs cost O(n + attacks).
+    """
+    rng = random.Random(seed)
+    args = _names(n)
+    if p <= 0:
+        return args, []
+    total = n * n
+    if p >= 1:
+        return args, [(a, b) for a in args for b in args]
+    log_q = math.log(1.0 - p)
+    attacks = []
+    k = -1
+    while True:
+        k += 1 + int(math.log(1.0 - rng.random()) / log_q)
+        if k >= total:
+            return args, attacks
+        attacks.append((args[k // n], args[k % n]))
+
+def barabasi_albert(n: int, m: int, seed: int) -> Tuple[List[str], Edges]:
+    # Preferential attachment: each new argument attacks or is attacked by
+    # m existing ones, chosen in proportion to their degree
+    rng = random.Random(seed)
+    args = _names(n)
+    targets: List[int] = list(range(min(m, n)))
+    endpoints: List[int] = []
+    attacks = set()
+    for i in range(len(targets), n):
+        for j in set(targets):
+            pair = (i, j) if rng.random() < 0.5 else (j, i)
+            attacks.add(pair)
+            endpoints.extend(pair)
+        targets = [rng.choice(endpoints) for _ in range(m)]
+    return args, sorted((args[a], args[b]) for a, b in attacks)
+
+def grid(n: int, seed: int) -> Tuple[List[str], Edges]:
+    # Square grid, each neighbour pair attacking one way or both ways
+    rng = random.Random(seed)
+    side = max(1, int(n ** 0.5))
+    args = [f"g{r}_{c}" for r in range(side) for c in range(side)]
+    attacks = []
+    for r in range(side):
+        for c in range(side):
+            for dr, dc in ((0, 1), (1, 0)):
+                if r + dr < side and c + dc < side:
+                    a, b = f"g{r}_{c}", f"g{r + dr}_{c + dc}"
+                    kind = rng.random()
+                    if kind < 0.4:
+                        attacks.append((a, b))
+                    elif kind < 0.8:
+                        attacks.append((b, a))
+                    else:
+                        attacks += [(a, b), (b, a)]
+    return args, attacks
+
+def iccma(n: int, seed: int, cluster: int = 8) -> Tuple[List[str], Edges]:
+    """
+    ICCMA-style instance: dense strongly connected clusters chained by
+    sparse attacks from earlier to later clusters, with a few self-attacks.
+    Mutual attacks inside clusters make preferred semantics branch.
+    """
+    rng = random.Random(seed)
+    args = _names(n)
+    attacks = set()
+    for start in range(0, n, cluster):
+        members = range(start, min(start + cluster, n))
+        for a in members:
+            for b in members:
+                if a != b and rng.random() < 0.35:
+                    attacks.add((a, b))
+            if rng.random() < 0.02:
+                attacks.add((a, a))
+            if start and rng.random() < 0.5:
+                attacks.add((rng.randrange(start), a))
+    return args, sorted((args[a], args[b]) for a, b in attacks)
+
+def bipolar(n: int, p: float, q: float, seed: int) -> Tuple[List[str], Edges, Edges]:
+    # Random attacks with probability p and acyclic supports with probability q
+    rng = random.Random(seed)
+    args, attacks = erdos_renyi(n, p, rng.randrange(1 << 30))
+    supports = [
+        (args[a], args[b])
+        for a in range(n)
+        for b in range(a + 1, n)
+        if rng.random() < q
+    ]
+    return args, attacks, supports
+
+def dialogue(n: int, seed: int) -> List[SpeechAct]:
+    """
+    A legal persuasion dialogue of `n` moves between P and O: claims,
+    counter-claims and deep why/since chains, with some concessions and
+    retractions that close branches.
+    """
+    rng = random.Random(seed)
+    moves: List[SpeechAct] = []
+    fresh = iter(range(n * 4))
+
+    def prop() -> str:
+        return f"p{next(fresh)}"
+
+    while len(moves) < n:
+        last = moves[-1] if moves else None
+        if last is None or last.act in ("concede", "retract"):
+            moves.append(SpeechAct("P", "claim", prop()))
+            continue
+        other = "O" if last.speaker == "P" else "P"
+        roll = rng.random()
+        if last.act == "claim":
+            if roll < 0.6:
+                moves.append(SpeechAct(other, "why", last.content))
+            elif roll < 0.9:
+                moves.append(SpeechAct(other, "claim", prop()))
+            else:
+                moves.append(SpeechAct(other, "concede", last.content))
+        elif last.act == "why":
+            if roll < 0.9:
+                premises = [prop() for _ in range(rng.randint(1, 3))]
+                moves.append(SpeechAct(other, "since", last.content, premises))
+            else:
+                moves.append(SpeechAct(other, "retract", last.content))
+        else:
+            # After since: challenge a premise or concede the conclusion
+            if roll < 0.85:
+                moves.append(SpeechAct(other, "why", rng.choice(last.premises)))
+            else:
+                moves.append(SpeechAct(other, "concede", last.content))
+    return moves
+
+CLAIM_WORDS = [
+    "expert", "says", "because", "therefore", "should", "will", "cause",
+    "similar", "like", "everyone", "believes", "sign", "indicates",
+    "already", "invested", "the", "a", "report", "policy", "data"
+]
+
+def claims(n: int, seed: int) -> List[Tuple[str, str]]:
+    # (claim, context) pairs sprinkled with scheme indicator words
+    rng = random.Random(seed)
+    return [
+        (
+            " ".join(rng.choices(CLAIM_WORDS, k=rng.randint(6, 14))),
+            " ".join(rng.choices(CLAIM_WORDS, k=rng.randint(0, 10)))
+        )
+        for _ in range(n)
+    ]
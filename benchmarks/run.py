@@ -0,0 +1,252 @@
+"""
+Time the core entry points on seeded workloads and compare with a baseline.
+
+    python -m benchmarks.run                        # all cases, default sizes
+    python -m benchmarks.run --quick                # smallest sizes only
+    python -m benchmarks.run --only grounded --only make_move
+    python -m benchmarks.run --output base.json
+    python -m benchmarks.run --baseline base.json   # exit 1 on a regression
+
+Each case builds its input untimed, then reports the minimum and median
+of `--repeat` timed calls, plus a small summary of the result so a changed
+answer shows up next to a changed timing.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import zlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+from warrant_mcp.core import bipolar, commitment_index, dung, gradual, prakken, walton
+from . import generators
+
+class Case(NamedTuple):
+    name: str
+    sizes: Sequence[int]
+    # size, seed -> input; input -> result summary
+    setup: Callable[[int, int], Any]
+    run: Callable[[Any], Any]
+
+def _af(args_attacks):
+    args, attacks = args_attacks
+    return dung.create_framework(args, attacks)
+
+def _sparse(n: int, seed: int):
+    # About two attacks per argument
+    return _af(generators.erdos_renyi(n, 2.0 / n, seed))
+
+def _dense(n: int, seed: int):
+    return _af(generators.erdos_renyi(n, 0.1, seed))
+
+def _replay(moves):
+    d = prakken.create_dialogue("persuasion", "benchmark", ["P", "O"])
+    for move in moves:
+        if not prakken.is_valid_move(d, move):
+            raise ValueError(f"Generated an illegal move: {move}")
+        d = prakken.make_move(d, move)
+    return d.length
+
+def _commitments(n: int, seed: int):
+    # n dialogues over 1000 propositions, then 1000 lookups of random ones
+    index = commitment_index.create_index()
+    for i in range(n):
+        d = prakken.create_dialogue("persuasion", f"t{i % 50}", ["P", "O"])
+        commitment_index.register_dialogue(index, d)
+        prakken.make_move(d, prakken.SpeechAct("P", "claim", f"p{i % 1000}"), index)
+    rng = random.Random(seed)
+    return index, [f"p{rng.randrange(1000)}" for _ in range(1000)]
+
+def _query(index_props):
+    index, props = index_props
+    return sum(
+        commitment_index.query_commitments(index, proposition=p, limit=5)["count"]
+        for p in props
+    )
+
+def _count(extensions):
+    return len(extensions)
+
+CASES: List[Case] = [
+    Case("grounded_extension/er", (1000, 10000, 50000), _sparse,
+         lambda af: len(dung.grounded_extension(af))),
+    Case("grounded_extension/ba", (1000, 10000, 50000),
+         lambda n, s: _af(generators.barabasi_albert(n, 2, s)),
+         lambda af: len(dung.grounded_extension(af))),
+    Case("grounded_extension/grid", (900, 10000, 40000),
+         lambda n, s: _af(generators.grid(n, s)),
+         lambda af: len(dung.grounded_extension(af))),
+    Case("grounded_extension/iccma", (1000, 10000, 50000),
+         lambda n, s: _af(generators.iccma(n, s)),
+         lambda af: len(dung.grounded_extension(af))),
+    Case("preferred_extensions/er", (25, 50, 100), _dense,
+         lambda af: _count(dung.preferred_extensions(af))),
+    Case("preferred_extensions/grid", (16, 36, 49),
+         lambda n, s: _af(generators.grid(n, s)),
+         lambda af: _count(dung.preferred_extensions(af))),
+    Case("preferred_extensions/iccma", (25, 50, 100),
+         lambda n, s: _af(generators.iccma(n, s)),
+         lambda af: _count(dung.preferred_extensions(af))),
+    Case("h_categorizer/er", (25, 50, 100), _sparse,
+         lambda af: round(sum(gradual.h_categorizer(af).values()), 6)),
+    Case("h_categorizer/ba", (25, 50, 100),
+         lambda n, s: _af(generators.barabasi_albert(n, 2, s)),
+         lambda af: round(sum(gradual.h_categorizer(af).values()), 6)),
+    Case("counting_semantics/er", (25, 50, 100), _sparse,
+         lambda af: round(sum(gradual.counting_semantics(af).values()), 6)),
+    Case("flatten_to_af/bipolar", (100, 500, 2000),
+         lambda n, s: bipolar.create_bipolar_framework(
+             *generators.bipolar(n, 2.0 / n, 1.0 / n, s)),
+         lambda baf: len(bipolar.flatten_to_af(baf).attacks)),
+    Case("make_move/dialogue", (100, 1000, 10000), generators.dialogue, _replay),
+    Case("query_commitments/index", (1000, 10000, 50000), _commitments, _query),
+    Case("identify_scheme/claims", (100, 1000, 10000), generators.claims,
+         lambda pairs: sum(len(walton.identify_scheme(c, x)) for c, x in pairs)),
+]
+
+def case_seed(seed: int, name: str, size: int) -> int:
+    # Stable across runs and Python versions, unlike hash()
+    return zlib.crc32(f"{seed}:{name}:{size}".encode()) ^ seed
+
+def run_case(case: Case, size: int, seed: int, repeat: int) -> Dict[str, Any]:
+    data = case.setup(size, case_seed(seed, case.name, size))
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = case.run(data)
+        timings.append(time.perf_counter() - start)
+    return {
+        "benchmark": case.name,
+        "size": size,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "repeat": repeat,
+        "result": result
+    }
+
+def run_suite(
+    only: Optional[List[str]] = None,
+    sizes: Optional[List[int]] = None,
+    quick: bool = False,
+    seed: int = 0,
+    repeat: int = 3,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    results = []
+    for case in CASES:
+        if only and not any(o in case.name for o in only):
+            continue
+        for size in sizes or (case.sizes[:1] if quick else case.sizes):
+            record = run_case(case, size, seed, repeat)
+            results.append(record)
+            if progress:
+                progress(record)
+    return {"meta": environment(seed, repeat), "results": results}
+
+def environment(seed: int, repeat: int) -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "seed": seed,
+        "repeat": repeat,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    }
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = 0.25
+) -> List[Dict[str, Any]]:
+    """
+    Pair results by (benchmark, size). A case is "slower" or "faster" when
+    its median moved by more than `threshold` (0.25 = 25%), and "changed"
+    when it computed a different result.
+    """
+    base = {(r["benchmark"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["benchmark"], r["size"]))
+        if b is None:
+            continue
+        ratio = r["median"] / b["median"] if b["median"] else float("inf")
+        if r["result"] != b["result"]:
+            status = "changed"
+        elif ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "same"
+        rows.append({
+            "benchmark": r["benchmark"],
+            "size": r["size"],
+            "baseline": b["median"],
+            "median": r["median"],
+            "ratio": ratio,
+            "status": status
+        })
+    return rows
+
+def _print_record(record: Dict[str, Any]) -> None:
+    print(
+        f"{record['benchmark']:<32} {record['size']:>7}  "
+        f"median {record['median'] * 1000:10.2f} ms  "
+        f"min {record['min'] * 1000:10.2f} ms  result {record['result']}",
+        file=sys.stderr
+    )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="Run cases whose name contains this (repeatable)")
+    parser.add_argument("--sizes", type=int, nargs="+", help="Override the sizes of every case")
+    parser.add_argument("--quick", action="store_true", help="Only the smallest size of each case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    add_output_options(parser)
+    options = parser.parse_args(argv)
+
+    results = run_suite(
+        only=options.only,
+        sizes=options.sizes,
+        quick=options.quick,
+        seed=options.seed,
+        repeat=options.repeat,
+        progress=_print_record
+    )
+    return report(results, options)
+
+def add_output_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare with a results file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative change of the median reported as slower/faster")
+
+def report(results: Dict[str, Any], options: argparse.Namespace) -> int:
+    # Write the results, then exit 1 if the baseline shows a regression
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if not options.baseline:
+        return 0
+    with open(options.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(results, baseline, options.threshold)
+    for row in rows:
+        print(
+            f"{row['benchmark']:<32} {row['size']:>7}  {row['ratio']:6.2f}x  {row['status']}",
+            file=sys.stderr
+        )
+    return 1 if any(r["status"] in ("slower", "changed") for r in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Cold-start cost of warrant-mcp, each sample in a fresh interpreter.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --baseline startup.json
+
+Cases:
+    startup/import_mcp       import mcp.server.fastmcp alone (the floor)
+    startup/import_server    import warrant_mcp.server; the result is the
+                             number of core modules that actually ran
+    startup/first_response   spawn the stdio server until it answers
+                             initialize and a first tools/call
+    startup/solve_cli        warrant-mcp solve --formats
+
+Results use the format of benchmarks.run, so --baseline works the same.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+from .run import add_output_options, environment, report, _print_record
+
+IMPORT_SERVER = """
+import sys, time
+start = time.perf_counter()
+import warrant_mcp.server
+elapsed = time.perf_counter() - start
+# Lazily imported modules that never ran are still _LazyModule instances
+loaded = [
+    m for m in list(sys.modules)
+    if m.startswith("warrant_mcp.core.") and type(sys.modules[m]).__name__ != "_LazyModule"
+]
+print(elapsed, len(loaded))
+"""
+
+IMPORT_MCP = """
+import time
+start = time.perf_counter()
+import mcp.server.fastmcp
+print(time.perf_counter() - start, 0)
+"""
+
+def _python(code: str) -> List[float]:
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return [float(x) for x in out]
+
+def _message(proc: subprocess.Popen, payload: Dict[str, Any]) -> None:
+    proc.stdin.write(json.dumps(payload) + "\n")
+    proc.stdin.flush()
+
+def _response(proc: subprocess.Popen, request_id: int) -> Dict[str, Any]:
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before answering")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+def first_response() -> float:
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "from warrant_mcp.server import main; main()"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, env=dict(os.environ, PYTHONWARNINGS="ignore")
+    )
+    try:
+        _message(proc, {
+            "jsonrpc": "2.0", "id": 1, "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {},
+                "clientInfo": {"name": "startup-benchmark", "version": "0"}
+            }
+        })
+        _response(proc, 1)
+        _message(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _message(proc, {
+            "jsonrpc": "2.0", "id": 2, "method": "tools/call",
+            "params": {"name": "list_schemes", "arguments": {}}
+        })
+        reply = _response(proc, 2)
+        if reply.get("error") or reply["result"].get("isError"):
+            raise RuntimeError(f"tool call failed: {reply}")
+        return time.perf_counter() - start
+    finally:
+        proc.kill()
+        proc.wait()
+
+def solve_cli() -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import sys; sys.argv[1:] = ['solve', '--formats'];"
+         " import warrant_mcp; warrant_mcp.main()"],
+        capture_output=True, check=True
+    )
+    return time.perf_counter() - start
+
+CASES: Dict[str, Callable[[], Any]] = {
+    "startup/import_mcp": lambda: _python(IMPORT_MCP),
+    "startup/import_server": lambda: _python(IMPORT_SERVER),
+    "startup/first_response": lambda: [first_response(), 0],
+    "startup/solve_cli": lambda: [solve_cli(), 0],
+}
+
+def run_startup(repeat: int = 5, only: Optional[List[str]] = None) -> Dict[str, Any]:
+    results = {"meta": environment(0, repeat), "results": []}
+    for name, case in CASES.items():
+        if only and not any(o in name for o in only):
+            continue
+        samples = [case() for _ in range(repeat)]
+        timings = [s[0] for s in samples]
+        record = {
+            "benchmark": name,
+            "size": 0,
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "repeat": repeat,
+            "result": int(samples[-1][1])
+        }
+        results["results"].append(record)
+        _print_record(record)
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", help="Run cases whose name contains this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5)
+    add_output_options(parser)
+    options = parser.parse_args(argv)
+    return report(run_startup(options.repeat, options.only), options)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,10 @@
+import sys
+
 def main() -> None:
-    print("Hello from warrant-mcp!")
+    # `warrant-mcp solve ...` runs the offline solver, anything else the server
+    args = sys.argv[1:]
+    if args and args[0] == "solve":
+        from .solve import main as solve
+        sys.exit(solve(args[1:]))
+    from .server import main as serve
+    serve()
@@ -1,6 +1,12 @@
-from typing import List, Dict, Union
+import re
+from itertools import product
+from typing import List, Dict, Union, Optional, Set, Tuple, Any, FrozenSet
 from dataclasses import dataclass
-from .types import DisagreementDiagnosis, DisagreementType
+from .types import (
+    DisagreementDiagnosis, DisagreementType, Rule, AspicTheory,
+    AspicArgument, AspicAttack, ArgumentSystem
+)
+from . import cancel, dung, spans
 
 @dataclass
 class AgentPosition:
@@ -22,85 +28,208 @@ class AgentPosition:
             goals=data.get("goals", [])
         )
 
+DIAGNOSES: Dict[str, Tuple[str, str]] = {
+    "preferential": (
+        "Agents agree on the conclusion but disagree on what matters most.",
+        "Negotiate criteria weights or defer to stakeholder priorities."
+    ),
+    "goal_conflict": (
+        "Agents have fundamentally incompatible goals.",
+        "Escalate to human decision-maker. This cannot be resolved by further evidence or reasoning alone."
+    ),
+    "factual": (
+        "Agents are working from different evidence bases.",
+        "Share evidence and verify facts. The agent with stronger evidence should prevail."
+    ),
+    "inferential": (
+        "Agents share similar evidence but draw different conclusions due to different reasoning rules.",
+        "Examine the inference rules. Identify which rules are strict vs defeasible. The more specific rule typically takes priority."
+    )
+}
+
+@dataclass(frozen=True)
+class NormalizedPosition:
+    agent: str
+    claim: str
+    # Item -> multiplicity; list lengths keep duplicates as the lists did
+    premises: Dict[str, int]
+    premise_count: int
+    priorities: Dict[str, int]
+    priority_count: int
+    # Goals as (text without "not_", negated) keys
+    goals: FrozenSet[Tuple[str, bool]]
+
+def _counts(items: List[str]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for item in items:
+        counts[item] = counts.get(item, 0) + 1
+    return counts
+
+def goal_key(goal: str) -> Tuple[str, bool]:
+    return goal.replace("not_", ""), goal.startswith("not_")
+
+def normalize_position(data: Union[Dict, AgentPosition]) -> NormalizedPosition:
+    pos = data if isinstance(data, AgentPosition) else AgentPosition.from_dict(data)
+    return NormalizedPosition(
+        agent=pos.agent,
+        claim=pos.claim,
+        premises=_counts(pos.premises),
+        premise_count=len(pos.premises),
+        priorities=_counts(pos.priorities),
+        priority_count=len(pos.priorities),
+        goals=frozenset(goal_key(g) for g in pos.goals)
+    )
+
+def _overlap(a: Dict[str, int], b: Dict[str, int]) -> int:
+    # Items of a (with multiplicity) that also occur in b
+    if len(a) > len(b):
+        return sum(a[x] for x in b if x in a)
+    return sum(n for x, n in a.items() if x in b)
+
+def _goals_conflict(a: NormalizedPosition, b: NormalizedPosition) -> bool:
+    return any((base, not negated) in b.goals for base, negated in a.goals)
+
+def _classify(
+    a: NormalizedPosition,
+    b: NormalizedPosition,
+    priority_overlap: int,
+    goal_conflict: bool,
+    shared_premises: int
+) -> DisagreementType:
+    # Different claim strings conflict; "X" vs "not_X" differ as strings too
+    if a.claim == b.claim:
+        min_len = min(a.priority_count, b.priority_count)
+        if min_len > 0 and priority_overlap < min_len:
+            return "preferential"
+
+    if goal_conflict:
+        return "goal_conflict"
+
+    max_len = max(a.premise_count, b.premise_count, 1)
+    if shared_premises / max_len < 0.5:
+        return "factual"
+    return "inferential"
+
+def make_diagnosis(type: DisagreementType, agent_a: str, agent_b: str) -> DisagreementDiagnosis:
+    description, resolution = DIAGNOSES[type]
+    return DisagreementDiagnosis(
+        type=type,
+        description=description,
+        resolution=resolution,
+        agentA=agent_a,
+        agentB=agent_b
+    )
+
 def diagnose_disagreement(
     pos_a_data: Union[Dict, AgentPosition],
     pos_b_data: Union[Dict, AgentPosition]
 ) -> DisagreementDiagnosis:
-    
-    pos_a = pos_a_data if isinstance(pos_a_data, AgentPosition) else AgentPosition.from_dict(pos_a_data)
-    pos_b = pos_b_data if isinstance(pos_b_data, AgentPosition) else AgentPosition.from_dict(pos_b_data)
+    a = normalize_position(pos_a_data)
+    b = normalize_position(pos_b_data)
+    kind = _classify(
+        a, b,
+        _overlap(a.priorities, b.priorities),
+        _goals_conflict(a, b),
+        _overlap(a.premises, b.premises)
+    )
+    return make_diagnosis(kind, a.agent, b.agent)
 
-    # Check if claims are compatible
-    # Basic check: "not_X" vs "X"
-    a_negated = pos_a.claim.startswith("not_")
-    b_negated = pos_b.claim.startswith("not_")
-    
-    # If claim strings are different OR same string but different polarity (unlikely with just startswith not_)
-    # Logic: if "A" vs "not_A", they conflict.
-    # If "Use SQL" vs "Use NoSQL", they conflict (different strings, neither negated)
-    
-    # Let's align with TS logic:
-    # const claimsConflict = posA.claim !== posB.claim || posA.claim.startsWith("not_") !== posB.claim.startsWith("not_");
-    
-    claims_conflict = (pos_a.claim != pos_b.claim) or (a_negated != b_negated)
-
-    if not claims_conflict:
-        # Same claim but different priorities
-        priority_overlap = [p for p in pos_a.priorities if p in pos_b.priorities]
-        min_len = min(len(pos_a.priorities), len(pos_b.priorities))
-        
-        if min_len > 0 and len(priority_overlap) < min_len:
-            return DisagreementDiagnosis(
-                type="preferential",
-                description="Agents agree on the conclusion but disagree on what matters most.",
-                resolution="Negotiate criteria weights or defer to stakeholder priorities.",
-                agentA=pos_a.agent,
-                agentB=pos_b.agent
+def _pair_overlaps(
+    positions: List[NormalizedPosition],
+    field_name: str
+) -> Dict[Tuple[int, int], int]:
+    # Inverted index item -> agents; only pairs sharing an item are touched
+    holders: Dict[str, List[int]] = {}
+    for i, pos in enumerate(positions):
+        for item in getattr(pos, field_name):
+            holders.setdefault(item, []).append(i)
+    overlap: Dict[Tuple[int, int], int] = {}
+    for item, agents in holders.items():
+        for x, i in enumerate(agents):
+            n = getattr(positions[i], field_name)[item]
+            for j in agents[x + 1:]:
+                overlap[(i, j)] = overlap.get((i, j), 0) + n
+    return overlap
+
+def _goal_conflicts(positions: List[NormalizedPosition]) -> Set[Tuple[int, int]]:
+    by_key: Dict[Tuple[str, bool], List[int]] = {}
+    for i, pos in enumerate(positions):
+        for key in pos.goals:
+            by_key.setdefault(key, []).append(i)
+    pairs = set()
+    for (base, negated), agents in by_key.items():
+        if negated:
+            continue
+        for i in agents:
+            for j in by_key.get((base, True), ()):
+                if i != j:
+                    pairs.add((min(i, j), max(i, j)))
+    return pairs
+
+def _components(n: int, pairs: List[Tuple[int, int]]) -> List[List[int]]:
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in pairs:
+        parent[find(i)] = find(j)
+    groups: Dict[int, List[int]] = {}
+    for i in {x for pair in pairs for x in pair}:
+        groups.setdefault(find(i), []).append(i)
+    return sorted(sorted(g) for g in groups.values())
+
+def diagnose_panel(
+    positions_data: List[Union[Dict, AgentPosition]]
+) -> Dict[str, Any]:
+    """
+    Diagnose every pair of a panel at once. Cell (i, j) for i < j is what
+    diagnose_disagreement(agents[i], agents[j]) returns; the matrix is
+    mirrored. Positions are normalized once, and premise, priority and
+    goal overlaps come from inverted indexes rather than pairwise scans.
+    """
+    positions = [normalize_position(p) for p in positions_data]
+    n = len(positions)
+    premise_overlap = _pair_overlaps(positions, "premises")
+    priority_overlap = _pair_overlaps(positions, "priorities")
+    goal_conflicts = _goal_conflicts(positions)
+
+    matrix: List[List[Optional[str]]] = [[None] * n for _ in range(n)]
+    by_type: Dict[str, List[Tuple[int, int]]] = {t: [] for t in DIAGNOSES}
+    for i in range(n):
+        a = positions[i]
+        for j in range(i + 1, n):
+            kind = _classify(
+                a, positions[j],
+                priority_overlap.get((i, j), 0),
+                (i, j) in goal_conflicts,
+                premise_overlap.get((i, j), 0)
             )
+            matrix[i][j] = matrix[j][i] = kind
+            by_type[kind].append((i, j))
 
-    # Check for goal conflicts
-    goal_conflict = False
-    for g in pos_a.goals:
-        for g2 in pos_b.goals:
-            # Check for direct negation "X" vs "not_X"
-            g_clean = g.replace("not_", "")
-            g2_clean = g2.replace("not_", "")
-            if g_clean == g2_clean and (g.startswith("not_") != g2.startswith("not_")):
-                goal_conflict = True
-                break
-        if goal_conflict:
-            break
-            
-    if goal_conflict:
-        return DisagreementDiagnosis(
-            type="goal_conflict",
-            description="Agents have fundamentally incompatible goals.",
-            resolution="Escalate to human decision-maker. This cannot be resolved by further evidence or reasoning alone.",
-            agentA=pos_a.agent,
-            agentB=pos_b.agent
-        )
-        
-    # Check for factual disagreement
-    shared_premises = [p for p in pos_a.premises if p in pos_b.premises]
-    max_len = max(len(pos_a.premises), len(pos_b.premises), 1)
-    premise_overlap_ratio = len(shared_premises) / max_len
-    
-    if premise_overlap_ratio < 0.5:
-        return DisagreementDiagnosis(
-            type="factual",
-            description="Agents are working from different evidence bases.",
-            resolution="Share evidence and verify facts. The agent with stronger evidence should prevail.",
-            agentA=pos_a.agent,
-            agentB=pos_b.agent
-        )
-        
-    return DisagreementDiagnosis(
-        type="inferential",
-        description="Agents share similar evidence but draw different conclusions due to different reasoning rules.",
-        resolution="Examine the inference rules. Identify which rules are strict vs defeasible. The more specific rule typically takes priority.",
-        agentA=pos_a.agent,
-        agentB=pos_b.agent
-    )
+    names = [p.agent for p in positions]
+    camps: Dict[str, List[str]] = {}
+    for p in positions:
+        camps.setdefault(p.claim, []).append(p.agent)
+    return {
+        "agents": names,
+        "matrix": matrix,
+        "counts": {t: len(pairs) for t, pairs in by_type.items()},
+        # Agents linked (transitively) by pairs of each disagreement type
+        "clusters": {
+            t: [[names[i] for i in group] for group in _components(n, pairs)]
+            for t, pairs in by_type.items()
+        },
+        "camps": camps,
+        "types": {
+            t: {"description": d, "resolution": r}
+            for t, (d, r) in DIAGNOSES.items()
+        }
+    }
 
 def suggest_resolution(diagnosis: DisagreementDiagnosis) -> List[str]:
     strategies = {
@@ -129,3 +258,295 @@ def suggest_resolution(diagnosis: DisagreementDiagnosis) -> List[str]:
     }
     
     return strategies.get(diagnosis.type, [])
+
+# ASPIC+ argument construction
+
+MAX_ARGUMENTS = 100000
+
+_RULE_PATTERN = re.compile(r"^(?:\s*([\w.-]+)\s*:)?(.*?)(=>|->)(.*)$")
+
+def negate(literal: str) -> str:
+    return literal[4:] if literal.startswith("not_") else "not_" + literal
+
+def parse_rule(entry: Union[str, Dict[str, Any]], default_name: str) -> Rule:
+    """
+    Parse "r1: a, b => c" (defeasible) or "a, b -> c" (strict), or a dict
+    with antecedents, conclusion, type and an optional name.
+    """
+    if isinstance(entry, dict):
+        conclusion = entry.get("conclusion")
+        if not conclusion:
+            raise ValueError(f"Rule without conclusion: {entry}")
+        rule_type = entry.get("type", "defeasible")
+        if rule_type not in ["strict", "defeasible"]:
+            raise ValueError(f"Unknown rule type: {rule_type}")
+        return Rule(
+            name=entry.get("name") or default_name,
+            antecedents=tuple(entry.get("antecedents", [])),
+            conclusion=conclusion,
+            type=rule_type
+        )
+
+    m = _RULE_PATTERN.match(entry)
+    if not m or not m.group(4).strip():
+        raise ValueError(f"Cannot parse rule: {entry!r}. Use 'a, b => c' or 'a, b -> c'")
+    name, body, arrow, head = m.groups()
+    return Rule(
+        name=name or default_name,
+        antecedents=tuple(a.strip() for a in body.split(",") if a.strip()),
+        conclusion=head.strip(),
+        type="defeasible" if arrow == "=>" else "strict"
+    )
+
+def parse_preferences(preferences: List[str]) -> Dict[str, Set[str]]:
+    # "x > y" or "y < x": x is strictly preferred; closed transitively
+    direct: Dict[str, Set[str]] = {}
+    for p in preferences:
+        if ">" in p:
+            high, low = p.split(">", 1)
+        elif "<" in p:
+            low, high = p.split("<", 1)
+        else:
+            raise ValueError(f"Cannot parse preference: {p!r}. Use 'x > y'")
+        direct.setdefault(low.strip(), set()).add(high.strip())
+
+    better: Dict[str, Set[str]] = {}
+    for x in direct:
+        seen = set()
+        stack = list(direct[x])
+        while stack:
+            y = stack.pop()
+            if y not in seen:
+                seen.add(y)
+                stack.extend(direct.get(y, ()))
+        better[x] = seen
+    return better
+
+def create_theory(
+    premises: List[str],
+    rules: List[Union[str, Dict[str, Any]]],
+    axioms: Optional[List[str]] = None,
+    preferences: Optional[List[str]] = None
+) -> AspicTheory:
+    parsed: Dict[str, Rule] = {}
+    for i, entry in enumerate(rules):
+        rule = parse_rule(entry, f"r{i + 1}")
+        if rule.name in parsed:
+            raise ValueError(f"Duplicate rule name: {rule.name}")
+        parsed[rule.name] = rule
+    return AspicTheory(
+        axioms=set(axioms or []),
+        premises=set(premises) - set(axioms or []),
+        rules=parsed,
+        better=parse_preferences(preferences or [])
+    )
+
+def build_arguments(
+    theory: AspicTheory,
+    max_arguments: int = MAX_ARGUMENTS
+) -> List[AspicArgument]:
+    """
+    Construct every non-circular argument by semi-naive forward chaining:
+    each round only combines rules with at least one argument from the
+    previous round, and sub-arguments are shared, never rebuilt.
+    """
+    arguments: List[AspicArgument] = []
+    by_conclusion: Dict[str, List[int]] = {}
+    seen: Set[Tuple[str, Tuple[int, ...]]] = set()
+
+    def add(argument: AspicArgument) -> None:
+        if len(arguments) >= max_arguments:
+            raise ValueError(f"More than {max_arguments} arguments; simplify the theory")
+        arguments.append(argument)
+        by_conclusion.setdefault(argument.conclusion, []).append(argument.id)
+
+    for literal in sorted(theory.axioms | theory.premises):
+        axiom = literal in theory.axioms
+        add(AspicArgument(
+            id=len(arguments),
+            conclusion=literal,
+            rule=None,
+            subs=(),
+            conclusions=frozenset([literal]),
+            last_rules=frozenset(),
+            premises=frozenset() if axiom else frozenset([literal]),
+            axiom=axiom
+        ))
+
+    by_antecedent: Dict[str, List[Tuple[Rule, int]]] = {}
+    for rule in theory.rules.values():
+        if not rule.antecedents:
+            # Rules without antecedents fire once, in the first round
+            continue
+        for i, a in enumerate(rule.antecedents):
+            by_antecedent.setdefault(a, []).append((rule, i))
+
+    def combine(rule: Rule, subs: Tuple[int, ...]) -> None:
+        key = (rule.name, subs)
+        if key in seen:
+            return
+        seen.add(key)
+        children = [arguments[i] for i in subs]
+        conclusions = frozenset().union(*(c.conclusions for c in children))
+        # Non-circular: no sub-argument may already conclude the head
+        if rule.conclusion in conclusions:
+            return
+        if rule.type == "defeasible":
+            last = frozenset([rule.name])
+        else:
+            last = frozenset().union(*(c.last_rules for c in children))
+        new_id = len(arguments)
+        add(AspicArgument(
+            id=new_id,
+            conclusion=rule.conclusion,
+            rule=rule.name,
+            subs=subs,
+            conclusions=conclusions | {rule.conclusion},
+            last_rules=last,
+            premises=frozenset().union(*(c.premises for c in children))
+        ))
+
+    for rule in theory.rules.values():
+        if not rule.antecedents:
+            combine(rule, ())
+
+    # old[x]: arguments for x from earlier rounds; known[x]: including delta
+    old: Dict[str, int] = {}
+    start = 0
+    while start < len(arguments):
+        end = len(arguments)
+        known = {c: len(ids) for c, ids in by_conclusion.items()}
+        for d in range(start, end):
+            cancel.check()
+            for rule, i in by_antecedent.get(arguments[d].conclusion, ()):
+                choices = []
+                for j, a in enumerate(rule.antecedents):
+                    if j == i:
+                        choices.append((d,))
+                    else:
+                        # Positions before i use older arguments only, so a
+                        # combination is produced once, at its first delta
+                        ids = by_conclusion.get(a, [])
+                        choices.append(ids[:old.get(a, 0) if j < i else known.get(a, 0)])
+                for subs in product(*choices):
+                    combine(rule, subs)
+        old = known
+        start = end
+    return arguments
+
+def _set_weaker(xs: FrozenSet[str], ys: FrozenSet[str], better: Dict[str, Set[str]]) -> bool:
+    # Elitist order: xs is weaker if some x is below every y
+    if not xs:
+        return False
+    if not ys:
+        return True
+    return any(all(y in better.get(x, ()) for y in ys) for x in xs)
+
+def is_weaker(a: AspicArgument, b: AspicArgument, theory: AspicTheory) -> bool:
+    # Last-link: compare last defeasible rules, or premises if both strict
+    if a.last_rules or b.last_rules:
+        return _set_weaker(a.last_rules, b.last_rules, theory.better)
+    return _set_weaker(a.premises, b.premises, theory.better)
+
+def compute_attacks(
+    theory: AspicTheory,
+    arguments: List[AspicArgument]
+) -> List[AspicAttack]:
+    by_conclusion: Dict[str, List[int]] = {}
+    by_rule: Dict[str, List[int]] = {}
+    for arg in arguments:
+        by_conclusion.setdefault(arg.conclusion, []).append(arg.id)
+        if arg.rule is not None:
+            by_rule.setdefault(arg.rule, []).append(arg.id)
+
+    attacks = []
+    for b in arguments:
+        if b.rule is None:
+            if b.axiom:
+                continue
+            kind = "undermining"
+        elif theory.rules[b.rule].type == "defeasible":
+            kind = "rebutting"
+        else:
+            # Conclusions of strict rules on top cannot be attacked directly
+            continue
+        for a in by_conclusion.get(negate(b.conclusion), ()):
+            attacker = arguments[a]
+            attacks.append(AspicAttack(
+                attacker=a,
+                target=b.id,
+                type=kind,
+                on=b.id,
+                defeat=not is_weaker(attacker, b, theory)
+            ))
+
+    # Undercutters conclude the negated name of a defeasible rule
+    for name, ids in by_rule.items():
+        if theory.rules[name].type != "defeasible":
+            continue
+        for a in by_conclusion.get(negate(name), ()):
+            for b in ids:
+                attacks.append(AspicAttack(
+                    attacker=a, target=b, type="undercutting", on=b, defeat=True
+                ))
+    return attacks
+
+def build_system(
+    theory: AspicTheory,
+    max_arguments: int = MAX_ARGUMENTS
+) -> ArgumentSystem:
+    with spans.span("construct"):
+        arguments = build_arguments(theory, max_arguments)
+    with spans.span("attacks"):
+        direct = compute_attacks(theory, arguments)
+    started = spans.start()
+
+    parents: Dict[int, List[int]] = {}
+    for arg in arguments:
+        for s in set(arg.subs):
+            parents.setdefault(s, []).append(arg.id)
+
+    defeaters: Dict[int, Set[int]] = {}
+    for attack in direct:
+        if attack.defeat:
+            defeaters.setdefault(attack.on, set()).add(attack.attacker)
+
+    # A defeat on a sub-argument defeats everything built on it
+    edges = set()
+    for on, attackers in defeaters.items():
+        reached = {on}
+        stack = [on]
+        while stack:
+            x = stack.pop()
+            for p in parents.get(x, ()):
+                if p not in reached:
+                    reached.add(p)
+                    stack.append(p)
+        for b in reached:
+            for a in attackers:
+                edges.add((a, b))
+
+    framework = dung.compile_edges(
+        [argument_name(a) for a in arguments], sorted(edges)
+    )
+    spans.stop("compile", started)
+    return ArgumentSystem(
+        theory=theory,
+        arguments=arguments,
+        attacks=direct,
+        framework=framework
+    )
+
+def argument_name(arg: AspicArgument) -> str:
+    return f"A{arg.id + 1}"
+
+def serialize_argument(arg: AspicArgument, arguments: List[AspicArgument]) -> Dict[str, Any]:
+    return {
+        "id": argument_name(arg),
+        "conclusion": arg.conclusion,
+        "rule": arg.rule,
+        "subArguments": [argument_name(arguments[i]) for i in arg.subs],
+        "premises": sorted(arg.premises),
+        "strict": not arg.last_rules,
+        "firm": not arg.premises
+    }
@@ -1,5 +1,9 @@
-from typing import Set, List, Tuple
-from .types import BipolarFramework, encode_relation, decode_relation
+from typing import Set, List, Tuple, Dict
+from .types import (
+    BipolarFramework, CompiledFramework, AdmissibilityType,
+    encode_relation, decode_relation
+)
+from . import dung, spans
 
 def create_bipolar_framework(
     args: List[str],
@@ -62,17 +66,85 @@ def get_secondary_attacks(
                 result.append({"attacker": attacker, "via": supporter})
     return result
 
+def support_closure(baf: BipolarFramework, index: Dict[str, int]) -> List[int]:
+    # closure[i] = bitmask of arguments reachable from i by one or more supports
+    successors = [[] for _ in index]
+    for rel in baf.supports:
+        from_node, to_node = decode_relation(rel)
+        if from_node in index and to_node in index:
+            successors[index[from_node]].append(index[to_node])
+
+    closure = [0] * len(index)
+    for start, direct in enumerate(successors):
+        if not direct:
+            continue
+        seen = 0
+        stack = list(direct)
+        while stack:
+            j = stack.pop()
+            if (seen >> j) & 1:
+                continue
+            seen |= 1 << j
+            stack.extend(successors[j])
+        closure[start] = seen
+    return closure
+
+def compile_bipolar(baf: BipolarFramework) -> Tuple[CompiledFramework, List[int]]:
+    """
+    Flatten a BAF into an indexed AF of set-attacks (Cayrol &
+    Lagasquie-Schiex 2005): direct attacks, supported attacks (a supports+ x,
+    x attacks b) and secondary attacks (a attacks x, x supports+ b).
+    """
+    direct = dung.compile_framework(baf)
+    started = spans.start()
+    dung.ensure_masks(direct)
+    closure = support_closure(baf, direct.index)
+
+    edges = []
+    for a, targets in enumerate(direct.target_masks):
+        flat = targets
+        for x in dung.iter_bits(closure[a]):
+            flat |= direct.target_masks[x]
+        for x in direct.targets[a]:
+            flat |= closure[x]
+        edges.extend((a, b) for b in dung.iter_bits(flat))
+
+    cf = dung.compile_edges(direct.names, edges)
+    spans.stop("flatten", started)
+    return cf, closure
+
 def flatten_to_af(baf: BipolarFramework) -> BipolarFramework:
-    new_attacks = set(baf.attacks)
-    
-    for arg in baf.arguments:
-        for sa in get_supported_attacks(baf, arg):
-            new_attacks.add(encode_relation(sa["attacker"], arg))
-        for sa in get_secondary_attacks(baf, arg):
-            new_attacks.add(encode_relation(sa["attacker"], arg))
-            
+    cf, _ = compile_bipolar(baf)
+    new_attacks = {
+        encode_relation(cf.names[a], cf.names[b])
+        for a, targets in enumerate(cf.targets)
+        for b in targets
+    }
+    # Keep relations over undeclared arguments exactly as given
+    new_attacks |= baf.attacks
+
     return BipolarFramework(
         arguments=set(baf.arguments),
         attacks=new_attacks,
         supports=set(baf.supports)
     )
+
+def grounded_extension(baf: BipolarFramework) -> Set[str]:
+    cf, _ = compile_bipolar(baf)
+    return dung.mask_to_names(cf, dung.grounded_mask(cf))
+
+def preferred_extensions(
+    baf: BipolarFramework,
+    admissibility: AdmissibilityType = "d"
+) -> List[Set[str]]:
+    cf, closure = compile_bipolar(baf)
+    masks = dung.labelling_search(cf, "preferred", closure, admissibility)
+    return [dung.mask_to_names(cf, m) for m in masks]
+
+def stable_extensions(
+    baf: BipolarFramework,
+    admissibility: AdmissibilityType = "d"
+) -> List[Set[str]]:
+    cf, closure = compile_bipolar(baf)
+    masks = dung.labelling_search(cf, "stable", closure, admissibility)
+    return [dung.mask_to_names(cf, m) for m in masks]
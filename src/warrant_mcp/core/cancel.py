@@ -0,0 +1,24 @@
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+# Cooperative cancellation for long computations. A caller installs a token
+# (anything with is_set(), e.g. threading.Event or a multiprocessing
+# manager Event) and the search loops poll it through check().
+
+class Cancelled(Exception):
+    pass
+
+_token: ContextVar[Optional[Any]] = ContextVar("warrant_cancel_token", default=None)
+
+def check() -> None:
+    token = _token.get()
+    if token is not None and token.is_set():
+        raise Cancelled()
+
+def run_with(token: Any, fn: Callable[..., Any], *args: Any) -> Any:
+    # Module-level so it can be sent to a process pool
+    reset = _token.set(token)
+    try:
+        return fn(*args)
+    finally:
+        _token.reset(reset)
@@ -0,0 +1,84 @@
+from itertools import islice
+from typing import Optional, Dict, Any, Set
+from .types import CommitmentIndex, CommitmentDelta, DialogueState
+
+def create_index() -> CommitmentIndex:
+    return CommitmentIndex()
+
+def register_dialogue(index: CommitmentIndex, state: DialogueState) -> None:
+    index.topics.setdefault(state.topic, {})[state.id] = None
+    for p in state.participants:
+        index.participants.setdefault(p, {})[state.id] = None
+    for speaker in state.commitments:
+        index.participants.setdefault(speaker, {})[state.id] = None
+    register_commitments(index, state.id, state.commitments)
+
+def apply_delta(
+    index: CommitmentIndex,
+    dialogue_id: str,
+    delta: CommitmentDelta
+) -> None:
+    key = (dialogue_id, delta.speaker)
+    index.participants.setdefault(delta.speaker, {})[dialogue_id] = None
+    for prop in delta.added:
+        index.propositions.setdefault(prop, {})[key] = None
+    for prop in delta.removed:
+        _discard(index.propositions, prop, key)
+
+def register_commitments(
+    index: CommitmentIndex,
+    dialogue_id: str,
+    commitments: Dict[str, Set[str]]
+) -> None:
+    for speaker, store in commitments.items():
+        for prop in store:
+            index.propositions.setdefault(prop, {})[(dialogue_id, speaker)] = None
+
+def unregister_commitments(
+    index: CommitmentIndex,
+    dialogue_id: str,
+    commitments: Dict[str, Set[str]]
+) -> None:
+    for speaker, store in commitments.items():
+        for prop in store:
+            _discard(index.propositions, prop, (dialogue_id, speaker))
+
+def unregister_dialogue(index: CommitmentIndex, state: DialogueState) -> None:
+    unregister_commitments(index, state.id, state.commitments)
+    _discard(index.topics, state.topic, state.id)
+    for speaker in set(state.participants) | set(state.commitments):
+        _discard(index.participants, speaker, state.id)
+
+def _discard(table: Dict[Any, Dict[Any, None]], key: Any, item: Any) -> None:
+    entries = table.get(key)
+    if entries is None:
+        return
+    entries.pop(item, None)
+    if not entries:
+        del table[key]
+
+def query_commitments(
+    index: CommitmentIndex,
+    proposition: Optional[str] = None,
+    participant: Optional[str] = None,
+    topic: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    result = {}
+    if proposition is not None:
+        holders = index.propositions.get(proposition, {})
+        if participant is not None:
+            holders = [k for k in holders if k[1] == participant]
+        result["committed"] = [
+            {"dialogue": d, "participant": p} for d, p in islice(holders, limit)
+        ]
+        result["count"] = len(holders)
+    elif participant is not None:
+        dialogues = index.participants.get(participant, {})
+        result["dialogues"] = list(islice(dialogues, limit))
+        result["count"] = len(dialogues)
+    if topic is not None:
+        dialogues = index.topics.get(topic, {})
+        result["topicDialogues"] = list(islice(dialogues, limit))
+        result["topicCount"] = len(dialogues)
+    return result
@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Work counters (search nodes, cache hits, ...) attributed to the call that
+# caused them. A caller opens a scope(); code anywhere below it reports
+# through add(). Outside a scope add() is a no-op.
+
+_active: ContextVar[Optional[Dict[str, int]]] = ContextVar("warrant_counters", default=None)
+
+def add(name: str, n: int = 1) -> None:
+    counts = _active.get()
+    if counts is not None:
+        counts[name] = counts.get(name, 0) + n
+
+def merge(counts: Dict[str, int]) -> None:
+    # Fold in counts gathered elsewhere, e.g. in a worker process
+    for name, n in counts.items():
+        add(name, n)
+
+@contextmanager
+def scope() -> Iterator[Dict[str, int]]:
+    counts: Dict[str, int] = {}
+    reset = _active.set(counts)
+    try:
+        yield counts
+    finally:
+        _active.reset(reset)
+
+def collect(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, int]]:
+    # Module-level so it can be sent to a process pool
+    with scope() as counts:
+        return fn(*args), counts
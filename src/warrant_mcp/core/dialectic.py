@@ -0,0 +1,286 @@
+from typing import List, Optional, Dict, Any
+from .types import (
+    DialecticalTree, TreeNode, TreeNodeKind, TreeSegment, SpeechAct,
+    ArgumentationFramework, encode_relation
+)
+
+# Each move adds at most one node, which attacks the node it replies to:
+#   claim    a new issue, or a counter-claim when it answers a claim
+#   why      a challenge of the node asserting the proposition
+#   since    an argument answering the open challenge of its conclusion
+#   concede  closes the conceder's attacks on the proposition
+#   retract  closes the speaker's own node asserting the proposition
+# A node is IN iff none of its open children is IN.
+#
+# Long why/since exchanges make deep unary chains, where every new leaf
+# flips every label above it. Labels are therefore not stored: the tree is
+# cut into segments (maximal paths of nodes with one open child), and a
+# node's label follows from its segment's bottom and the depth parity.
+# Only nodes ending a segment keep a count of IN children, so a move
+# touches one node per branching ancestor instead of one per ancestor.
+
+def _bottom_in(node: TreeNode) -> bool:
+    return not node.children or node.in_children == 0
+
+def is_in(tree: DialecticalTree, node: TreeNode) -> bool:
+    if not node.open:
+        return False
+    bottom = tree.nodes[node.segment.bottom]
+    label = _bottom_in(bottom)
+    return label if (bottom.depth - node.depth) % 2 == 0 else not label
+
+def _propagate(tree: DialecticalTree, top_id: int, was_in: bool) -> None:
+    # The label of segment top `top_id` just flipped from `was_in`
+    nodes = tree.nodes
+    while True:
+        parent = nodes[top_id].parent
+        if parent is None:
+            return
+        # The parent of a segment top always ends its own segment
+        p = nodes[parent]
+        before = p.in_children == 0
+        p.in_children += -1 if was_in else 1
+        if (p.in_children == 0) == before:
+            return
+        top = nodes[p.segment.top]
+        was_in = before if (p.depth - top.depth) % 2 == 0 else not before
+        top_id = top.id
+
+def _relabel(
+    tree: DialecticalTree,
+    start: int,
+    stop: int,
+    segment: TreeSegment
+) -> None:
+    # Walk up from `start` to `stop` inclusive
+    node = tree.nodes[start]
+    while True:
+        node.segment = segment
+        if node.id == stop:
+            return
+        node = tree.nodes[node.parent]
+
+def _split(tree: DialecticalTree, p: TreeNode, child: TreeNode) -> None:
+    # `p` stops being unary: cut its segment between `p` and `child`,
+    # moving whichever half is shorter to a new segment
+    nodes = tree.nodes
+    seg = p.segment
+    upper = p.depth - nodes[seg.top].depth
+    lower = nodes[seg.bottom].depth - child.depth
+    if lower <= upper:
+        new = TreeSegment(top=child.id, bottom=seg.bottom)
+        seg.bottom = p.id
+        _relabel(tree, new.bottom, child.id, new)
+    else:
+        new = TreeSegment(top=seg.top, bottom=p.id)
+        seg.top = child.id
+        _relabel(tree, p.id, new.top, new)
+
+def _merge(tree: DialecticalTree, p: TreeNode, child: TreeNode) -> None:
+    # `p` became unary again: join its segment with its remaining child's
+    nodes = tree.nodes
+    up, down = p.segment, child.segment
+    if nodes[down.bottom].depth - child.depth <= p.depth - nodes[up.top].depth:
+        _relabel(tree, down.bottom, child.id, up)
+        up.bottom = down.bottom
+    else:
+        _relabel(tree, p.id, up.top, down)
+        down.top = up.top
+
+def _add_node(
+    tree: DialecticalTree,
+    kind: TreeNodeKind,
+    move: SpeechAct,
+    index: int,
+    parent: Optional[int]
+) -> TreeNode:
+    nodes = tree.nodes
+    node = TreeNode(
+        id=len(nodes),
+        speaker=move.speaker,
+        kind=kind,
+        content=move.content,
+        move=index,
+        parent=parent
+    )
+    nodes.append(node)
+    node.segment = TreeSegment(top=node.id, bottom=node.id)
+    if parent is None:
+        tree.roots.append(node.id)
+        return node
+
+    p = nodes[parent]
+    node.depth = p.depth + 1
+    top = nodes[p.segment.top]
+    before = is_in(tree, top)
+
+    if not p.children:
+        # Extend p's segment down to the new leaf
+        node.segment = p.segment
+        p.segment.bottom = node.id
+    elif len(p.children) == 1:
+        only = nodes[next(iter(p.children))]
+        only_in = is_in(tree, only)
+        _split(tree, p, only)
+        p.in_children = (1 if only_in else 0) + 1
+    else:
+        p.in_children += 1
+
+    p.children[node.id] = None
+    tree.issues.pop(p.id, None)
+    tree.issues[node.id] = None
+    if is_in(tree, top) != before:
+        _propagate(tree, top.id, before)
+    return node
+
+def close_node(tree: DialecticalTree, node_id: int) -> None:
+    # Closing a node makes its whole open branch moot
+    nodes = tree.nodes
+    node = nodes[node_id]
+    if not node.open:
+        return
+    if node.parent is None:
+        _close_branch(tree, node)
+        return
+
+    p = nodes[node.parent]
+    top = nodes[p.segment.top]
+    before = is_in(tree, top)
+    was_in = is_in(tree, node)
+    _close_branch(tree, node)
+
+    del p.children[node.id]
+    if not p.children:
+        # p ends its segment again (the closed nodes below are ignored)
+        p.segment.bottom = p.id
+        if p.parent is not None:
+            tree.issues[p.id] = None
+    elif len(p.children) == 1:
+        _merge(tree, p, nodes[next(iter(p.children))])
+    elif was_in:
+        p.in_children -= 1
+
+    if is_in(tree, top) != before:
+        _propagate(tree, top.id, before)
+
+def _close_branch(tree: DialecticalTree, node: TreeNode) -> None:
+    stack = [node]
+    while stack:
+        x = stack.pop()
+        x.open = False
+        tree.issues.pop(x.id, None)
+        stack.extend(tree.nodes[c] for c in x.children)
+
+def _lookup(tree: DialecticalTree, index: Dict[str, int], key: str) -> Optional[int]:
+    node_id = index.get(key)
+    if node_id is not None and tree.nodes[node_id].open:
+        return node_id
+    return None
+
+def apply_move(
+    tree: DialecticalTree,
+    move: SpeechAct,
+    index: int,
+    previous: Optional[SpeechAct] = None
+) -> Optional[TreeNode]:
+    act = move.act
+    if act == "claim":
+        parent = None
+        if (
+            previous is not None
+            and previous.act == "claim"
+            and previous.speaker != move.speaker
+        ):
+            parent = _lookup(tree, tree.asserted, previous.content)
+        node = _add_node(tree, "claim", move, index, parent)
+        tree.asserted[move.content] = node.id
+        return node
+
+    if act == "why":
+        target = _lookup(tree, tree.asserted, move.content)
+        if target is None:
+            return None
+        node = _add_node(tree, "challenge", move, index, target)
+        tree.challenges[move.content] = node.id
+        return node
+
+    if act == "since":
+        target = _lookup(tree, tree.challenges, move.content)
+        node = _add_node(tree, "argument", move, index, target)
+        tree.challenges.pop(move.content, None)
+        tree.asserted[move.content] = node.id
+        # Challenging a premise attacks the argument built on it
+        for premise in move.premises or []:
+            tree.asserted[premise] = node.id
+        return node
+
+    if act == "concede":
+        target = _lookup(tree, tree.asserted, move.content)
+        if target is not None:
+            for child in list(tree.nodes[target].children):
+                if tree.nodes[child].speaker == move.speaker:
+                    close_node(tree, child)
+        return None
+
+    if act == "retract":
+        target = _lookup(tree, tree.asserted, move.content)
+        if target is not None and tree.nodes[target].speaker == move.speaker:
+            close_node(tree, target)
+        return None
+
+    return None
+
+def build_tree(moves: List[SpeechAct]) -> DialecticalTree:
+    tree = DialecticalTree()
+    previous = None
+    for i, move in enumerate(moves):
+        apply_move(tree, move, i, previous)
+        previous = move
+    return tree
+
+def serialize_node(tree: DialecticalTree, node: TreeNode) -> Dict[str, Any]:
+    return {
+        "id": node.id,
+        "speaker": node.speaker,
+        "kind": node.kind,
+        "content": node.content,
+        "move": node.move,
+        "attacks": node.parent,
+        "label": "IN" if is_in(tree, node) else "OUT",
+        "open": node.open
+    }
+
+def status(tree: DialecticalTree) -> Dict[str, Any]:
+    """
+    Standing of the current issue (the latest root). Independent of the
+    dialogue length; only the open issues themselves are listed.
+    """
+    if not tree.roots:
+        return {"issue": None, "label": None, "winner": None, "openIssues": []}
+    root = tree.nodes[tree.roots[-1]]
+    winner = None
+    if is_in(tree, root):
+        winner = root.speaker
+    elif root.open:
+        for c in root.children:
+            if is_in(tree, tree.nodes[c]):
+                winner = tree.nodes[c].speaker
+                break
+    return {
+        "issue": root.content,
+        "label": "IN" if is_in(tree, root) else "OUT",
+        "winner": winner,
+        "openIssues": [serialize_node(tree, tree.nodes[i]) for i in tree.issues]
+    }
+
+def to_framework(tree: DialecticalTree) -> ArgumentationFramework:
+    # Open nodes as a Dung framework; each node attacks the node it replies to
+    live = [n for n in tree.nodes if n.open]
+    return ArgumentationFramework(
+        arguments={f"n{n.id}" for n in live},
+        attacks={
+            encode_relation(f"n{n.id}", f"n{n.parent}")
+            for n in live
+            if n.parent is not None
+        }
+    )
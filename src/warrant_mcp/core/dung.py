@@ -1,5 +1,10 @@
-from typing import Set, List, Tuple
-from .types import ArgumentationFramework, encode_relation, decode_relation
+import base64
+from typing import Set, List, Tuple, Iterable, Iterator, Optional
+from .types import (
+    ArgumentationFramework, CompiledFramework, AdmissibilityType,
+    encode_relation, decode_relation
+)
+from . import cancel, counters, spans
 
 def create_framework(
     args: List[str],
@@ -55,17 +60,215 @@ def is_admissible(af: ArgumentationFramework, s: Set[str]) -> bool:
             return False
     return True
 
+def compile_edges(
+    names: List[str],
+    edges: Iterable[Tuple[int, int]]
+) -> CompiledFramework:
+    attackers = [[] for _ in names]
+    targets = [[] for _ in names]
+    for a, b in edges:
+        attackers[b].append(a)
+        targets[a].append(b)
+    return CompiledFramework(
+        names=names,
+        index={name: i for i, name in enumerate(names)},
+        attackers=attackers,
+        targets=targets
+    )
+
+def compile_framework(af: ArgumentationFramework) -> CompiledFramework:
+    started = spans.start()
+    names = sorted(af.arguments)
+    index = {name: i for i, name in enumerate(names)}
+    edges = set()
+    for rel in af.attacks:
+        from_node, to_node = decode_relation(rel)
+        # Relations over undeclared arguments can never affect acceptance
+        if from_node in index and to_node in index:
+            edges.add((index[from_node], index[to_node]))
+    cf = compile_edges(names, sorted(edges))
+    spans.stop("compile", started)
+    return cf
+
+def iter_bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def mask_to_names(cf: CompiledFramework, mask: int) -> Set[str]:
+    return {cf.names[i] for i in iter_bits(mask)}
+
+def mask_to_indices(mask: int) -> List[int]:
+    # Ascending; one pass over the binary digits beats iter_bits on dense masks
+    return [i for i, bit in enumerate(bin(mask)[:1:-1]) if bit == "1"]
+
+def mask_to_base64(mask: int, size: int) -> str:
+    # Little-endian: argument i is bit i % 8 of byte i // 8
+    return base64.b64encode(mask.to_bytes((size + 7) // 8, "little")).decode("ascii")
+
+def base64_to_mask(data: str) -> int:
+    return int.from_bytes(base64.b64decode(data), "little")
+
+def ensure_masks(cf: CompiledFramework) -> None:
+    if cf.target_masks is not None:
+        return
+    cf.attacker_masks = [_to_mask(lst) for lst in cf.attackers]
+    cf.target_masks = [_to_mask(lst) for lst in cf.targets]
+
+def _to_mask(indices: List[int]) -> int:
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return mask
+
+def grounded_mask(cf: CompiledFramework) -> int:
+    # Linear-time labelling: an argument is IN once all its attackers are OUT
+    started = spans.start()
+    remaining = [len(a) for a in cf.attackers]
+    out = [False] * len(cf.names)
+    queue = [i for i, count in enumerate(remaining) if count == 0]
+    mask = 0
+    while queue:
+        i = queue.pop()
+        mask |= 1 << i
+        for t in cf.targets[i]:
+            if out[t]:
+                continue
+            out[t] = True
+            for u in cf.targets[t]:
+                remaining[u] -= 1
+                if remaining[u] == 0 and not out[u]:
+                    queue.append(u)
+    spans.stop("grounded", started)
+    return mask
+
 def grounded_extension(af: ArgumentationFramework) -> Set[str]:
-    current = set()
-    while True:
-        next_set = set()
-        for arg in af.arguments:
-            if defends(af, current, arg):
-                next_set.add(arg)
-        if current == next_set:
-            break
-        current = next_set
-    return current
+    cf = compile_framework(af)
+    return mask_to_names(cf, grounded_mask(cf))
+
+def labelling_search(
+    cf: CompiledFramework,
+    semantics: str = "preferred",
+    support_masks: Optional[List[int]] = None,
+    admissibility: AdmissibilityType = "d"
+) -> List[int]:
+    """
+    Enumerate preferred or stable extensions as bitmasks.
+
+    Backtracking over IN/OUT/MUST_OUT/UNDEC labellings (Nofal, Atkinson &
+    Dunne 2014). `support_masks` holds the transitive support closure of a
+    flattened bipolar AF and is only consulted for s- and c-admissibility.
+    """
+    started = spans.start()
+    ensure_masks(cf)
+    att = cf.attacker_masks
+    tgt = cf.target_masks
+    n = len(cf.names)
+    full = (1 << n) - 1
+    stable = semantics == "stable"
+    safe = admissibility == "s"
+    closed = admissibility == "c"
+    # Adding a defended argument is only sound for plain (d-)admissibility
+    propagate = admissibility == "d"
+
+    self_attacking = 0
+    for i in range(n):
+        if (tgt[i] >> i) & 1:
+            self_attacking |= 1 << i
+
+    # State: (in, out, attackers of in, undecided, supported by in)
+    def add(state, members):
+        inm, outm, attm, undm, supm = state
+        for i in iter_bits(members & ~inm):
+            outm |= tgt[i]
+            attm |= att[i]
+            if safe:
+                supm |= support_masks[i]
+        inm |= members
+        if inm & (outm | attm | undm):
+            return None
+        if safe and supm & outm:
+            return None
+        return (inm, outm, attm, undm, supm)
+
+    def blank_of(state):
+        inm, outm, attm, undm, _ = state
+        return full & ~(inm | outm | attm | undm)
+
+    def saturate(state):
+        while True:
+            outm = state[1]
+            forced = 0
+            for i in iter_bits(blank_of(state)):
+                if not att[i] & ~outm:
+                    forced |= 1 << i
+            if not forced:
+                return state
+            state = add(state, forced)
+
+    found: List[int] = []
+
+    def viable(state, blank):
+        inm, outm, attm, undm, _ = state
+        for m in iter_bits(attm & ~outm):
+            if not att[m] & blank:
+                return False
+        if stable:
+            for u in iter_bits(undm & ~outm):
+                if not att[u] & blank:
+                    return False
+        else:
+            reach = inm | blank
+            for e in found:
+                if not reach & ~e:
+                    return False
+        return True
+
+    root = (0, 0, 0, self_attacking, 0)
+    if propagate:
+        root = add(root, grounded_mask(cf))
+    stack = [root]
+    steps = 0
+    spans.stop("preprocess", started)
+    started = spans.start()
+    while stack:
+        steps += 1
+        if not steps & 1023:
+            cancel.check()
+        state = stack.pop()
+        if propagate:
+            state = saturate(state)
+        blank = blank_of(state)
+        if not viable(state, blank):
+            continue
+        inm, outm, attm, undm, supm = state
+        if not blank:
+            if stable:
+                found.append(inm)
+            elif all(inm & ~e for e in found):
+                found = [e for e in found if e & ~inm] + [inm]
+            continue
+
+        # Resolve pending MUST_OUT arguments first, they prune hardest
+        pending = attm & ~outm
+        if pending:
+            m = next(iter_bits(pending))
+            choice = att[m] & blank
+        else:
+            choice = blank
+        x = (choice & -choice).bit_length() - 1
+        bit = 1 << x
+
+        stack.append((inm, outm, attm, undm | bit, supm))
+        members = (bit | support_masks[x]) if closed else bit
+        nxt = add(state, members)
+        if nxt is not None:
+            stack.append(nxt)
+
+    counters.add("searchNodes", steps)
+    spans.stop("search", started)
+    return found
 
 def power_set(s: Set[str]) -> List[Set[str]]:
     arr = list(s)
@@ -87,41 +290,9 @@ def find_all_admissible(af: ArgumentationFramework) -> List[Set[str]]:
     return result
 
 def preferred_extensions(af: ArgumentationFramework) -> List[Set[str]]:
-    admissible = find_all_admissible(af)
-    maximal = []
-    
-    for s in admissible:
-        is_maximal = True
-        for other in admissible:
-            if other != s and s.issubset(other) and s != other:
-                is_maximal = False
-                break
-        if is_maximal:
-            maximal.append(s)
-            
-    return maximal
+    cf = compile_framework(af)
+    return [mask_to_names(cf, m) for m in labelling_search(cf, "preferred")]
 
 def stable_extensions(af: ArgumentationFramework) -> List[Set[str]]:
-    result = []
-    all_subsets = power_set(af.arguments)
-    
-    for subset in all_subsets:
-        if not is_conflict_free(af, subset):
-            continue
-            
-        is_stable = True
-        for arg in af.arguments:
-            if arg in subset:
-                continue
-            attacked = False
-            for member in subset:
-                if attacks(af, member, arg):
-                    attacked = True
-                    break
-            if not attacked:
-                is_stable = False
-                break
-        if is_stable:
-            result.append(subset)
-            
-    return result
+    cf = compile_framework(af)
+    return [mask_to_names(cf, m) for m in labelling_search(cf, "stable")]
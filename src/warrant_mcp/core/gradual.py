@@ -1,14 +1,17 @@
 from typing import Dict
 from .types import ArgumentationFramework, BipolarFramework, decode_relation
+from . import cancel, spans
 
 def h_categorizer(
     af: ArgumentationFramework,
     max_iterations: int = 100,
     epsilon: float = 0.0001
 ) -> Dict[str, float]:
+    started = spans.start()
     scores = {arg: 1.0 for arg in af.arguments}
     
     for _ in range(max_iterations):
+        cancel.check()
         max_delta = 0.0
         new_scores = {}
         
@@ -27,6 +30,7 @@ def h_categorizer(
         if max_delta < epsilon:
             break
             
+    spans.stop("score", started)
     return scores
 
 def count_paths(
@@ -48,6 +52,7 @@ def counting_semantics(
     af: ArgumentationFramework,
     max_depth: int = 5
 ) -> Dict[str, float]:
+    started = spans.start()
     scores = {}
     
     for arg in af.arguments:
@@ -57,7 +62,9 @@ def counting_semantics(
             sign = 1 if depth % 2 == 0 else -1
             score += sign * paths * (0.5 ** depth)
         scores[arg] = score
+        cancel.check()
         
+    spans.stop("score", started)
     return scores
 
 def compute_scores(
@@ -65,9 +72,11 @@ def compute_scores(
     max_iterations: int = 100,
     epsilon: float = 0.0001
 ) -> Dict[str, float]:
+    started = spans.start()
     scores = {arg: 1.0 for arg in baf.arguments}
     
     for _ in range(max_iterations):
+        cancel.check()
         max_delta = 0.0
         new_scores = {}
         
@@ -92,4 +101,5 @@ def compute_scores(
         if max_delta < epsilon:
             break
             
+    spans.stop("score", started)
     return scores
@@ -0,0 +1,194 @@
+from collections import deque
+from typing import List, Optional, Dict, Any
+from .types import (
+    ArgumentGraph, GraphNode, ToulminArgument, Defeater,
+    ArgumentationFramework, encode_relation
+)
+from . import toulmin, pollock
+
+_graph_counter = 0
+
+def create_graph() -> ArgumentGraph:
+    global _graph_counter
+    _graph_counter += 1
+    return ArgumentGraph(id=f"graph_{_graph_counter}", nodes={}, claims={})
+
+def add_argument(graph: ArgumentGraph, arg: ToulminArgument) -> GraphNode:
+    graph.counter += 1
+    weight = toulmin.score_argument(arg).total
+    node = GraphNode(
+        id=f"arg_{graph.counter}",
+        kind="argument",
+        payload=arg,
+        weight=weight,
+        score=weight
+    )
+    graph.nodes[node.id] = node
+    graph.claims[arg.claim] = node.id
+    return node
+
+def resolve_target(graph: ArgumentGraph, target: str) -> Optional[str]:
+    # Defeaters may name a node id or the claim text of an argument
+    if target in graph.nodes:
+        return target
+    return graph.claims.get(target)
+
+def add_defeater(
+    graph: ArgumentGraph,
+    defeater: Defeater,
+    max_iterations: int = 100,
+    epsilon: float = 0.0001
+) -> List[GraphNode]:
+    target_id = resolve_target(graph, defeater.target)
+    if target_id is None:
+        raise ValueError(f"Unknown target: {defeater.target}")
+
+    graph.counter += 1
+    defeater.strength = pollock.assess_strength(defeater)
+    weight = min(pollock.strength_score(defeater), 1.0)
+    node = GraphNode(
+        id=f"def_{graph.counter}",
+        kind="defeater",
+        payload=defeater,
+        weight=weight,
+        penalty=pollock.defeater_penalty(defeater),
+        targets=[target_id],
+        score=weight
+    )
+    graph.nodes[node.id] = node
+    graph.nodes[target_id].attackers.append(node.id)
+
+    # The new node is unattacked, so only its target's downstream changes
+    return [node] + update_region(graph, [target_id], max_iterations, epsilon)
+
+def update_region(
+    graph: ArgumentGraph,
+    seeds: List[str],
+    max_iterations: int = 100,
+    epsilon: float = 0.0001
+) -> List[GraphNode]:
+    """
+    Recompute grounded labels and weighted h-categorizer scores for every
+    node reachable from `seeds`. Nodes outside that region keep their values
+    and act as fixed inputs, since nothing upstream of them changed.
+    """
+    nodes = graph.nodes
+    region = []
+    in_region = set(seeds)
+    queue = deque(seeds)
+    while queue:
+        x = queue.popleft()
+        region.append(x)
+        for t in nodes[x].targets:
+            if t not in in_region:
+                in_region.add(t)
+                queue.append(t)
+
+    _label_region(nodes, region, in_region)
+    _score_region(nodes, region, max_iterations, epsilon)
+    return [nodes[x] for x in region]
+
+def _label_region(
+    nodes: Dict[str, GraphNode],
+    region: List[str],
+    in_region: set
+) -> None:
+    labels = {}
+    remaining = {}
+    for x in region:
+        count = 0
+        for y in nodes[x].attackers:
+            if y in in_region:
+                count += 1
+            elif nodes[y].label == "IN":
+                labels[x] = "OUT"
+            elif nodes[y].label == "UNDEC":
+                count += 1
+        remaining[x] = count
+
+    def defeat(x: str, ready: List[str]) -> None:
+        for u in nodes[x].targets:
+            if u in in_region and u not in labels:
+                remaining[u] -= 1
+                if remaining[u] == 0:
+                    ready.append(u)
+
+    ready = [x for x in region if x not in labels and remaining[x] == 0]
+    for x in region:
+        if labels.get(x) == "OUT":
+            defeat(x, ready)
+
+    while ready:
+        x = ready.pop()
+        if x in labels:
+            continue
+        labels[x] = "IN"
+        for t in nodes[x].targets:
+            if t in in_region and t not in labels:
+                labels[t] = "OUT"
+                defeat(t, ready)
+
+    for x in region:
+        nodes[x].label = labels.get(x, "UNDEC")
+
+def _score_region(
+    nodes: Dict[str, GraphNode],
+    region: List[str],
+    max_iterations: int,
+    epsilon: float
+) -> None:
+    # Weighted h-categorizer: s(x) = w(x) / (1 + sum penalty(y) * s(y))
+    for _ in range(max_iterations):
+        max_delta = 0.0
+        for x in region:
+            node = nodes[x]
+            attack_sum = 0.0
+            for y in node.attackers:
+                attacker = nodes[y]
+                attack_sum += attacker.penalty * attacker.score
+            new_score = node.weight / (1.0 + attack_sum)
+            max_delta = max(max_delta, abs(new_score - node.score))
+            node.score = new_score
+        if max_delta < epsilon:
+            break
+
+def to_framework(graph: ArgumentGraph) -> ArgumentationFramework:
+    return ArgumentationFramework(
+        arguments=set(graph.nodes),
+        attacks={
+            encode_relation(node.id, t)
+            for node in graph.nodes.values()
+            for t in node.targets
+        }
+    )
+
+def serialize_node(node: GraphNode) -> Dict[str, Any]:
+    result = {
+        "id": node.id,
+        "kind": node.kind,
+        "label": node.label,
+        "score": round(node.score, 3),
+        "attackers": list(node.attackers)
+    }
+    if node.kind == "argument":
+        result["claim"] = node.payload.claim
+        result["baseScore"] = round(node.weight, 3)
+        # What defeaters took off the standalone Toulmin score
+        result["breakdown"] = toulmin.score_argument(
+            node.payload, rebuttal_penalty=node.weight - node.score
+        )
+    else:
+        result["target"] = node.targets[0]
+        result["content"] = node.payload.content
+        result["type"] = node.payload.type
+        result["strength"] = node.payload.strength
+        result["penalty"] = round(node.penalty, 3)
+    return result
+
+def serialize_graph(graph: ArgumentGraph) -> Dict[str, Any]:
+    return {
+        "id": graph.id,
+        "nodes": [serialize_node(n) for n in graph.nodes.values()],
+        "grounded": sorted(n.id for n in graph.nodes.values() if n.label == "IN"),
+        "nodeCount": len(graph.nodes)
+    }
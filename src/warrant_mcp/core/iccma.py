@@ -0,0 +1,246 @@
+import re
+from typing import BinaryIO, Iterable, List, Optional, TextIO, Tuple, Union
+from .types import CompiledFramework
+from . import dung
+
+# ICCMA instance formats, read line by line straight into the adjacency
+# lists of a CompiledFramework (no attack strings, no ArgumentationFramework):
+#   apx   arg(a).  att(a,b).
+#   tgf   one argument per line, "#", then one "a b" attack per line
+#   i23   "p af n" header, then "i j" attacks over arguments 1..n (ICCMA 2023)
+
+FORMATS = ("apx", "tgf", "i23")
+SUFFIXES = {".apx": "apx", ".tgf": "tgf", ".af": "i23", ".i23": "i23"}
+SEMANTICS = ("GR", "CO", "PR", "ST")
+PROBLEMS = ("DC", "DS", "SE", "EE")
+
+_APX = re.compile(rb"(arg|att)\(\s*([^,()\s]+)\s*(?:,\s*([^,()\s]+)\s*)?\)\s*\.")
+
+class _Builder:
+    def __init__(self):
+        self.names: List[str] = []
+        self.index = {}
+        self.attackers: List[List[int]] = []
+        self.targets: List[List[int]] = []
+
+    def argument(self, name: str) -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = len(self.names)
+            self.index[name] = i
+            self.names.append(name)
+            self.attackers.append([])
+            self.targets.append([])
+        return i
+
+    def attack(self, a: int, b: int) -> None:
+        self.attackers[b].append(a)
+        self.targets[a].append(b)
+
+    def build(self) -> CompiledFramework:
+        return CompiledFramework(
+            names=self.names,
+            index=self.index,
+            attackers=self.attackers,
+            targets=self.targets
+        )
+
+def guess_format(path: str) -> str:
+    for suffix, fmt in SUFFIXES.items():
+        if path.endswith(suffix):
+            return fmt
+    raise ValueError(f"Cannot tell the format of {path}; pass one of {', '.join(FORMATS)}")
+
+def _apx_statements(line: bytes, n: int) -> Iterable[Tuple[bytes, bytes, bytes]]:
+    # Fast path for the usual one statement per line, regex otherwise
+    if line.endswith(b").") and line.count(b"(") == 1:
+        head, body = line[:-2].split(b"(")
+        head = head.strip()
+        if head == b"arg" and b"," not in body:
+            return ((b"arg", body.strip(), b""),)
+        if head == b"att" and body.count(b",") == 1:
+            x, y = body.split(b",")
+            return ((b"att", x.strip(), y.strip()),)
+    found = _APX.findall(line)
+    if not found:
+        raise ValueError(f"line {n}: expected arg(a). or att(a,b).")
+    return found
+
+def parse_apx(lines: Iterable[bytes]) -> CompiledFramework:
+    b = _Builder()
+    index = b.index
+    pending: List[Tuple[str, str]] = []
+    for n, line in enumerate(lines, 1):
+        line = line.split(b"%", 1)[0].strip()
+        if not line:
+            continue
+        for kind, x, y in _apx_statements(line, n):
+            if kind == b"arg":
+                if y:
+                    raise ValueError(f"line {n}: arg takes one name")
+                b.argument(x.decode())
+            elif not y:
+                raise ValueError(f"line {n}: att takes two names")
+            else:
+                xs, ys = x.decode(), y.decode()
+                if xs in index and ys in index:
+                    b.attack(index[xs], index[ys])
+                else:
+                    # Attacks may precede the arguments they mention
+                    pending.append((xs, ys))
+    for x, y in pending:
+        if x not in index or y not in index:
+            raise ValueError(f"att({x},{y}) mentions an undeclared argument")
+        b.attack(index[x], index[y])
+    return b.build()
+
+def parse_tgf(lines: Iterable[bytes]) -> CompiledFramework:
+    b = _Builder()
+    in_attacks = False
+    for n, line in enumerate(lines, 1):
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == b"#":
+            in_attacks = True
+        elif not in_attacks:
+            b.argument(parts[0].decode())
+        elif len(parts) != 2:
+            raise ValueError(f"line {n}: expected two arguments")
+        else:
+            x, y = parts[0].decode(), parts[1].decode()
+            if x not in b.index or y not in b.index:
+                raise ValueError(f"line {n}: attack on an undeclared argument")
+            b.attack(b.index[x], b.index[y])
+    return b.build()
+
+def parse_i23(lines: Iterable[bytes]) -> CompiledFramework:
+    attackers: Optional[List[List[int]]] = None
+    targets: List[List[int]] = []
+    n = 0
+    for number, line in enumerate(lines, 1):
+        parts = line.split()
+        if not parts or parts[0] == b"#":
+            continue
+        if attackers is None:
+            if len(parts) != 3 or parts[0] != b"p" or parts[1] != b"af":
+                raise ValueError(f"line {number}: expected the header 'p af <n>'")
+            n = int(parts[2])
+            attackers = [[] for _ in range(n)]
+            targets = [[] for _ in range(n)]
+            continue
+        a = c = -1
+        if len(parts) == 2:
+            a, c = int(parts[0]) - 1, int(parts[1]) - 1
+        if not (0 <= a < n and 0 <= c < n):
+            raise ValueError(f"line {number}: expected two arguments in 1..{n}")
+        attackers[c].append(a)
+        targets[a].append(c)
+    if attackers is None:
+        raise ValueError("Missing the header 'p af <n>'")
+    names = [str(i) for i in range(1, n + 1)]
+    return CompiledFramework(
+        names=names,
+        index={name: i for i, name in enumerate(names)},
+        attackers=attackers,
+        targets=targets
+    )
+
+_PARSERS = {"apx": parse_apx, "tgf": parse_tgf, "i23": parse_i23}
+
+def read_framework(
+    source: Union[str, BinaryIO],
+    format: Optional[str] = None
+) -> CompiledFramework:
+    """Read an instance from a path or a binary stream."""
+    if isinstance(source, str):
+        format = format or guess_format(source)
+        with open(source, "rb", buffering=1 << 20) as f:
+            return read_framework(f, format)
+    if format not in _PARSERS:
+        raise ValueError(f"Unknown format: {format}. Use {', '.join(FORMATS)}.")
+    return _PARSERS[format](source)
+
+def write_framework(cf: CompiledFramework, out: TextIO, format: str) -> None:
+    if format == "apx":
+        for name in cf.names:
+            out.write(f"arg({name}).\n")
+        for a, targets in enumerate(cf.targets):
+            for b in targets:
+                out.write(f"att({cf.names[a]},{cf.names[b]}).\n")
+    elif format == "tgf":
+        for name in cf.names:
+            out.write(f"{name}\n")
+        out.write("#\n")
+        for a, targets in enumerate(cf.targets):
+            for b in targets:
+                out.write(f"{cf.names[a]} {cf.names[b]}\n")
+    elif format == "i23":
+        # Arguments are renumbered 1..n in index order
+        out.write(f"p af {len(cf.names)}\n")
+        for a, targets in enumerate(cf.targets):
+            for b in targets:
+                out.write(f"{a + 1} {b + 1}\n")
+    else:
+        raise ValueError(f"Unknown format: {format}. Use {', '.join(FORMATS)}.")
+
+def parse_task(task: str) -> Tuple[str, str]:
+    problem, _, semantics = task.upper().partition("-")
+    if problem not in PROBLEMS or semantics not in SEMANTICS:
+        raise ValueError(f"Unknown task: {task}")
+    if problem == "EE" and semantics == "CO":
+        raise ValueError("EE-CO is not supported: complete extensions are not enumerated")
+    return problem, semantics
+
+def extensions(cf: CompiledFramework, semantics: str) -> List[int]:
+    if semantics in ("GR", "CO"):
+        return [dung.grounded_mask(cf)]
+    return dung.labelling_search(cf, "preferred" if semantics == "PR" else "stable")
+
+def solve(
+    cf: CompiledFramework,
+    task: str,
+    argument: Optional[str] = None
+) -> Union[bool, Optional[int], List[int]]:
+    """
+    Solve an ICCMA task. DC/DS return whether `argument` is credulously or
+    skeptically accepted, SE one extension mask (None if there is none) and
+    EE every extension mask.
+
+    CO is answered through its well-known reductions: the grounded
+    extension is the least complete one (SE, DS) and credulous acceptance
+    coincides with preferred (DC).
+    """
+    problem, semantics = parse_task(task)
+    if problem in ("DC", "DS"):
+        if argument is None:
+            raise ValueError(f"{task} needs an argument")
+        if argument not in cf.index:
+            raise ValueError(f"Unknown argument: {argument}")
+        bit = 1 << cf.index[argument]
+        if semantics == "CO":
+            semantics = "PR" if problem == "DC" else "GR"
+        exts = extensions(cf, semantics)
+        if problem == "DC":
+            return any(e & bit for e in exts)
+        # Skeptical acceptance holds vacuously when there is no extension
+        return all(e & bit for e in exts)
+
+    exts = extensions(cf, semantics)
+    if problem == "SE":
+        return exts[0] if exts else None
+    return exts
+
+def format_answer(cf: CompiledFramework, task: str, answer) -> str:
+    problem, _ = parse_task(task)
+    if problem in ("DC", "DS"):
+        return "YES" if answer else "NO"
+    if problem == "SE":
+        if answer is None:
+            return "NO"
+        return " ".join(["w"] + [cf.names[i] for i in dung.iter_bits(answer)])
+    # EE in the bracketed ICCMA 2019 style
+    return "[" + ",".join(
+        "[" + ",".join(cf.names[i] for i in dung.iter_bits(e)) + "]"
+        for e in answer
+    ) + "]"
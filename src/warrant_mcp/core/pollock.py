@@ -1,6 +1,26 @@
-from typing import Optional
+from typing import Optional, Iterable, List, Dict, Any
 from .types import Defeater, DefeaterType, EvidenceType, DefeaterStrength
 
+EVIDENCE_TYPES = ("certain", "objective", "uncertain", "subjective", "hypothetical")
+DEFEATER_TYPES = ("rebutting", "undercutting")
+
+EVIDENCE_STRENGTH = {
+    "certain": 1.0,
+    "objective": 0.7,
+    "uncertain": 0.4,
+    "subjective": 0.2,
+    "hypothetical": 0.1
+}
+
+STRENGTH_PENALTY = {
+    "strong": 0.15,
+    "medium": 0.08,
+    "weak": 0.03
+}
+
+TYPE_MULTIPLIER = {"rebutting": 1.0, "undercutting": 1.2}
+PENALTY_MULTIPLIER = {"rebutting": 1.0, "undercutting": 1.3}
+
 def create_defeater(
     target: str,
     content: str,
@@ -14,33 +34,90 @@ def create_defeater(
         evidenceType=evidence_type
     )
 
-def assess_strength(defeater: Defeater) -> DefeaterStrength:
-    evidence_strength = {
-        "certain": 1.0,
-        "objective": 0.7,
-        "uncertain": 0.4,
-        "subjective": 0.2,
-        "hypothetical": 0.1
-    }
-    
-    base = evidence_strength.get(defeater.evidenceType, 0.4)
-    type_multiplier = 1.2 if defeater.type == "undercutting" else 1.0
-    score = base * type_multiplier
-    
+def _classify(score: float) -> DefeaterStrength:
     if score > 0.7:
         return "strong"
     if score >= 0.35:
         return "medium"
     return "weak"
 
+# Lookup tables over (type x evidenceType), flattened row-major into tuples.
+# Unknown types are scored as rebutting (assess_defeaters flags them),
+# unknown evidence as "uncertain".
+_TYPE_INDEX = {t: i for i, t in enumerate(DEFEATER_TYPES)}
+_EVIDENCE_INDEX = {e: i for i, e in enumerate(EVIDENCE_TYPES)}
+_DEFAULT_EVIDENCE = _EVIDENCE_INDEX["uncertain"]
+_SCORES = tuple(
+    EVIDENCE_STRENGTH[e] * TYPE_MULTIPLIER[t]
+    for t in DEFEATER_TYPES for e in EVIDENCE_TYPES
+)
+_STRENGTHS = tuple(_classify(score) for score in _SCORES)
+_PENALTIES = tuple(
+    STRENGTH_PENALTY[_STRENGTHS[i * len(EVIDENCE_TYPES) + j]] * PENALTY_MULTIPLIER[t]
+    for i, t in enumerate(DEFEATER_TYPES) for j in range(len(EVIDENCE_TYPES))
+)
+
+def _cell(defeater: Defeater) -> int:
+    row = _TYPE_INDEX.get(defeater.type, 0)
+    col = _EVIDENCE_INDEX.get(defeater.evidenceType, _DEFAULT_EVIDENCE)
+    return row * len(EVIDENCE_TYPES) + col
+
+def strength_score(defeater: Defeater) -> float:
+    return _SCORES[_cell(defeater)]
+
+def assess_strength(defeater: Defeater) -> DefeaterStrength:
+    return _STRENGTHS[_cell(defeater)]
+
 def defeater_penalty(defeater: Defeater) -> float:
-    strength_penalty = {
-        "strong": 0.15,
-        "medium": 0.08,
-        "weak": 0.03
+    return _PENALTIES[_cell(defeater)]
+
+def assess_defeaters(defeaters: Iterable[Defeater]) -> Dict[str, Any]:
+    """
+    Assess many defeaters in one pass. Returns strengths and penalties as
+    lists parallel to the input, plus penalties aggregated per target.
+    Defeaters of an unknown type are scored as rebutting but counted as
+    "unknown" per target, and their positions are listed in unknownTypes.
+    """
+    strengths: List[DefeaterStrength] = []
+    penalties: List[float] = []
+    targets: Dict[str, Dict[str, Any]] = {}
+    unknown: List[int] = []
+    type_index = _TYPE_INDEX
+    evidence_index = _EVIDENCE_INDEX
+    width = len(EVIDENCE_TYPES)
+
+    for i, d in enumerate(defeaters):
+        row = type_index.get(d.type)
+        if row is None:
+            unknown.append(i)
+            kind, row = "unknown", 0
+        else:
+            kind = DEFEATER_TYPES[row]
+        cell = row * width + evidence_index.get(d.evidenceType, _DEFAULT_EVIDENCE)
+        strength = _STRENGTHS[cell]
+        penalty = _PENALTIES[cell]
+        strengths.append(strength)
+        penalties.append(penalty)
+
+        agg = targets.get(d.target)
+        if agg is None:
+            agg = targets[d.target] = {
+                "count": 0,
+                "rebutting": 0,
+                "undercutting": 0,
+                "unknown": 0,
+                "totalPenalty": 0.0,
+                "strongest": strength
+            }
+        agg["count"] += 1
+        agg[kind] += 1
+        agg["totalPenalty"] += penalty
+        if STRENGTH_PENALTY[strength] > STRENGTH_PENALTY[agg["strongest"]]:
+            agg["strongest"] = strength
+
+    return {
+        "strengths": strengths,
+        "penalties": penalties,
+        "targets": targets,
+        "unknownTypes": unknown
     }
-    
-    strength = assess_strength(defeater)
-    base = strength_penalty[strength]
-    
-    return base * 1.3 if defeater.type == "undercutting" else base
@@ -1,73 +1,137 @@
 import time
+import itertools
+import threading
 from typing import List, Optional, Set, Dict, Any
-from .types import DialogueState, SpeechAct, DialogueType, SpeechActType
+from .types import (
+    DialogueState, DialogueLog, CommitmentDelta, SpeechAct, DialogueType,
+    SpeechActType, DialecticalTree, CommitmentIndex
+)
+from . import dialectic, commitment_index, protocol
 
-_dialogue_counter = 0
+# next() on itertools.count is atomic, so concurrent callers never share an id
+_dialogue_ids = itertools.count(1)
+_ids_lock = threading.Lock()
+
+def next_dialogue_id() -> str:
+    return f"dialogue_{next(_dialogue_ids)}"
 
 def create_dialogue(
     type: DialogueType,
     topic: str,
     participants: List[str]
 ) -> DialogueState:
-    global _dialogue_counter
-    _dialogue_counter += 1
-    
+    protocol.get_protocol(type)  # unknown types raise before an id is taken
     commitments = {p: set() for p in participants}
     
     return DialogueState(
-        id=f"dialogue_{_dialogue_counter}",
+        id=next_dialogue_id(),
         type=type,
         topic=topic,
         participants=participants,
-        moves=[],
-        commitments=commitments
+        log=DialogueLog(moves=[], deltas=[], serialized=[], commitments=commitments)
     )
 
+def advance_counter(minimum: int) -> None:
+    # Restored dialogues keep their ids, so new ones must start after them
+    global _dialogue_ids
+    with _ids_lock:
+        current = next(_dialogue_ids)
+        _dialogue_ids = itertools.count(max(current, minimum + 1))
+
 def get_commitments(state: DialogueState, participant: str) -> Set[str]:
     return state.commitments.get(participant, set())
 
-PROTOCOL = {
-    "claim": ["why", "claim", "concede"],
-    "why": ["since", "retract"],
-    "concede": [],
-    "retract": [],
-    "since": ["why", "concede"],
-    "question": ["claim", "retract"]
-}
+def challenges_of(state: DialogueState) -> Dict[str, int]:
+    if state.length == len(state.log.moves):
+        return state.log.challenges
+    # Older snapshot: replay its prefix
+    return protocol.open_challenges(
+        protocol.get_protocol(state.type), state.log.moves[:state.length]
+    )
 
 def is_valid_move(state: DialogueState, move: SpeechAct) -> bool:
-    if not state.moves:
-        return move.act in ["claim", "question"]
-        
-    if move.speaker not in state.participants:
-        return False
-        
-    last_move = state.moves[-1]
-    valid_responses = PROTOCOL.get(last_move.act, [])
-    
-    if not valid_responses:
-        return move.act in ["claim", "question"]
-        
-    return move.act in valid_responses
+    return protocol.is_legal(
+        protocol.get_protocol(state.type), state, move, challenges_of(state)
+    )
+
+def legal_moves(state: DialogueState) -> Dict[str, Any]:
+    return protocol.legal_moves(
+        protocol.get_protocol(state.type), state, challenges_of(state)
+    )
 
-def make_move(state: DialogueState, move: SpeechAct) -> DialogueState:
-    new_commitments = {k: set(v) for k, v in state.commitments.items()}
-    store = new_commitments.get(move.speaker, set())
+def commitment_delta(
+    store: Set[str],
+    speaker: str,
+    move: SpeechAct
+) -> CommitmentDelta:
+    added = []
+    removed = []
     
-    if move.act == "claim":
-        store.add(move.content)
-    elif move.act == "concede":
-        store.add(move.content)
+    if move.act in ["claim", "concede"]:
+        added.append(move.content)
     elif move.act == "retract":
         if move.content in store:
-            store.remove(move.content)
+            removed.append(move.content)
     elif move.act == "since":
-        store.add(move.content)
+        added.append(move.content)
         if move.premises:
-            for p in move.premises:
-                store.add(p)
-                
-    new_commitments[move.speaker] = store
+            added.extend(move.premises)
+
+    # Keep only real changes (and each once) so the delta can be undone
+    new = tuple(dict.fromkeys(p for p in added if p not in store))
+    return CommitmentDelta(speaker=speaker, added=new, removed=tuple(removed))
+
+def restore_log(
+    type: DialogueType,
+    moves: List[SpeechAct],
+    deltas: List[CommitmentDelta],
+    commitments: Dict[str, Set[str]],
+    serialized: Optional[List[Dict[str, Any]]] = None
+) -> DialogueLog:
+    # Rebuild the derived structures of a log from its moves
+    if serialized is None:
+        serialized = [serialize_move(m) for m in moves]
+    return DialogueLog(
+        moves=moves,
+        deltas=deltas,
+        serialized=serialized,
+        commitments=commitments,
+        tree=dialectic.build_tree(moves),
+        challenges=protocol.open_challenges(protocol.get_protocol(type), moves)
+    )
+
+def _fork(state: DialogueState) -> DialogueLog:
+    # Moving from an older snapshot branches the history: copy its prefix
+    log = state.log
+    n = state.length
+    return restore_log(
+        state.type,
+        log.moves[:n],
+        log.deltas[:n],
+        {k: set(v) for k, v in state.commitments.items()},
+        log.serialized[:n]
+    )
+
+def make_move(
+    state: DialogueState,
+    move: SpeechAct,
+    index: Optional[CommitmentIndex] = None
+) -> DialogueState:
+    log = state.log
+    if state.length != len(log.moves):
+        if index is not None:
+            # The index follows the tip; swap its entries for the branch
+            commitment_index.unregister_commitments(index, state.id, log.commitments)
+        log = _fork(state)
+        if index is not None:
+            commitment_index.register_commitments(index, state.id, log.commitments)
+        
+    store = log.commitments.setdefault(move.speaker, set())
+    delta = commitment_delta(store, move.speaker, move)
+    store.update(delta.added)
+    store.difference_update(delta.removed)
+    if index is not None:
+        commitment_index.apply_delta(index, state.id, delta)
     
     new_move = SpeechAct(
         speaker=move.speaker,
@@ -77,34 +141,89 @@ def make_move(state: DialogueState, move: SpeechAct) -> DialogueState:
         # Use simple integer timestamp or None for testing consistency
         timestamp=int(time.time() * 1000)
     )
+    previous = log.moves[-1] if log.moves else None
+    dialectic.apply_move(log.tree, new_move, len(log.moves), previous)
+    protocol.advance(
+        protocol.get_protocol(state.type), log.challenges, new_move, len(log.moves)
+    )
+    log.moves.append(new_move)
+    log.deltas.append(delta)
+    log.serialized.append(serialize_move(new_move))
     
     return DialogueState(
         id=state.id,
         type=state.type,
         topic=state.topic,
         participants=state.participants,
-        moves=state.moves + [new_move],
-        commitments=new_commitments
+        log=log,
+        length=len(log.moves)
     )
+
+def tree_of(state: DialogueState) -> DialecticalTree:
+    if state.length == len(state.log.moves):
+        return state.log.tree
+    # Older snapshot: replay its prefix
+    return dialectic.build_tree(state.log.moves[:state.length])
+
+def serialize_move(m: SpeechAct) -> Dict[str, Any]:
+    return {
+        "speaker": m.speaker,
+        "act": m.act,
+        "content": m.content,
+        "premises": m.premises,
+        "timestamp": m.timestamp
+    }
     
 def serialize_dialogue(state: DialogueState) -> Dict[str, Any]:
-    commitments = {k: list(v) for k, v in state.commitments.items()}
-    moves = []
-    for m in state.moves:
-        moves.append({
-            "speaker": m.speaker,
-            "act": m.act,
-            "content": m.content,
-            "premises": m.premises,
-            "timestamp": m.timestamp
-        })
+    # Sorted so the same stores always serialize the same way
+    commitments = {k: sorted(v) for k, v in state.commitments.items()}
         
     return {
         "id": state.id,
         "type": state.type,
         "topic": state.topic,
         "participants": state.participants,
-        "moves": moves,
+        "moves": state.log.serialized[:state.length],
         "commitments": commitments,
-        "moveCount": len(state.moves)
+        "status": dialectic.status(tree_of(state)),
+        "moveCount": state.length
+    }
+
+def commitment_changes(
+    state: DialogueState,
+    since: int
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Net commitment changes per participant between move `since` and the
+    current tip of `state`, computed from the logged deltas alone.
+    """
+    before: Dict[str, Dict[str, bool]] = {}
+    for delta in state.log.deltas[since:state.length]:
+        seen = before.setdefault(delta.speaker, {})
+        # The first delta touching a proposition tells whether it was held
+        for p in delta.added:
+            seen.setdefault(p, False)
+        for p in delta.removed:
+            seen.setdefault(p, True)
+
+    changes = {}
+    commitments = state.commitments
+    for speaker, seen in before.items():
+        store = commitments.get(speaker, set())
+        added = [p for p, held in seen.items() if not held and p in store]
+        removed = [p for p, held in seen.items() if held and p not in store]
+        if added or removed:
+            changes[speaker] = {"added": added, "removed": removed}
+    return changes
+
+def serialize_since(state: DialogueState, since: int) -> Dict[str, Any]:
+    if since < 0 or since > state.length:
+        raise ValueError(f"since_move must be between 0 and {state.length}")
+    return {
+        "id": state.id,
+        "since": since,
+        "moves": state.log.serialized[since:state.length],
+        "commitmentChanges": commitment_changes(state, since),
+        "status": dialectic.status(tree_of(state)),
+        "moveCount": state.length
     }
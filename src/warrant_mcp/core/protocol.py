@@ -0,0 +1,165 @@
+import json
+import tomllib
+from pathlib import Path
+from typing import List, Dict, Any
+from .types import CompiledProtocol, DialogueState, SpeechAct
+
+BUILTIN_DIR = Path(__file__).resolve().parent.parent / "protocols"
+DEFAULT_PROTOCOL = "persuasion"
+
+_protocols: Dict[str, CompiledProtocol] = {}
+
+def compile_protocol(data: Dict[str, Any]) -> CompiledProtocol:
+    name = data.get("name")
+    replies = data.get("replies")
+    if not name or not isinstance(replies, dict):
+        raise ValueError("A protocol needs a name and a replies table")
+    openers = data.get("openers") or []
+    answers = data.get("answers") or []
+    challenge = data.get("challenge")
+
+    acts = list(dict.fromkeys(
+        [*replies, *openers, *answers]
+        + [a for allowed in replies.values() for a in allowed]
+        + ([challenge] if challenge else [])
+    ))
+    index = {a: i for i, a in enumerate(acts)}
+
+    def mask(names: List[str]) -> int:
+        m = 0
+        for a in names:
+            m |= 1 << index[a]
+        return m
+
+    opener_mask = mask(openers)
+    # An act with no replies closes the exchange: the next move opens anew
+    reply_masks = tuple(mask(replies.get(a, [])) or opener_mask for a in acts)
+    return CompiledProtocol(
+        name=name,
+        acts=tuple(acts),
+        index=index,
+        openers=opener_mask,
+        replies=reply_masks,
+        # In the order the protocol lists them
+        legal=tuple(tuple(replies.get(a) or openers) for a in acts),
+        challenge=challenge,
+        answers=mask(answers)
+    )
+
+def register_protocol(protocol: CompiledProtocol) -> None:
+    _protocols[protocol.name] = protocol
+
+def _read_protocols(directory: Path) -> List[CompiledProtocol]:
+    loaded = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix == ".json":
+            data = json.loads(path.read_text(encoding="utf-8"))
+        elif path.suffix == ".toml":
+            data = tomllib.loads(path.read_text(encoding="utf-8"))
+        else:
+            continue
+        try:
+            protocol = compile_protocol(data)
+        except (ValueError, KeyError) as e:
+            raise ValueError(f"{path.name}: {e}") from e
+        loaded.append(protocol)
+    return loaded
+
+def _ensure_builtins() -> None:
+    if not _protocols:
+        for p in _read_protocols(BUILTIN_DIR):
+            register_protocol(p)
+
+def load_protocols(directory: str) -> List[str]:
+    """
+    Load custom protocols from every *.json and *.toml file in `directory`.
+    A custom protocol replaces a built-in one of the same name.
+    """
+    _ensure_builtins()
+    loaded = _read_protocols(Path(directory))
+    for p in loaded:
+        register_protocol(p)
+    return [p.name for p in loaded]
+
+def get_protocol(name: str) -> CompiledProtocol:
+    _ensure_builtins()
+    compiled = _protocols.get(name)
+    if compiled is None:
+        raise ValueError(
+            f"Unknown dialogue type: {name}. Available: {', '.join(list_protocols())}"
+        )
+    return compiled
+
+def list_protocols() -> List[str]:
+    _ensure_builtins()
+    return sorted(_protocols)
+
+def advance(
+    protocol: CompiledProtocol,
+    challenges: Dict[str, int],
+    move: SpeechAct,
+    position: int
+) -> None:
+    # Track which challenges are still waiting for an answer
+    bit = protocol.index.get(move.act)
+    if bit is None:
+        return
+    if move.act == protocol.challenge:
+        challenges[move.content] = position
+    elif protocol.answers >> bit & 1:
+        challenges.pop(move.content, None)
+
+def open_challenges(
+    protocol: CompiledProtocol,
+    moves: List[SpeechAct]
+) -> Dict[str, int]:
+    challenges: Dict[str, int] = {}
+    for i, move in enumerate(moves):
+        advance(protocol, challenges, move, i)
+    return challenges
+
+def is_legal(
+    protocol: CompiledProtocol,
+    state: DialogueState,
+    move: SpeechAct,
+    challenges: Dict[str, int]
+) -> bool:
+    bit = protocol.index.get(move.act)
+    if bit is None:
+        return False
+    if state.length == 0:
+        return bool(protocol.openers >> bit & 1)
+    if move.speaker not in state.participants:
+        return False
+    last = protocol.index.get(state.log.moves[state.length - 1].act)
+    allowed = protocol.replies[last] if last is not None else protocol.openers
+    if allowed >> bit & 1:
+        return True
+    # Any open challenge may be answered, not only the latest move
+    return bool(protocol.answers >> bit & 1) and move.content in challenges
+
+def _names(protocol: CompiledProtocol, mask: int) -> List[str]:
+    return [a for i, a in enumerate(protocol.acts) if mask >> i & 1]
+
+def legal_moves(
+    protocol: CompiledProtocol,
+    state: DialogueState,
+    challenges: Dict[str, int]
+) -> Dict[str, Any]:
+    last = None
+    if state.length > 0:
+        last = protocol.index.get(state.log.moves[state.length - 1].act)
+    # Precomputed per last act; only the open challenges are listed
+    if last is None:
+        acts = _names(protocol, protocol.openers)
+    else:
+        acts = list(protocol.legal[last])
+    answers = _names(protocol, protocol.answers)
+    return {
+        "protocol": protocol.name,
+        "acts": acts,
+        "openChallenges": [
+            {"content": c, "move": i, "answers": answers}
+            for c, i in challenges.items()
+        ]
+    }
@@ -0,0 +1,111 @@
+from dataclasses import replace
+from typing import List, Optional, Dict, Any, Tuple
+from .types import CQTracker, SchemeInstance, CriticalQuestion, CQStatus
+from . import walton
+
+def create_tracker(instances: Optional[Dict[str, SchemeInstance]] = None) -> CQTracker:
+    # `instances` may be any mapping, e.g. a bounded session store
+    return CQTracker(instances={} if instances is None else instances, open={}, failed={})
+
+def open_instance(tracker: CQTracker, scheme: str, claim: str) -> SchemeInstance:
+    s = walton.get_scheme(scheme)
+    if not s:
+        raise ValueError(f"Unknown scheme: {scheme}")
+
+    tracker.counter += 1
+    instance = SchemeInstance(
+        id=f"cqi_{tracker.counter}",
+        scheme=scheme,
+        claim=claim,
+        questions={cq.id: cq for cq in s.criticalQuestions}
+    )
+    tracker.instances[instance.id] = instance
+    index = tracker.open.setdefault(scheme, {})
+    for cq_id in instance.questions:
+        index[(instance.id, cq_id)] = None
+    return instance
+
+def forget_instance(tracker: CQTracker, instance: SchemeInstance) -> None:
+    # Drop an instance's questions from the indexes (it left `instances`)
+    for cq_id, cq in instance.questions.items():
+        _index(tracker, status_of(cq), instance.scheme).pop((instance.id, cq_id), None)
+
+def status_of(cq: CriticalQuestion) -> CQStatus:
+    if cq.satisfied is None:
+        return "open"
+    return "satisfied" if cq.satisfied else "failed"
+
+def answer_question(
+    tracker: CQTracker,
+    instance_id: str,
+    cq_id: str,
+    answer: str,
+    satisfied: bool
+) -> CriticalQuestion:
+    instance = tracker.instances.get(instance_id)
+    if not instance:
+        raise ValueError(f"Scheme instance not found: {instance_id}")
+    cq = instance.questions.get(cq_id)
+    if not cq:
+        raise ValueError(f"Unknown critical question {cq_id} for {instance_id}")
+
+    key = (instance_id, cq_id)
+    # Re-answering may move a question from failed to satisfied or back
+    _index(tracker, status_of(cq), instance.scheme).pop(key, None)
+    answered = replace(cq, answer=answer, satisfied=satisfied)
+    instance.questions[cq_id] = answered
+    if not satisfied:
+        tracker.failed.setdefault(instance.scheme, {})[key] = None
+    return answered
+
+def _index(
+    tracker: CQTracker,
+    status: CQStatus,
+    scheme: str
+) -> Dict[Tuple[str, str], None]:
+    if status == "open":
+        return tracker.open.get(scheme, {})
+    if status == "failed":
+        return tracker.failed.get(scheme, {})
+    return {}
+
+def query_questions(
+    tracker: CQTracker,
+    status: CQStatus = "open",
+    scheme: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    List open or failed critical questions, optionally for one scheme. Reads
+    the inverted index, so cost follows the number of hits, not instances.
+    """
+    if status not in ("open", "failed"):
+        raise ValueError(f"Can only query open or failed questions, not {status}")
+    index = tracker.open if status == "open" else tracker.failed
+    schemes = [scheme] if scheme else list(index)
+
+    results = []
+    for name in schemes:
+        # Reading an instance may evict others from a bounded store
+        for instance_id, cq_id in list(index.get(name, {})):
+            if limit is not None and len(results) >= limit:
+                return results
+            instance = tracker.instances.get(instance_id)
+            if instance is None:
+                continue
+            cq = instance.questions[cq_id]
+            results.append({
+                "instance": instance_id,
+                "scheme": name,
+                "claim": instance.claim,
+                "id": cq_id,
+                "question": cq.question,
+                "answer": cq.answer
+            })
+    return results
+
+def count_questions(tracker: CQTracker) -> Dict[str, Dict[str, int]]:
+    return {
+        "open": {name: len(keys) for name, keys in tracker.open.items() if keys},
+        "failed": {name: len(keys) for name, keys in tracker.failed.items() if keys}
+    }
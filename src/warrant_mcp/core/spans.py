@@ -0,0 +1,38 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+# Per-phase timings (parse, compile, preprocess, search, serialize, ...) of
+# the current call, summed by phase name. Like core.counters they are only
+# recorded inside a scope(), so unprofiled calls pay one context lookup.
+
+_active: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar("warrant_spans", default=None)
+
+def start() -> Optional[float]:
+    return time.perf_counter() if _active.get() is not None else None
+
+def stop(name: str, started: Optional[float]) -> None:
+    recorded = _active.get()
+    if recorded is None or started is None:
+        return
+    entry = recorded.setdefault(name, [0.0, 0])
+    entry[0] += time.perf_counter() - started
+    entry[1] += 1
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    started = start()
+    try:
+        yield
+    finally:
+        stop(name, started)
+
+@contextmanager
+def scope() -> Iterator[Dict[str, List[float]]]:
+    recorded: Dict[str, List[float]] = {}
+    reset = _active.set(recorded)
+    try:
+        yield recorded
+    finally:
+        _active.reset(reset)
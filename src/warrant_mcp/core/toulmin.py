@@ -1,4 +1,5 @@
-from typing import List, Optional, Union
+import json
+from typing import List, Optional, Union, Dict, Any, Iterable, Iterator, IO, Tuple
 from .types import ToulminArgument, Evidence, EvidenceType, QualifierLevel, ValidationResult, ScoreBreakdown
 
 def create_argument(
@@ -71,7 +72,10 @@ EVIDENCE_WEIGHTS = {
     "hypothetical": 0.02
 }
 
-def score_argument(arg: ToulminArgument) -> ScoreBreakdown:
+def score_argument(
+    arg: ToulminArgument,
+    rebuttal_penalty: float = 0.0
+) -> ScoreBreakdown:
     base = 0.3
     
     evidence_bonus = 0.0
@@ -82,10 +86,10 @@ def score_argument(arg: ToulminArgument) -> ScoreBreakdown:
         
     warrant_bonus = 0.1 if arg.warrant else 0.0
     backing_bonus = min(len(arg.backing) * 0.05, 0.15) if arg.backing else 0.0
-    rebuttal_penalty = 0.0
     
-    numerator = base + evidence_bonus + warrant_bonus + backing_bonus - rebuttal_penalty
-    total = min(max(numerator, 0.0), 1.0)
+    numerator = base + evidence_bonus + warrant_bonus + backing_bonus
+    # Penalty from defeaters (see graph.py) applies to the clamped score
+    total = max(min(max(numerator, 0.0), 1.0) - rebuttal_penalty, 0.0)
     
     return ScoreBreakdown(
         base=base,
@@ -95,3 +99,122 @@ def score_argument(arg: ToulminArgument) -> ScoreBreakdown:
         rebuttalPenalty=rebuttal_penalty,
         total=total
     )
+
+# Batch evaluation
+
+_decoder = json.JSONDecoder()
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+def evaluate_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    arg = create_argument(
+        claim=record.get("claim", ""),
+        data=record.get("data") or [],
+        warrant=record.get("warrant"),
+        backing=record.get("backing"),
+        rebuttal=record.get("rebuttal"),
+        qualifier=record.get("qualifier", "presumably")
+    )
+    validation = validate_argument(arg)
+    score = score_argument(arg)
+    # Built by hand: dataclasses.asdict deep-copies every nested list
+    return {
+        "valid": validation.valid,
+        "strength": validation.strength,
+        "issues": validation.issues,
+        "warnings": validation.warnings,
+        "score": {
+            "base": score.base,
+            "evidenceBonus": score.evidenceBonus,
+            "warrantBonus": score.warrantBonus,
+            "backingBonus": score.backingBonus,
+            "rebuttalPenalty": score.rebuttalPenalty,
+            "total": score.total
+        }
+    }
+
+def evaluate_records(
+    records: Iterable[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    for i, record in enumerate(records):
+        result = _evaluate_safely(record)
+        result["index"] = i
+        yield result
+
+def _evaluate_safely(record: Any) -> Dict[str, Any]:
+    try:
+        if not isinstance(record, dict):
+            raise TypeError("record must be a JSON object")
+        result = evaluate_record(record)
+    except (TypeError, ValueError, AttributeError) as e:
+        result = {"error": str(e)}
+    if isinstance(record, dict) and "id" in record:
+        result["id"] = record["id"]
+    return result
+
+def summarize_results(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    summary = {
+        "processed": 0,
+        "valid": 0,
+        "invalid": 0,
+        "errors": 0,
+        "strength": {"strong": 0, "moderate": 0, "weak": 0},
+        "meanScore": 0.0
+    }
+    total = 0.0
+    for result in results:
+        summary["processed"] += 1
+        if "error" in result:
+            summary["errors"] += 1
+            continue
+        summary["valid" if result["valid"] else "invalid"] += 1
+        summary["strength"][result["strength"]] += 1
+        total += result["score"]["total"]
+    scored = summary["valid"] + summary["invalid"]
+    if scored:
+        summary["meanScore"] = total / scored
+    return summary
+
+def evaluate_jsonl(
+    source: IO[str],
+    sink: IO[str],
+    chunk_size: int = 1000
+) -> Dict[str, Any]:
+    """
+    Stream a JSONL corpus of Toulmin arguments, writing one JSONL result per
+    input line. Only one chunk of lines is held in memory at a time.
+    """
+    return summarize_results(_stream_jsonl(source, sink, chunk_size))
+
+def _stream_jsonl(
+    source: IO[str],
+    sink: IO[str],
+    chunk_size: int
+) -> Iterator[Dict[str, Any]]:
+    # Both buffers are reused across chunks rather than reallocated
+    pending: List[Tuple[int, str]] = []
+    encoded: List[str] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        for lineno, line in pending:
+            try:
+                record = _decoder.decode(line)
+            except ValueError as e:
+                result = {"error": f"Invalid JSON: {e}"}
+            else:
+                result = _evaluate_safely(record)
+            result["line"] = lineno
+            encoded.append(_encoder.encode(result))
+            yield result
+        if encoded:
+            encoded.append("")
+            sink.write("\n".join(encoded))
+        pending.clear()
+        encoded.clear()
+
+    for lineno, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        pending.append((lineno, line))
+        if len(pending) >= chunk_size:
+            yield from flush()
+    yield from flush()
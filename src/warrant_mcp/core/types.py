@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Literal, Set, List, Optional, Tuple, Dict
+from dataclasses import dataclass, field
+from typing import Literal, Set, FrozenSet, List, Optional, Tuple, Dict, Union, Any
 
 # Dung's Abstract Argumentation Framework
 
@@ -9,6 +9,18 @@ class ArgumentationFramework:
     # Stored as "attacker->target" for Set compatibility
     attacks: Set[str]
 
+@dataclass
+class CompiledFramework:
+    # Index-based view of an AF used by the solvers: argument i is names[i].
+    names: List[str]
+    index: Dict[str, int]
+    attackers: List[List[int]]
+    targets: List[List[int]]
+    # Int bitsets mirroring attackers/targets, built on first use by the
+    # labelling search (they cost O(n^2) bits, grounded never needs them)
+    attacker_masks: Optional[List[int]] = None
+    target_masks: Optional[List[int]] = None
+
 # Bipolar AF (Attack + Support)
 
 @dataclass
@@ -16,6 +28,9 @@ class BipolarFramework(ArgumentationFramework):
     # Stored as "supporter->supported" strings
     supports: Set[str]
 
+# Cayrol & Lagasquie-Schiex admissibility flavours: d(efence), s(afe), c(losed)
+AdmissibilityType = Literal["d", "s", "c"]
+
 # Toulmin Model
 
 EvidenceType = Literal[
@@ -81,20 +96,47 @@ class Defeater:
 
 # Walton's Schemes
 
-@dataclass
+# Frozen: catalog schemes are built once and shared between all callers
+
+@dataclass(frozen=True)
 class CriticalQuestion:
     id: str
     question: str
     answer: Optional[str] = None
     satisfied: Optional[bool] = None
 
-@dataclass
+@dataclass(frozen=True)
 class ArgumentationScheme:
     name: str
     majorPremise: str
     minorPremise: str
     conclusion: str
-    criticalQuestions: List[CriticalQuestion]
+    criticalQuestions: Tuple[CriticalQuestion, ...]
+
+@dataclass(frozen=True)
+class SchemeSummary:
+    name: str
+    title: str
+    criticalQuestions: int
+
+CQStatus = Literal["open", "satisfied", "failed"]
+
+@dataclass
+class SchemeInstance:
+    id: str
+    scheme: str
+    claim: str
+    # CQ id -> question; answered ones are replaced with answered copies
+    questions: Dict[str, CriticalQuestion]
+
+@dataclass
+class CQTracker:
+    instances: Dict[str, SchemeInstance]
+    # Inverted indexes: scheme -> (instance id, CQ id) keys. Dicts used as
+    # insertion-ordered sets so query results come back oldest first.
+    open: Dict[str, Dict[Tuple[str, str], None]]
+    failed: Dict[str, Dict[Tuple[str, str], None]]
+    counter: int = 0
 
 # Prakken's Dialogue
 
@@ -123,14 +165,170 @@ class SpeechAct:
     premises: Optional[List[str]] = None
     timestamp: Optional[int] = None
 
+@dataclass
+class CommitmentDelta:
+    speaker: str
+    # Only propositions whose membership actually changed, so deltas undo cleanly
+    added: Tuple[str, ...]
+    removed: Tuple[str, ...]
+
+@dataclass(frozen=True)
+class CompiledProtocol:
+    name: str
+    # Speech acts and their bit positions
+    acts: Tuple[str, ...]
+    index: Dict[str, int]
+    # Bitmask of acts that may open a dialogue (or follow a closing act)
+    openers: int
+    # replies[i]: bitmask of acts legal after act i
+    replies: Tuple[int, ...]
+    # legal[i]: the same acts as names, ready to return
+    legal: Tuple[Tuple[str, ...], ...]
+    # Act that opens a challenge, and acts that answer an open challenge
+    challenge: Optional[str]
+    answers: int
+
+@dataclass
+class CommitmentIndex:
+    # Inverted indexes across dialogues, dicts used as ordered sets:
+    # proposition -> (dialogue id, participant) currently committed to it
+    propositions: Dict[str, Dict[Tuple[str, str], None]] = field(default_factory=dict)
+    # participant -> dialogue ids they take part in
+    participants: Dict[str, Dict[str, None]] = field(default_factory=dict)
+    # topic -> dialogue ids
+    topics: Dict[str, Dict[str, None]] = field(default_factory=dict)
+
+TreeNodeKind = Literal["claim", "argument", "challenge"]
+
+@dataclass
+class TreeSegment:
+    # Maximal unary path: every node above `bottom` has one open child
+    top: int
+    bottom: int
+
+@dataclass
+class TreeNode:
+    id: int
+    speaker: str
+    kind: TreeNodeKind
+    content: str
+    # Index of the move that created the node
+    move: int
+    # The node this one attacks; None for an issue (root)
+    parent: Optional[int] = None
+    depth: int = 0
+    # Open children, in insertion order
+    children: Dict[int, None] = field(default_factory=dict)
+    # Retracted or conceded nodes are closed and no longer attack
+    open: bool = True
+    # Open children labelled IN; kept for nodes that end a segment
+    in_children: int = 0
+    segment: Optional[TreeSegment] = None
+
+@dataclass
+class DialecticalTree:
+    nodes: List[TreeNode] = field(default_factory=list)
+    roots: List[int] = field(default_factory=list)
+    # Latest open node asserting a proposition (claims, arguments, premises)
+    asserted: Dict[str, int] = field(default_factory=dict)
+    # Latest open challenge of a proposition
+    challenges: Dict[str, int] = field(default_factory=dict)
+    # Open attacks nobody has replied to yet (open leaves below a root)
+    issues: Dict[int, None] = field(default_factory=dict)
+
+@dataclass
+class DialogueLog:
+    # Append-only history shared by every snapshot of one dialogue
+    moves: List[SpeechAct]
+    # deltas[i] is the commitment effect of moves[i]
+    deltas: List[CommitmentDelta]
+    # moves[i] rendered once, reused by every serialization
+    serialized: List[Dict[str, Any]]
+    # Commitment stores after the last logged move
+    commitments: Dict[str, Set[str]]
+    # Dialectical tree after the last logged move
+    tree: DialecticalTree = field(default_factory=DialecticalTree)
+    # Open challenges: proposition -> index of the move that raised it
+    challenges: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def move_count(self) -> int:
+        # Journaled logs know their length before their moves are parsed
+        return len(self.moves)
+
 @dataclass
 class DialogueState:
     id: str
     type: DialogueType
     topic: str
     participants: List[str]
-    moves: List[SpeechAct]
-    commitments: Dict[str, Set[str]]
+    log: DialogueLog
+    # This snapshot sees the first `length` moves of the log
+    length: int = 0
+
+    @property
+    def moves(self) -> List[SpeechAct]:
+        if self.length == len(self.log.moves):
+            return self.log.moves
+        return self.log.moves[:self.length]
+
+    @property
+    def commitments(self) -> Dict[str, Set[str]]:
+        return commitments_at(self.log, self.length)
+
+# ASPIC+ Argument Construction
+
+RuleType = Literal["strict", "defeasible"]
+AspicAttackType = Literal["undermining", "rebutting", "undercutting"]
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    antecedents: Tuple[str, ...]
+    conclusion: str
+    type: RuleType
+
+@dataclass
+class AspicTheory:
+    axioms: Set[str]
+    # Ordinary (fallible) premises
+    premises: Set[str]
+    rules: Dict[str, Rule]
+    # x -> everything strictly preferred over x (rules or premises)
+    better: Dict[str, Set[str]] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class AspicArgument:
+    id: int
+    conclusion: str
+    # Top rule name; None for a premise
+    rule: Optional[str]
+    # Direct sub-arguments
+    subs: Tuple[int, ...]
+    # Conclusions of every sub-argument, itself included
+    conclusions: FrozenSet[str]
+    # Last defeasible rules and ordinary premises, for the last-link order
+    last_rules: FrozenSet[str]
+    premises: FrozenSet[str]
+    axiom: bool = False
+
+@dataclass
+class AspicAttack:
+    attacker: int
+    target: int
+    type: AspicAttackType
+    # The sub-argument of `target` the attack is on
+    on: int
+    defeat: bool
+
+@dataclass
+class ArgumentSystem:
+    theory: AspicTheory
+    arguments: List[AspicArgument]
+    # Direct attacks on the attacked sub-argument itself
+    attacks: List[AspicAttack]
+    # Defeats extended to every argument containing the attacked one
+    framework: CompiledFramework
 
 # ASPIC+ Disagreement
 
@@ -149,6 +347,32 @@ class DisagreementDiagnosis:
     agentA: str
     agentB: str
 
+# Argument Graph (Toulmin arguments + Pollock defeaters as a weighted AF)
+
+GraphLabel = Literal["IN", "OUT", "UNDEC"]
+
+@dataclass
+class GraphNode:
+    id: str
+    kind: Literal["argument", "defeater"]
+    payload: Union[ToulminArgument, Defeater]
+    # Intrinsic strength before attacks: Toulmin score or defeater strength
+    weight: float
+    # Attack weight this node puts on its targets (defeater_penalty)
+    penalty: float = 0.0
+    attackers: List[str] = field(default_factory=list)
+    targets: List[str] = field(default_factory=list)
+    label: GraphLabel = "IN"
+    score: float = 0.0
+
+@dataclass
+class ArgumentGraph:
+    id: str
+    nodes: Dict[str, GraphNode]
+    # Claim text -> latest argument node making that claim
+    claims: Dict[str, str]
+    counter: int = 0
+
 # Attack/Support encoding helpers
 
 def encode_relation(from_node: str, to_node: str) -> str:
@@ -157,3 +381,14 @@ def encode_relation(from_node: str, to_node: str) -> str:
 def decode_relation(rel: str) -> Tuple[str, str]:
     parts = rel.split("->")
     return (parts[0], parts[1])
+
+def commitments_at(log: DialogueLog, length: int) -> Dict[str, Set[str]]:
+    if length == log.move_count:
+        return log.commitments
+    # Older snapshot: undo the newer deltas on a copy of the latest stores
+    stores = {k: set(v) for k, v in log.commitments.items()}
+    for delta in reversed(log.deltas[length:]):
+        store = stores[delta.speaker]
+        store.difference_update(delta.added)
+        store.update(delta.removed)
+    return stores
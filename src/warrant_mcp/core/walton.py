@@ -1,5 +1,12 @@
-from typing import List, Optional, Tuple, Dict
-from .types import ArgumentationScheme, CriticalQuestion
+import json
+import os
+import re
+import tomllib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple, Dict, Any, Iterable, Iterator, Sized
+from .types import ArgumentationScheme, CriticalQuestion, SchemeSummary
 
 def create_scheme(
     name: str,
@@ -8,10 +15,10 @@ def create_scheme(
     conclusion: str,
     cqs: List[Tuple[str, str]]
 ) -> ArgumentationScheme:
-    questions = [
+    questions = tuple(
         CriticalQuestion(id=cq_id, question=q)
         for cq_id, q in cqs
-    ]
+    )
     return ArgumentationScheme(
         name=name,
         majorPremise=major_premise,
@@ -138,34 +145,288 @@ SCHEMES = {
     "sunk_cost": sunk_cost
 }
 
+INDICATORS = {
+    "expert_opinion": ["expert", "authority", "research shows", "study", "according to"],
+    "position_to_know": ["insider", "first-hand", "witnessed", "experienced"],
+    "practical_reasoning": ["should", "ought to", "need to", "must", "goal", "in order to"],
+    "consequences": ["will cause", "leads to", "results in", "consequence", "effect"],
+    "analogy": ["similar to", "like", "just as", "same as", "comparable"],
+    "popular_opinion": ["everyone", "most people", "commonly", "widely accepted"],
+    "sign": ["indicates", "sign of", "symptom", "evidence of"],
+    "sunk_cost": ["already invested", "wasted if", "come this far"]
+}
+
+Matcher = Tuple[re.Pattern, Dict[str, List[str]], Dict[str, str]]
+
+def _inflections(kw: str) -> List[str]:
+    # Regular plural and verb forms of a one-word keyword ("experts",
+    # "studies", "indicated"); phrases are matched as written
+    if " " in kw or not kw[-1:].isalpha():
+        return []
+    forms = [kw + "s", kw + "es", kw + "ed", kw + "ing"]
+    if kw.endswith("y"):
+        forms += [kw[:-1] + "ies", kw[:-1] + "ied"]
+    if kw.endswith("e"):
+        forms += [kw + "d", kw[:-1] + "ing"]
+    return forms
+
+def build_matcher(indicators: Dict[str, Iterable[str]]) -> Matcher:
+    keyword_schemes: Dict[str, List[str]] = {}
+    for scheme, keywords in indicators.items():
+        for kw in keywords:
+            kw = " ".join(kw.lower().split())
+            schemes = keyword_schemes.setdefault(kw, []) if kw else None
+            if schemes is not None and scheme not in schemes:
+                schemes.append(scheme)
+
+    # Matched text -> keyword; a keyword written out wins over an inflection
+    forms = {kw: kw for kw in keyword_schemes}
+    for kw in keyword_schemes:
+        for form in _inflections(kw):
+            forms.setdefault(form, kw)
+
+    body = _trie_pattern(forms)
+    # Outer \b stops "like" from firing inside "likely"
+    pattern = re.compile(rf"\b(?:{body})\b") if body else re.compile(r"(?!)")
+    return pattern, keyword_schemes, forms
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    # A prefix trie rendered as nested groups keeps the regex linear in the
+    # text even with thousands of custom keywords; a flat alternation would
+    # retry every keyword at every position.
+    trie: Dict[str, Any] = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + render(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy optional: prefer the longer keyword, back off if the
+            # word boundary fails
+            return f"(?:{body})?"
+        return body
+
+    return render(trie)
+
+# Scheme catalog: built once, swapped wholesale when custom schemes load
+
+_catalog: Dict[str, ArgumentationScheme] = {}
+_indicators: Dict[str, Tuple[str, ...]] = {}
+_summaries: Tuple[SchemeSummary, ...] = ()
+_matcher: Matcher = build_matcher({})
+
+def _install(
+    catalog: Dict[str, ArgumentationScheme],
+    indicators: Dict[str, Tuple[str, ...]]
+) -> None:
+    global _catalog, _indicators, _summaries, _matcher
+    summaries = tuple(
+        SchemeSummary(
+            name=name,
+            title=scheme.name,
+            criticalQuestions=len(scheme.criticalQuestions)
+        )
+        for name, scheme in catalog.items()
+    )
+    matcher = build_matcher(indicators)
+    _catalog, _indicators, _summaries, _matcher = catalog, indicators, summaries, matcher
+
+_install(
+    {name: factory() for name, factory in SCHEMES.items()},
+    {name: tuple(keywords) for name, keywords in INDICATORS.items()}
+)
+
 def get_scheme(name: str) -> Optional[ArgumentationScheme]:
-    factory = SCHEMES.get(name)
-    return factory() if factory else None
+    return _catalog.get(name)
 
 def list_schemes() -> List[str]:
-    return list(SCHEMES.keys())
+    return list(_catalog.keys())
 
-def identify_scheme(claim: str, context: str) -> List[dict]:
-    indicators = {
-        "expert_opinion": ["expert", "authority", "research shows", "study", "according to"],
-        "position_to_know": ["insider", "first-hand", "witnessed", "experienced"],
-        "practical_reasoning": ["should", "ought to", "need to", "must", "goal", "in order to"],
-        "consequences": ["will cause", "leads to", "results in", "consequence", "effect"],
-        "analogy": ["similar to", "like", "just as", "same as", "comparable"],
-        "popular_opinion": ["everyone", "most people", "commonly", "widely accepted"],
-        "sign": ["indicates", "sign of", "symptom", "evidence of"],
-        "sunk_cost": ["already invested", "wasted if", "come this far"]
-    }
-    
-    combined = (claim + " " + context).lower()
+def scheme_summaries() -> Tuple[SchemeSummary, ...]:
+    return _summaries
+
+def schemes_for_keyword(keyword: str) -> List[str]:
+    return list(_matcher[1].get(" ".join(keyword.lower().split()), []))
+
+def register_schemes(
+    schemes: Dict[str, Tuple[ArgumentationScheme, List[str]]]
+) -> None:
+    # Custom schemes may override built-in ones with the same key
+    catalog = dict(_catalog)
+    indicators = dict(_indicators)
+    for key, (scheme, keywords) in schemes.items():
+        catalog[key] = scheme
+        indicators[key] = tuple(keywords)
+    _install(catalog, indicators)
+
+def parse_scheme(data: Dict[str, Any]) -> Tuple[str, ArgumentationScheme, List[str]]:
+    try:
+        key = data["key"]
+        cqs = []
+        for i, cq in enumerate(data.get("criticalQuestions", []), 1):
+            if isinstance(cq, str):
+                cqs.append((f"CQ{i}", cq))
+            elif isinstance(cq, dict):
+                cqs.append((cq.get("id", f"CQ{i}"), cq["question"]))
+            else:
+                cqs.append((cq[0], cq[1]))
+        scheme = create_scheme(
+            data.get("name", key),
+            data["majorPremise"],
+            data["minorPremise"],
+            data["conclusion"],
+            cqs
+        )
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Invalid scheme definition: missing or malformed {e}") from e
+    return key, scheme, list(data.get("indicators", []))
+
+def load_schemes(directory: str) -> List[str]:
+    """
+    Load custom schemes from every *.json and *.toml file in `directory`.
+    A file holds one scheme object, or a list of them under "schemes".
+    """
+    loaded: Dict[str, Tuple[ArgumentationScheme, List[str]]] = {}
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix == ".json":
+            data = json.loads(path.read_text(encoding="utf-8"))
+        elif path.suffix == ".toml":
+            data = tomllib.loads(path.read_text(encoding="utf-8"))
+        else:
+            continue
+
+        entries = data.get("schemes", [data]) if isinstance(data, dict) else data
+        for entry in entries:
+            try:
+                key, scheme, keywords = parse_scheme(entry)
+            except ValueError as e:
+                raise ValueError(f"{path.name}: {e}") from e
+            loaded[key] = (scheme, keywords)
+
+    register_schemes(loaded)
+    return list(loaded.keys())
+
+def match_indicators(text: str) -> Dict[str, List[str]]:
+    pattern, keyword_schemes, forms = _matcher
+    matched: Dict[str, List[str]] = {}
+    seen = set()
+    for m in pattern.finditer(text.lower()):
+        kw = forms[" ".join(m.group().split())]
+        if kw in seen:
+            continue
+        seen.add(kw)
+        for scheme in keyword_schemes[kw]:
+            matched.setdefault(scheme, []).append(kw)
+    return matched
+
+def _rank(matched: Dict[str, List[str]]) -> List[dict]:
+    indicators = _indicators
     results = []
     
+    # Walk the catalog order so equal-confidence ties stay deterministic
     for scheme, keywords in indicators.items():
-        matches = [kw for kw in keywords if kw in combined]
-        if matches:
+        if scheme in matched:
             results.append({
                 "scheme": scheme,
-                "confidence": min(len(matches) / len(keywords), 1.0)
+                "confidence": min(len(matched[scheme]) / len(keywords), 1.0),
+                "matched": matched[scheme]
             })
             
     return sorted(results, key=lambda x: x["confidence"], reverse=True)
+
+def identify_scheme(claim: str, context: str) -> List[dict]:
+    return _rank(match_indicators(claim + " " + context))
+
+# Bulk classification
+
+PARALLEL_THRESHOLD = 2000
+
+def _pool_context() -> Any:
+    # Never fork: the server process runs threads (event loop, solver pool),
+    # and a forked child can inherit a held lock and deadlock
+    import multiprocessing
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def _classify_chunk(texts: List[str]) -> List[List[dict]]:
+    return [_rank(match_indicators(text)) for text in texts]
+
+def _init_worker(indicators: Dict[str, Tuple[str, ...]]) -> None:
+    # Workers may be spawned rather than forked: rebuild the custom catalog
+    global _indicators, _matcher
+    _indicators = indicators
+    _matcher = build_matcher(indicators)
+
+def _chunked(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def classify_claims(
+    pairs: Iterable[Tuple[str, str]],
+    workers: Optional[int] = None,
+    chunk_size: int = 1000
+) -> Iterator[List[dict]]:
+    """
+    Rank schemes for many (claim, context) pairs, yielding results in input
+    order. Large inputs fan out over a process pool in chunks; by default
+    only sized inputs of at least PARALLEL_THRESHOLD pairs do.
+    """
+    if workers is None:
+        large = isinstance(pairs, Sized) and len(pairs) >= PARALLEL_THRESHOLD
+        workers = (os.cpu_count() or 1) if large else 1
+    chunks = _chunked((claim + " " + context for claim, context in pairs), chunk_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _classify_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=_pool_context(),
+        initializer=_init_worker,
+        initargs=(_indicators,)
+    ) as pool:
+        # Bounded read-ahead keeps memory flat for streamed input
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_classify_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def scheme_frequencies(results: Iterable[List[dict]]) -> Dict[str, Any]:
+    matched: Dict[str, int] = {}
+    top: Dict[str, int] = {}
+    processed = 0
+    unmatched = 0
+    for matches in results:
+        processed += 1
+        if not matches:
+            unmatched += 1
+            continue
+        top[matches[0]["scheme"]] = top.get(matches[0]["scheme"], 0) + 1
+        for m in matches:
+            matched[m["scheme"]] = matched.get(m["scheme"], 0) + 1
+    return {
+        "processed": processed,
+        "unmatched": unmatched,
+        "matched": dict(sorted(matched.items(), key=lambda x: x[1], reverse=True)),
+        "top": dict(sorted(top.items(), key=lambda x: x[1], reverse=True))
+    }
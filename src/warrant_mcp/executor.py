@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from .core import cancel, counters
+
+KINDS = ("thread", "process", "inline")
+
+class SolverPool:
+    """
+    Runs CPU-bound core computations away from the event loop, so cheap
+    tools keep answering while a solver works.
+
+    kind "thread" (the default) keeps the loop responsive, "process" also
+    runs solvers in parallel at the cost of pickling inputs and results,
+    and "inline" runs them on the loop as before. If the awaiting task is
+    cancelled (the client aborted the request), a queued job is dropped and
+    a running one stops at its next cancel.check().
+    """
+
+    def __init__(self, kind: str = "thread", workers: Optional[int] = None):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown executor: {kind}. Use {', '.join(KINDS)}.")
+        self.kind = kind
+        self.workers = workers
+        self._executor: Optional[Executor] = None
+        self._manager = None
+        self._lock = threading.Lock()
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        self._running = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # multiprocessing is only imported when processes are used
+                    from concurrent.futures import ProcessPoolExecutor
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="warrant-solver"
+                    )
+            return self._executor
+
+    def _new_token(self) -> Any:
+        if self.kind != "process":
+            return threading.Event()
+        # A plain Event cannot reach a pool worker; a manager proxy can
+        with self._lock:
+            if self._manager is None:
+                import multiprocessing
+                self._manager = multiprocessing.Manager()
+            return self._manager.Event()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)`; `fn` must be a module-level function for "process"."""
+        self._counts["submitted"] += 1
+        try:
+            if self.kind == "inline":
+                self._started()
+                try:
+                    result = fn(*args)
+                finally:
+                    self._stopped()
+            else:
+                token = self._new_token()
+                # Work counters come back with the result, also from processes
+                future = self._get_executor().submit(
+                    cancel.run_with, token, counters.collect, fn, *args
+                )
+                # "running" follows the worker, which may outlive a cancelled caller
+                self._started()
+                future.add_done_callback(self._stopped)
+                try:
+                    result, counts = await asyncio.wrap_future(future)
+                    counters.merge(counts)
+                except asyncio.CancelledError:
+                    token.set()
+                    self._counts["cancelled"] += 1
+                    raise
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._counts["failed"] += 1
+            raise
+        self._counts["completed"] += 1
+        return result
+
+    def _started(self) -> None:
+        with self._lock:
+            self._running += 1
+
+    def _stopped(self, _future: Any = None) -> None:
+        # Also called from pool threads as a done callback
+        with self._lock:
+            self._running -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "running": self._running,
+            **self._counts
+        }
@@ -0,0 +1,24 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return module `name` without running it: its code executes on the first
+    attribute access (importlib.util.LazyLoader). A module that is already
+    imported is returned as is. Used for the core modules and any heavy
+    optional dependency, so that starting the server only pays for what a
+    request actually touches.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
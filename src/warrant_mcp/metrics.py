@@ -0,0 +1,249 @@
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .core import counters
+
+logger = logging.getLogger(__name__)
+
+# Latency histogram bounds in seconds (Prometheus-style cumulative buckets)
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+class ToolStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        # One slot per bound, plus +Inf
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        # Parameter -> [total items, largest input]
+        self.sizes: Dict[str, List[int]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def serialize(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "totalSeconds": round(self.seconds, 6),
+            "meanSeconds": round(self.seconds / self.calls, 6) if self.calls else 0.0,
+            "maxSeconds": round(self.max_seconds, 6),
+            "latency": {
+                **{f"le_{b:g}": n for b, n in zip(BUCKETS, self._cumulative())},
+                "le_inf": self.calls
+            },
+            "inputSizes": {
+                name: {"total": total, "max": largest, "mean": round(total / self.calls, 2)}
+                for name, (total, largest) in self.sizes.items()
+            },
+            "counters": dict(self.counts)
+        }
+
+    def _cumulative(self) -> List[int]:
+        out, running = [], 0
+        for n in self.buckets[:-1]:
+            running += n
+            out.append(running)
+        return out
+
+class Metrics:
+    """
+    Per-tool call counts, latency histograms, input sizes and work counters
+    (e.g. search nodes, session cache hits, reported through core.counters).
+
+    With `path` set, a Prometheus text-format dump is rewritten at most
+    every `interval` seconds, for a node-exporter textfile collector. The
+    write runs on a background thread, and a failed write is logged; it
+    never reaches the tool call that triggered it.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        interval: float = 10.0,
+        clock: Callable[[], float] = time.perf_counter
+    ):
+        self.path = path
+        self.interval = interval
+        self.clock = clock
+        self.started = time.time()
+        self._tools: Dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+        self._dumped = 0.0
+        self._writer: Optional[threading.Thread] = None
+
+    def record(
+        self,
+        tool: str,
+        seconds: float,
+        error: bool,
+        sizes: Dict[str, int],
+        counts: Dict[str, int]
+    ) -> None:
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = ToolStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            slot = len(BUCKETS)
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    slot = i
+                    break
+            stats.buckets[slot] += 1
+            for name, n in sizes.items():
+                entry = stats.sizes.setdefault(name, [0, 0])
+                entry[0] += n
+                entry[1] = max(entry[1], n)
+            for name, n in counts.items():
+                stats.counts[name] = stats.counts.get(name, 0) + n
+        if self.path and time.monotonic() - self._dumped >= self.interval:
+            self._schedule_dump()
+
+    def _schedule_dump(self) -> None:
+        with self._lock:
+            # At most one write in flight; the next due call catches up
+            if self._writer is not None and self._writer.is_alive():
+                return
+            self._dumped = time.monotonic()
+            self._writer = threading.Thread(
+                target=self._dump_logged, name="warrant-metrics", daemon=True
+            )
+            self._writer.start()
+
+    def _dump_logged(self) -> None:
+        try:
+            self.dump()
+        except OSError as exc:
+            logger.warning("Could not write metrics to %s: %s", self.path, exc)
+
+    def flush(self) -> None:
+        """Wait for a pending background dump (tests, shutdown)."""
+        writer = self._writer
+        if writer is not None:
+            writer.join()
+
+    def instrument(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a tool function; the wrapper keeps its name and signature."""
+        name = fn.__name__
+        signature = inspect.signature(fn)
+
+        def sizes_of(args: Tuple, kwargs: Dict[str, Any]) -> Dict[str, int]:
+            try:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+            except TypeError:
+                return {}
+            return {
+                k: len(v) for k, v in bound.items()
+                if isinstance(v, (list, tuple, dict, set))
+            }
+
+        def is_error(result: Any) -> bool:
+            return isinstance(result, dict) and "error" in result
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = self.clock()
+                error = True
+                with counters.scope() as counts:
+                    try:
+                        result = await fn(*args, **kwargs)
+                        error = is_error(result)
+                        return result
+                    finally:
+                        self.record(name, self.clock() - start, error,
+                                    sizes_of(args, kwargs), counts)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = self.clock()
+            error = True
+            with counters.scope() as counts:
+                try:
+                    result = fn(*args, **kwargs)
+                    error = is_error(result)
+                    return result
+                finally:
+                    self.record(name, self.clock() - start, error,
+                                sizes_of(args, kwargs), counts)
+        return wrapper
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            tools = {name: s.serialize() for name, s in sorted(self._tools.items())}
+        return {
+            "uptimeSeconds": round(time.time() - self.started, 3),
+            "calls": sum(t["calls"] for t in tools.values()),
+            "tools": tools
+        }
+
+    def prometheus(self) -> str:
+        lines = [
+            "# HELP warrant_tool_calls_total Tool calls.",
+            "# TYPE warrant_tool_calls_total counter",
+        ]
+        with self._lock:
+            items = sorted(self._tools.items())
+            for name, s in items:
+                lines.append(f'warrant_tool_calls_total{{tool="{name}"}} {s.calls}')
+            lines += [
+                "# HELP warrant_tool_errors_total Tool calls that failed or returned an error.",
+                "# TYPE warrant_tool_errors_total counter",
+            ]
+            for name, s in items:
+                lines.append(f'warrant_tool_errors_total{{tool="{name}"}} {s.errors}')
+            lines += [
+                "# HELP warrant_tool_latency_seconds Tool call latency.",
+                "# TYPE warrant_tool_latency_seconds histogram",
+            ]
+            for name, s in items:
+                for bound, n in zip(BUCKETS, s._cumulative()):
+                    lines.append(
+                        f'warrant_tool_latency_seconds_bucket{{tool="{name}",le="{bound:g}"}} {n}'
+                    )
+                lines.append(f'warrant_tool_latency_seconds_bucket{{tool="{name}",le="+Inf"}} {s.calls}')
+                lines.append(f'warrant_tool_latency_seconds_sum{{tool="{name}"}} {s.seconds:.6f}')
+                lines.append(f'warrant_tool_latency_seconds_count{{tool="{name}"}} {s.calls}')
+            lines += [
+                "# HELP warrant_tool_input_items_total Items passed in list parameters.",
+                "# TYPE warrant_tool_input_items_total counter",
+            ]
+            for name, s in items:
+                for param, (total, _) in sorted(s.sizes.items()):
+                    lines.append(
+                        f'warrant_tool_input_items_total{{tool="{name}",param="{param}"}} {total}'
+                    )
+            lines += [
+                "# HELP warrant_tool_work_total Work counters (search nodes, cache hits, ...).",
+                "# TYPE warrant_tool_work_total counter",
+            ]
+            for name, s in items:
+                for counter, n in sorted(s.counts.items()):
+                    lines.append(
+                        f'warrant_tool_work_total{{tool="{name}",counter="{counter}"}} {n}'
+                    )
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: Optional[str] = None) -> Optional[str]:
+        path = path or self.path
+        if not path:
+            return None
+        self._dumped = time.monotonic()
+        # Write then rename, so scrapers never read half a file
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+        os.replace(tmp, path)
+        return path
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
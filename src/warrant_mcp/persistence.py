@@ -0,0 +1,294 @@
+import json
+import mmap
+import os
+import re
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .core import prakken
+from .core.types import DialogueState, DialogueLog, CommitmentDelta, SpeechAct
+
+# Only ids minted by prakken.next_dialogue_id name files in the journal
+DIALOGUE_ID = re.compile(r"dialogue_\d+")
+
+def is_dialogue_id(dialogue_id: str) -> bool:
+    return DIALOGUE_ID.fullmatch(dialogue_id) is not None
+
+class DialogueJournal:
+    """
+    Durable dialogue storage: one JSONL write-ahead log per dialogue plus a
+    periodic compact snapshot of its commitment stores.
+
+    <id>.jsonl           header line, then one line per accepted move
+    <id>.snapshot.json   {"moves": n, "offset": bytes, "commitments": {...}}
+
+    Recovery loads the snapshot, seeks to its offset and only parses the
+    moves logged after it; the older history is parsed on first use (see
+    JournaledLog). Logs are read through mmap so large files are not copied.
+    """
+
+    def __init__(self, directory: str, snapshot_every: int = 500, sync: bool = False):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+
+    def _path(self, dialogue_id: str, suffix: str) -> Path:
+        # Ids come from clients: never let one name a file outside the journal
+        if not is_dialogue_id(dialogue_id):
+            raise ValueError(f"Invalid dialogue id: {dialogue_id!r}")
+        return self.directory / f"{dialogue_id}{suffix}"
+
+    def _log_path(self, dialogue_id: str) -> Path:
+        return self._path(dialogue_id, ".jsonl")
+
+    def _snapshot_path(self, dialogue_id: str) -> Path:
+        return self._path(dialogue_id, ".snapshot.json")
+
+    def _write(self, path: Path, line: str) -> int:
+        data = (line + "\n").encode("utf-8")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            _cut_torn_tail(fd)
+            os.write(fd, data)
+            if self.sync:
+                os.fsync(fd)
+            return os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+    def create(self, state: DialogueState) -> None:
+        header = {
+            "id": state.id,
+            "type": state.type,
+            "topic": state.topic,
+            "participants": state.participants
+        }
+        self._write(self._log_path(state.id), json.dumps(header))
+        # Dialogues may be created from a non-empty state (e.g. restored)
+        for i in range(state.length):
+            self._append_move(state, i)
+
+    def append(self, state: DialogueState) -> None:
+        # Log the newest move of `state`; it must extend the journaled history
+        size = self._append_move(state, state.length - 1)
+        if state.length % self.snapshot_every == 0:
+            self.snapshot(state, size)
+
+    def _append_move(self, state: DialogueState, i: int) -> int:
+        move = state.log.serialized[i]
+        delta = state.log.deltas[i]
+        record = dict(move, added=list(delta.added), removed=list(delta.removed))
+        return self._write(self._log_path(state.id), json.dumps(record))
+
+    def snapshot(self, state: DialogueState, offset: Optional[int] = None) -> None:
+        if offset is None:
+            offset = self._log_path(state.id).stat().st_size
+        data = {
+            "moves": state.length,
+            "offset": offset,
+            "commitments": {k: sorted(v) for k, v in state.commitments.items()}
+        }
+        path = self._snapshot_path(state.id)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def load(self, dialogue_id: str, lazy: bool = False) -> DialogueState:
+        """
+        Restore a dialogue. With a snapshot, or with lazy=True, only the
+        header, the snapshot and the moves after it are parsed and the
+        older history waits for its first use.
+        """
+        path = self._log_path(dialogue_id)
+        lines = _read_lines(path)
+        first = next(lines, None)
+        if first is None:
+            raise ValueError(f"Empty dialogue log: {path}")
+        header = json.loads(first[1])
+
+        snapshot = self._read_snapshot(dialogue_id, path)
+        if snapshot:
+            lines.close()
+            lines = _read_lines(path, snapshot["offset"])
+            start = snapshot["moves"]
+            commitments = {k: set(v) for k, v in snapshot["commitments"].items()}
+        else:
+            start = 0
+            commitments = {p: set() for p in header["participants"]}
+
+        # Only the tail after the snapshot is parsed here
+        tail = [json.loads(line) for _, line in lines]
+        deltas = [_record_delta(r) for r in tail]
+        for delta in deltas:
+            store = commitments.setdefault(delta.speaker, set())
+            store.update(delta.added)
+            store.difference_update(delta.removed)
+
+        if snapshot or lazy:
+            count = start + len(tail)
+            log: DialogueLog = JournaledLog(
+                commitments, count,
+                lambda: self._restore_log(path, header["type"], count, commitments)
+            )
+        else:
+            count = len(tail)
+            moves = [_record_move(r) for r in tail]
+            log = prakken.restore_log(header["type"], moves, deltas, commitments)
+
+        return DialogueState(
+            id=header["id"],
+            type=header["type"],
+            topic=header["topic"],
+            participants=header["participants"],
+            log=log,
+            length=count
+        )
+
+    def _restore_log(
+        self,
+        path: Path,
+        dialogue_type: str,
+        count: int,
+        commitments: Dict[str, Any]
+    ) -> DialogueLog:
+        # The full history of a JournaledLog: the first `count` moves
+        lines = _read_lines(path)
+        next(lines)
+        records = [json.loads(line) for _, line in islice(lines, count)]
+        lines.close()
+        if len(records) < count:
+            raise ValueError(f"Dialogue log shorter than its snapshot: {path}")
+        return prakken.restore_log(
+            dialogue_type,
+            [_record_move(r) for r in records],
+            [_record_delta(r) for r in records],
+            commitments
+        )
+
+    def _read_snapshot(self, dialogue_id: str, log_path: Path) -> Optional[Dict]:
+        path = self._snapshot_path(dialogue_id)
+        if not path.exists():
+            return None
+        try:
+            snapshot = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+        offset = snapshot.get("offset")
+        if not isinstance(offset, int) or offset <= 0:
+            return None
+        # A snapshot ahead of the log (log lost its tail) cannot be trusted,
+        # nor one whose offset does not fall on a line boundary
+        with open(log_path, "rb") as f:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                return None
+        return snapshot
+
+    def dialogue_ids(self) -> List[str]:
+        return sorted(p.stem for p in self.directory.glob("*.jsonl") if is_dialogue_id(p.stem))
+
+    def load_all(self) -> Dict[str, DialogueState]:
+        sessions = {}
+        for dialogue_id in self.dialogue_ids():
+            try:
+                sessions[dialogue_id] = self.load(dialogue_id)
+            except (ValueError, KeyError):
+                continue
+        return sessions
+
+    def exists(self, dialogue_id: str) -> bool:
+        return is_dialogue_id(dialogue_id) and self._log_path(dialogue_id).exists()
+
+class JournaledLog(DialogueLog):
+    """
+    A DialogueLog restored from a snapshot. Its commitments and length are
+    known from the snapshot and the log tail; moves, deltas, the dialectical
+    tree and open challenges are only rebuilt from the whole log when first
+    read, so restoring a dialogue just to index its commitments stays cheap.
+    """
+
+    def __init__(
+        self,
+        commitments: Dict[str, Any],
+        count: int,
+        restore: Callable[[], DialogueLog]
+    ):
+        # The dataclass fields are served by the properties below
+        self.commitments = commitments
+        self._count = count
+        self._restore = restore
+        self._full: Optional[DialogueLog] = None
+        self._lock = threading.Lock()
+
+    def _history(self) -> DialogueLog:
+        with self._lock:
+            if self._full is None:
+                self._full = self._restore()
+            return self._full
+
+    @property
+    def loaded(self) -> bool:
+        return self._full is not None
+
+    @property
+    def move_count(self) -> int:
+        return self._count if self._full is None else len(self._full.moves)
+
+    moves = property(lambda self: self._history().moves)
+    deltas = property(lambda self: self._history().deltas)
+    serialized = property(lambda self: self._history().serialized)
+    tree = property(lambda self: self._history().tree)
+    challenges = property(lambda self: self._history().challenges)
+
+def _record_move(r: Dict[str, Any]) -> SpeechAct:
+    return SpeechAct(
+        speaker=r["speaker"],
+        act=r["act"],
+        content=r["content"],
+        premises=r.get("premises"),
+        timestamp=r.get("timestamp")
+    )
+
+def _record_delta(r: Dict[str, Any]) -> CommitmentDelta:
+    return CommitmentDelta(
+        speaker=r["speaker"],
+        added=tuple(r.get("added", ())),
+        removed=tuple(r.get("removed", ()))
+    )
+
+def _read_lines(path: Path, start: int = 0) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (offset, line) for every complete line from byte `start` on. A
+    torn final line from a crash mid-write is skipped; the next append cuts
+    it off (_cut_torn_tail), so reading never modifies the file.
+    """
+    size = path.stat().st_size
+    if size <= start:
+        return
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b"\n") + 1
+            pos = start
+            while pos < end:
+                nl = mm.find(b"\n", pos, end)
+                line = mm[pos:nl]
+                if line.strip():
+                    yield pos, line.decode("utf-8")
+                pos = nl + 1
+
+def _cut_torn_tail(fd: int, chunk: int = 65536) -> None:
+    # Drop a partial last line left by a crash, so the append starts clean
+    end = os.fstat(fd).st_size
+    if end == 0 or os.pread(fd, 1, end - 1) == b"\n":
+        return
+    pos = end
+    while pos > 0:
+        start = max(0, pos - chunk)
+        nl = os.pread(fd, pos - start, start).rfind(b"\n")
+        if nl >= 0:
+            os.ftruncate(fd, start + nl + 1)
+            return
+        pos = start
+    os.ftruncate(fd, 0)
@@ -0,0 +1,85 @@
+import cProfile
+import itertools
+import os
+import pstats
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .core import spans
+
+DEFAULT_DIR = os.path.join(tempfile.gettempdir(), "warrant-profiles")
+TOP_FUNCTIONS = 15
+
+_calls = itertools.count(1)
+# Only one cProfile can be active per process (Python 3.12+)
+_profiler_lock = threading.Lock()
+
+def profile_path(directory: Optional[str], tool: str) -> str:
+    directory = directory or DEFAULT_DIR
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"{tool}-{stamp}-{os.getpid()}-{next(_calls)}.prof")
+
+def _hotspots(profiler: cProfile.Profile) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profiler)
+    rows = []
+    # stats.stats: (file, line, function) -> (primitive calls, calls, own, cumulative, callers)
+    for (path, line, function), (_, calls, own, total, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(path)}:{line}({function})",
+            "calls": calls,
+            "ownMs": round(own * 1000, 3),
+            "cumulativeMs": round(total * 1000, 3)
+        })
+    rows.sort(key=lambda r: r["ownMs"], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+def _start_profiler() -> Optional[cProfile.Profile]:
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Some other tool (a debugger, an outer profiler) holds the hook
+        _profiler_lock.release()
+        return None
+    return profiler
+
+def profiled(
+    path: Optional[str],
+    fn: Callable[..., Any],
+    *args: Any
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Call `fn(*args)` recording per-phase spans and, if `path` is given, a
+    cProfile dump there (open it with `python -m pstats` or snakeviz).
+    Runs wherever the call runs, so solver threads and processes are
+    profiled themselves. Module-level so it can be sent to a process pool.
+    While another call in the process holds the profiler, only spans are
+    recorded and the report says so instead of failing the call.
+    """
+    started = time.perf_counter()
+    with spans.scope() as recorded:
+        profiler = _start_profiler() if path else None
+        try:
+            result = fn(*args)
+        finally:
+            if profiler:
+                profiler.disable()
+                _profiler_lock.release()
+    report: Dict[str, Any] = {
+        "totalMs": round((time.perf_counter() - started) * 1000, 3),
+        "spans": {
+            name: {"ms": round(seconds * 1000, 3), "count": count}
+            for name, (seconds, count) in recorded.items()
+        }
+    }
+    if profiler:
+        profiler.dump_stats(path)
+        report["file"] = path
+        report["hotspots"] = _hotspots(profiler)
+    elif path:
+        report["cprofile"] = "skipped: another call in this process is being profiled"
+    return result, report
@@ -1,14 +1,180 @@
+import os
+import json
+import asyncio
+import weakref
+from collections import deque
 from mcp.server.fastmcp import FastMCP
-from typing import List, Dict, Optional, Any
-from .core import dung, bipolar, gradual, toulmin, walton, pollock, prakken, aspic
+from typing import List, Dict, Optional, Any, Union, TYPE_CHECKING
+from .lazy import lazy_import
+from .sessions import SessionStore, dialogue_size, graph_size, instance_size
+from .executor import SolverPool
+from .metrics import Metrics
+
+if TYPE_CHECKING:
+    from .persistence import DialogueJournal
+
+# Core modules run on first use: starting the server only pays for mcp
+# and tool registration, and each request loads just what it touches
+dung = lazy_import("warrant_mcp.core.dung")
+bipolar = lazy_import("warrant_mcp.core.bipolar")
+gradual = lazy_import("warrant_mcp.core.gradual")
+toulmin = lazy_import("warrant_mcp.core.toulmin")
+walton = lazy_import("warrant_mcp.core.walton")
+pollock = lazy_import("warrant_mcp.core.pollock")
+prakken = lazy_import("warrant_mcp.core.prakken")
+aspic = lazy_import("warrant_mcp.core.aspic")
+graph = lazy_import("warrant_mcp.core.graph")
+questions = lazy_import("warrant_mcp.core.questions")
+dialectic = lazy_import("warrant_mcp.core.dialectic")
+commitment_index = lazy_import("warrant_mcp.core.commitment_index")
+protocol = lazy_import("warrant_mcp.core.protocol")
+spans = lazy_import("warrant_mcp.core.spans")
+profiling = lazy_import("warrant_mcp.profiling")
 
 mcp = FastMCP("warrant-mcp")
 
+def _env_number(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+# Per-tool call counts, latency, input sizes and work counters; set
+# WARRANT_METRICS_FILE for a periodic Prometheus text dump
+metrics = Metrics(
+    path=os.environ.get("WARRANT_METRICS_FILE"),
+    interval=_env_number("WARRANT_METRICS_INTERVAL", 10.0)
+)
+
+def tool():
+    # mcp.tool(), instrumented
+    def register(fn):
+        return mcp.tool()(metrics.instrument(fn))
+    return register
+
+# Session limits, shared by every session store
+MAX_SESSIONS = int(_env_number("WARRANT_MAX_SESSIONS", 1000))
+MAX_SESSION_BYTES = int(_env_number("WARRANT_MAX_SESSION_MB", 256) * 1024 * 1024)
+SESSION_TTL = _env_number("WARRANT_SESSION_TTL", None)
+
+# Dialogue write-ahead log (enabled by WARRANT_DATA_DIR)
+journal: Optional["DialogueJournal"] = None
+
+# Who is committed to what, across every dialogue (created on first use)
+_commitments = None
+
+def commitments():
+    global _commitments
+    if _commitments is None:
+        _commitments = commitment_index.create_index()
+    return _commitments
+
+def _spill_dialogue(dialogue_id: str, d: Any) -> None:
+    # Moves are already logged; a snapshot makes the reload cheap
+    if journal:
+        journal.snapshot(d)
+    else:
+        commitment_index.unregister_dialogue(commitments(), d)
+
+def _load_dialogue(dialogue_id: str) -> Any:
+    # exists() rejects ids that are not dialogue_<n> before touching a path
+    if journal and journal.exists(dialogue_id):
+        return journal.load(dialogue_id)
+    return None
+
+# One lock per dialogue or graph: changes to a session are serialized,
+# different sessions proceed independently. Locks vanish once nobody holds them.
+_session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def _session_lock(session_id: str) -> asyncio.Lock:
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _session_locks[session_id] = lock
+    return lock
+
 # Dialogue Session Store
-dialogue_sessions = {}
+dialogue_sessions = SessionStore(
+    max_sessions=MAX_SESSIONS,
+    max_bytes=MAX_SESSION_BYTES,
+    ttl=SESSION_TTL,
+    size_of=dialogue_size,
+    on_evict=_spill_dialogue,
+    loader=_load_dialogue
+)
+
+# Argument Graph Store (memory only; evicted graphs are dropped)
+graph_sessions = SessionStore(
+    max_sessions=MAX_SESSIONS,
+    max_bytes=MAX_SESSION_BYTES,
+    ttl=SESSION_TTL,
+    size_of=graph_size
+)
+
+# Heavy solvers run off the event loop so cheap tools stay responsive
+_workers = _env_number("WARRANT_WORKERS", None)
+solvers = SolverPool(
+    os.environ.get("WARRANT_EXECUTOR", "thread"),
+    int(_workers) if _workers else None
+)
+
+# Opt-in profiling of solver calls: every call with WARRANT_PROFILE=1,
+# otherwise only calls passing profile=true
+PROFILE_ALL = os.environ.get("WARRANT_PROFILE", "").lower() in ("1", "true", "yes")
+PROFILE_DIR = os.environ.get("WARRANT_PROFILE_DIR")
+
+async def _solve(profile: bool, fn, *args) -> Dict[str, Any]:
+    if not (profile or PROFILE_ALL):
+        return await solvers.run(fn, *args)
+    path = profiling.profile_path(PROFILE_DIR, fn.__name__.lstrip("_"))
+    result, report = await solvers.run(profiling.profiled, path, fn, *args)
+    result["profile"] = report
+    return result
+
+# Corpus files of the batch tools. With WARRANT_FILES_DIR set, relative
+# paths resolve against it and nothing outside it is read or written.
+FILES_DIR = os.environ.get("WARRANT_FILES_DIR")
+
+def _file_path(path: str) -> str:
+    if not FILES_DIR:
+        return path
+    root = os.path.realpath(FILES_DIR)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"Path is outside WARRANT_FILES_DIR: {path}")
+    return resolved
+
+def _check_distinct(input_path: str, output_path: str) -> None:
+    # Opening the output for writing would empty an input it aliases
+    if os.path.realpath(input_path) == os.path.realpath(output_path):
+        raise ValueError(f"output_path must differ from input_path: {output_path}")
+
+def _file_error(e: OSError) -> Dict[str, Any]:
+    return {"error": f"Cannot access {e.filename}: {e.strerror}"}
+
+# Output encodings of compute_extensions and score_arguments: "names" keeps
+# the readable default, the others list the argument names once
+ENCODINGS = ("names", "indices", "bitmask")
+
+# Critical Question Tracking (one shared tracker, indexed by scheme). Its
+# scheme instances live in a bounded store like dialogues and graphs; an
+# evicted instance also leaves the indexes.
+_cq_tracker = None
+
+def cq_tracker():
+    global _cq_tracker
+    if _cq_tracker is None:
+        _cq_tracker = questions.create_tracker(cq_sessions)
+    return _cq_tracker
+
+cq_sessions = SessionStore(
+    max_sessions=MAX_SESSIONS,
+    max_bytes=MAX_SESSION_BYTES,
+    ttl=SESSION_TTL,
+    size_of=instance_size,
+    on_evict=lambda instance_id, instance: questions.forget_instance(cq_tracker(), instance)
+)
 
 # 1. Build Argument (Toulmin)
-@mcp.tool()
+@tool()
 def build_argument(
     claim: str,
     data: List[Dict[str, Any]], 
@@ -45,7 +211,7 @@ def build_argument(
     }
 
 # 2. Identify Scheme
-@mcp.tool()
+@tool()
 def identify_scheme(
     claim: str,
     context: str = "",
@@ -69,7 +235,7 @@ def identify_scheme(
     return {"matches": matches, "topScheme": top_scheme}
 
 # 3. Classify Defeater
-@mcp.tool()
+@tool()
 def classify_defeater(
     target: str,
     content: str,
@@ -92,7 +258,7 @@ def classify_defeater(
     }
 
 # 4. Create Framework
-@mcp.tool()
+@tool()
 def create_framework(
     arguments: List[str],
     attacks: List[List[str]],
@@ -120,40 +286,108 @@ def create_framework(
     }
 
 # 5. Compute Extensions
-@mcp.tool()
-def compute_extensions(
+@tool()
+async def compute_extensions(
     arguments: List[str],
     attacks: List[List[str]],
-    semantics: str = "all"
+    semantics: str = "all",
+    supports: Optional[List[List[str]]] = None,
+    admissibility: str = "d",
+    profile: bool = False,
+    encoding: str = "names"
+) -> Dict[str, Any]:
+    """
+    Compute acceptable arguments using Dung's semantics.
+
+    With supports, the Bipolar AF is flattened into set-attacks and
+    admissibility selects d-, s- or c-admissible preferred/stable semantics.
+    With profile, phase timings and a cProfile summary are added.
+    Encoding "indices" or "bitmask" returns the sorted argument names once
+    and each extension as positions in that list or a base64 bitset.
+    """
+    return await _solve(
+        profile, _compute_extensions,
+        arguments, attacks, semantics, supports, admissibility, encoding
+    )
+
+def _compute_extensions(
+    arguments: List[str],
+    attacks: List[List[str]],
+    semantics: str = "all",
+    supports: Optional[List[List[str]]] = None,
+    admissibility: str = "d",
+    encoding: str = "names"
 ) -> Dict[str, Any]:
-    """Compute acceptable arguments using Dung's semantics."""
+    if encoding not in ENCODINGS:
+        return {"error": f"Unknown encoding: {encoding}. Use {', '.join(ENCODINGS)}."}
+    started = spans.start()
     attack_tuples = [(a[0], a[1]) for a in attacks]
-    af = dung.create_framework(arguments, attack_tuples)
     result = {}
-    
-    if semantics in ["grounded", "all"]:
-        ext = dung.grounded_extension(af)
-        result["grounded"] = sorted(list(ext)) # Return as list (sorted for determinism)
+    closure = None
+
+    if supports:
+        if admissibility not in ["d", "s", "c"]:
+            return {"error": f"Unknown admissibility: {admissibility}. Use d, s or c."}
+        support_tuples = [(s[0], s[1]) for s in supports]
+        baf = bipolar.create_bipolar_framework(arguments, attack_tuples, support_tuples)
+        spans.stop("parse", started)
+        result["admissibility"] = admissibility
+        cf, closure = bipolar.compile_bipolar(baf)
+    else:
+        # Admissibility flavours only differ once supports are present
+        admissibility = "d"
+        af = dung.create_framework(arguments, attack_tuples)
+        spans.stop("parse", started)
+        cf = dung.compile_framework(af)
+
+    # Compile once and encode the solver bitmasks directly
+    if encoding != "names":
+        result["encoding"] = encoding
+        result["arguments"] = cf.names
+
+    # Grounded is only defined for plain (d-)admissibility
+    if semantics in ["grounded", "all"] and admissibility == "d":
+        mask = dung.grounded_mask(cf)
+        with spans.span("serialize"):
+            result["grounded"] = _encode_extension(cf, mask, encoding)
+
+    for name in ["preferred", "stable"]:
+        if semantics in [name, "all"]:
+            masks = dung.labelling_search(cf, name, closure, admissibility)
+            with spans.span("serialize"):
+                result[name] = [_encode_extension(cf, m, encoding) for m in masks]
 
-    if semantics in ["preferred", "all"]:
-        exts = dung.preferred_extensions(af)
-        result["preferred"] = [sorted(list(e)) for e in exts]
-        
-    if semantics in ["stable", "all"]:
-        exts = dung.stable_extensions(af)
-        result["stable"] = [sorted(list(e)) for e in exts]
-        
     return result
 
 # 6. Score Arguments
-@mcp.tool()
-def score_arguments(
+@tool()
+async def score_arguments(
+    arguments: List[str],
+    attacks: List[List[str]],
+    supports: Optional[List[List[str]]] = None,
+    method: str = "h-categorizer",
+    profile: bool = False,
+    encoding: str = "names"
+) -> Dict[str, Any]:
+    """
+    Score arguments using gradual semantics (profile adds phase timings).
+    Encoding "indices" or "bitmask" returns the sorted argument names and a
+    parallel list of scores instead of a name-to-score map.
+    """
+    return await _solve(
+        profile, _score_arguments, arguments, attacks, supports, method, encoding
+    )
+
+def _score_arguments(
     arguments: List[str],
     attacks: List[List[str]],
     supports: Optional[List[List[str]]] = None,
-    method: str = "h-categorizer"
+    method: str = "h-categorizer",
+    encoding: str = "names"
 ) -> Dict[str, Any]:
-    """Score arguments using gradual semantics."""
+    if encoding not in ENCODINGS:
+        return {"error": f"Unknown encoding: {encoding}. Use {', '.join(ENCODINGS)}."}
+    started = spans.start()
     attack_tuples = [(a[0], a[1]) for a in attacks]
     
     scores = {}
@@ -161,19 +395,34 @@ def score_arguments(
     if method == "bipolar" and supports:
         support_tuples = [(s[0], s[1]) for s in supports]
         baf = bipolar.create_bipolar_framework(arguments, attack_tuples, support_tuples)
+        spans.stop("parse", started)
         scores = gradual.compute_scores(baf)
     elif method == "counting":
         af = dung.create_framework(arguments, attack_tuples)
+        spans.stop("parse", started)
         scores = gradual.counting_semantics(af)
     else:
         af = dung.create_framework(arguments, attack_tuples)
+        spans.stop("parse", started)
         scores = gradual.h_categorizer(af)
         
+    started = spans.start()
+    if encoding != "names":
+        names = sorted(scores)
+        spans.stop("serialize", started)
+        return {
+            "method": method,
+            "encoding": encoding,
+            "arguments": names,
+            "scores": [round(scores[name], 3) for name in names]
+        }
+
     # Round scores
     result = {k: round(v, 3) for k, v in scores.items()}
     
     # Sort by score descending
     sorted_scores = dict(sorted(result.items(), key=lambda item: item[1], reverse=True))
+    spans.stop("serialize", started)
     
     return {
         "method": method,
@@ -181,31 +430,75 @@ def score_arguments(
     }
 
 # 7. Create Dialogue
-@mcp.tool()
-def create_dialogue(
+@tool()
+async def create_dialogue(
     topic: str,
     participants: List[str],
     type: str = "persuasion"
 ) -> Dict[str, Any]:
     """Start a new argumentation dialogue session."""
+    if type not in protocol.list_protocols():
+        return {
+            "error": f"Unknown dialogue type: {type}",
+            "available": protocol.list_protocols()
+        }
     d = prakken.create_dialogue(type, topic, participants)
-    dialogue_sessions[d.id] = d
+    async with _session_lock(d.id):
+        if journal:
+            await asyncio.to_thread(journal.create, d)
+        dialogue_sessions[d.id] = d
+        commitment_index.register_dialogue(commitments(), d)
     return prakken.serialize_dialogue(d)
 
 # 8. Dialogue Move
-@mcp.tool()
-def dialogue_move(
+@tool()
+async def dialogue_move(
     dialogue_id: str,
     speaker: str,
     act: str,
     content: str,
-    premises: Optional[List[str]] = None
+    premises: Optional[List[str]] = None,
+    since_move: Optional[int] = None,
+    expected_move_count: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Make a speech act move in a dialogue.
+
+    With `since_move`, only moves after that index and the net commitment
+    changes since then are returned instead of the full dialogue. With
+    `expected_move_count`, the move is rejected if other moves were made
+    since the caller last looked.
+    """
+    async with _session_lock(dialogue_id):
+        return await _dialogue_move(
+            dialogue_id, speaker, act, content, premises,
+            since_move, expected_move_count
+        )
+
+async def _dialogue_move(
+    dialogue_id: str,
+    speaker: str,
+    act: str,
+    content: str,
+    premises: Optional[List[str]],
+    since_move: Optional[int],
+    expected_move_count: Optional[int]
 ) -> Dict[str, Any]:
-    """Make a speech act move in a dialogue."""
     d = dialogue_sessions.get(dialogue_id)
     if not d:
         raise ValueError(f"Dialogue not found: {dialogue_id}. Create one first.")
-        
+
+    if expected_move_count is not None and expected_move_count != d.length:
+        return {
+            "error": "Dialogue has changed since expected_move_count",
+            "expectedMoveCount": expected_move_count,
+            "moveCount": d.length,
+            "hint": "Fetch the new moves with get_dialogue and retry"
+        }
+    # Check the cursor before the move is committed, so a bad one changes nothing
+    if since_move is not None and not 0 <= since_move <= d.length:
+        return {"error": f"since_move must be between 0 and {d.length}"}
+
     move = prakken.SpeechAct(
         speaker=speaker,
         act=act,
@@ -219,15 +512,20 @@ def dialogue_move(
             "error": "Invalid move according to Prakken's protocol",
             "move": move,
             "lastMove": last_move,
-            "hint": "Check the protocol rules: claim->{why,claim,concede}, why->{since,retract}, since->{why,concede}"
+            "legalMoves": prakken.legal_moves(d)
         }
         
-    new_d = prakken.make_move(d, move)
+    new_d = prakken.make_move(d, move, commitments())
+    # Log first: if that fails the session still points at the old snapshot
+    if journal:
+        await asyncio.to_thread(journal.append, new_d)
     dialogue_sessions[dialogue_id] = new_d
+    if since_move is not None:
+        return _dialogue_view(new_d, since_move)
     return prakken.serialize_dialogue(new_d)
 
 # 9. Diagnose Disagreement
-@mcp.tool()
+@tool()
 def diagnose_disagreement(
     agent_a: Dict[str, Any],
     agent_b: Dict[str, Any]
@@ -241,22 +539,612 @@ def diagnose_disagreement(
     }
 
 # 10. List Schemes
-@mcp.tool()
+@tool()
 def list_schemes() -> Dict[str, Any]:
     """List all available Walton argumentation schemes."""
-    schemes = walton.list_schemes()
-    details = []
-    for name in schemes:
-        s = walton.get_scheme(name)
-        if s:
-            details.append({
-                "name": name,
-                "title": s.name,
-                "criticalQuestions": len(s.criticalQuestions)
-            })
-    return {"schemes": details}
+    return {"schemes": list(walton.scheme_summaries())}
+
+# 11. Batch Build Arguments (Toulmin)
+@tool()
+async def build_arguments_batch(
+    arguments: Optional[List[Dict[str, Any]]] = None,
+    input_path: Optional[str] = None,
+    output_path: Optional[str] = None,
+    chunk_size: int = 1000
+) -> Dict[str, Any]:
+    """
+    Validate and score many Toulmin arguments in one call.
+
+    Pass `arguments` (same fields as build_argument) for inline results, or
+    `input_path` and `output_path` to stream a JSONL corpus file to a JSONL
+    results file; only the summary is returned in that case.
+    """
+    # Large corpora take a while: keep the event loop free meanwhile
+    return await asyncio.to_thread(
+        _build_arguments_batch, arguments, input_path, output_path, chunk_size
+    )
+
+def _build_arguments_batch(
+    arguments: Optional[List[Dict[str, Any]]],
+    input_path: Optional[str],
+    output_path: Optional[str],
+    chunk_size: int
+) -> Dict[str, Any]:
+    if arguments is not None:
+        results = list(toulmin.evaluate_records(arguments))
+        return {"results": results, "summary": toulmin.summarize_results(results)}
+
+    if not input_path or not output_path:
+        return {"error": "Provide either arguments, or both input_path and output_path."}
+
+    try:
+        input_path, output_path = _file_path(input_path), _file_path(output_path)
+        _check_distinct(input_path, output_path)
+        with open(input_path, encoding="utf-8") as source, \
+                open(output_path, "w", encoding="utf-8") as sink:
+            summary = toulmin.evaluate_jsonl(source, sink, max(chunk_size, 1))
+    except ValueError as e:
+        return {"error": str(e)}
+    except OSError as e:
+        return _file_error(e)
+    return {"output": output_path, "summary": summary}
+
+# 12. Create Argument Graph
+@tool()
+def create_argument_graph() -> Dict[str, Any]:
+    """Start a persistent argument graph of Toulmin arguments and Pollock defeaters."""
+    g = graph.create_graph()
+    graph_sessions[g.id] = g
+    return graph.serialize_graph(g)
+
+# 13. Add Argument to Graph
+@tool()
+async def add_graph_argument(
+    graph_id: str,
+    claim: str,
+    data: List[Dict[str, Any]],
+    warrant: Optional[str] = None,
+    backing: Optional[List[str]] = None,
+    rebuttal: Optional[List[str]] = None,
+    qualifier: str = "presumably"
+) -> Dict[str, Any]:
+    """Add a Toulmin argument to an argument graph as an unattacked node."""
+    arg = toulmin.create_argument(
+        claim=claim,
+        data=data,
+        warrant=warrant,
+        backing=backing,
+        rebuttal=rebuttal,
+        qualifier=qualifier
+    )
+    async with _session_lock(graph_id):
+        g = _get_graph(graph_id)
+        node = graph.add_argument(g, arg)
+        # Re-store so the size estimate follows the grown graph
+        graph_sessions[g.id] = g
+        return {"node": graph.serialize_node(node), "nodeCount": len(g.nodes)}
+
+# 14. Add Defeater to Graph
+@tool()
+async def add_graph_defeater(
+    graph_id: str,
+    target: str,
+    content: str,
+    type: str,
+    evidence_type: str = "uncertain"
+) -> Dict[str, Any]:
+    """
+    Attack a graph node (by node id or claim text) with a Pollock defeater.
+
+    Only the nodes downstream of the target are re-labelled and re-scored;
+    they are returned as `changed`.
+    """
+    defeater = pollock.create_defeater(
+        target=target,
+        content=content,
+        type=type,
+        evidence_type=evidence_type
+    )
+    async with _session_lock(graph_id):
+        g = _get_graph(graph_id)
+        # Re-labelling a large region is CPU work: run it off the event loop
+        changed = await asyncio.to_thread(graph.add_defeater, g, defeater)
+        graph_sessions[g.id] = g
+        return {
+            "changed": [graph.serialize_node(n) for n in changed],
+            "nodeCount": len(g.nodes)
+        }
+
+# 15. Get Argument Graph
+@tool()
+async def get_argument_graph(graph_id: str) -> Dict[str, Any]:
+    """Return every node of an argument graph with its grounded label and score."""
+    # Wait for a defeater being added in a worker thread
+    async with _session_lock(graph_id):
+        return graph.serialize_graph(_get_graph(graph_id))
+
+def _get_graph(graph_id: str) -> Any:
+    g = graph_sessions.get(graph_id)
+    if not g:
+        raise ValueError(f"Argument graph not found: {graph_id}. Create one first.")
+    return g
+
+# 16. Classify Defeaters (bulk)
+@tool()
+async def classify_defeaters(defeaters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Classify many counterarguments at once.
+
+    Each item takes the classify_defeater fields (target, content, type,
+    evidence_type). Returns strengths and penalties per defeater plus the
+    aggregated penalty for every target. A malformed item gets an error
+    entry in place; one of an unknown type is scored as rebutting and
+    carries a warning.
+    """
+    return await solvers.run(_classify_defeaters, defeaters)
+
+def _classify_defeaters(defeaters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    results: List[Optional[Dict[str, Any]]] = []
+    items = []
+    slots = []
+    for i, d in enumerate(defeaters):
+        problem = _defeater_problem(d)
+        if problem:
+            results.append({"index": i, "error": problem})
+            continue
+        items.append(pollock.create_defeater(
+            target=d["target"],
+            content=d.get("content", ""),
+            type=d["type"],
+            evidence_type=d.get("evidence_type", "uncertain")
+        ))
+        slots.append(i)
+        results.append(None)
+
+    assessment = pollock.assess_defeaters(items)
+    unknown = set(assessment["unknownTypes"])
+    for k, (slot, d) in enumerate(zip(slots, items)):
+        strength = assessment["strengths"][k]
+        penalty = assessment["penalties"][k]
+        item = {
+            "target": d.target,
+            "type": d.type,
+            "evidenceType": d.evidenceType,
+            "strength": strength,
+            "penalty": penalty
+        }
+        if k in unknown:
+            item["warning"] = (
+                f"Unknown type: {d.type}. Scored as rebutting; use rebutting or undercutting."
+            )
+        results[slot] = item
+    return {"defeaters": results, "targets": assessment["targets"]}
+
+def _defeater_problem(d: Any) -> Optional[str]:
+    if not isinstance(d, dict):
+        return "Defeater must be an object"
+    missing = [k for k in ("target", "type") if not isinstance(d.get(k), str)]
+    if missing:
+        return f"Missing or non-string field: {', '.join(missing)}"
+    return None
+
+# 17. Classify Claims (bulk scheme identification)
+@tool()
+async def classify_claims(
+    claims: Optional[List[Dict[str, Any]]] = None,
+    input_path: Optional[str] = None,
+    output_path: Optional[str] = None,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Identify Walton schemes for many claims at once.
+
+    Pass `claims` as [{claim, context, id}] or `input_path` to a JSONL file of
+    the same records. Results are returned inline, or streamed to
+    `output_path` as JSONL. Large inputs are spread over worker processes.
+    Aggregated scheme frequencies are always returned. A record that is not
+    a JSON object gets an error entry; the other records are still ranked.
+    """
+    # Reading, ranking and waiting on the claim pool all happen off the loop
+    return await asyncio.to_thread(_classify_claims, claims, input_path, output_path, workers)
+
+def _classify_claims(
+    claims: Optional[List[Dict[str, Any]]],
+    input_path: Optional[str],
+    output_path: Optional[str],
+    workers: Optional[int]
+) -> Dict[str, Any]:
+    if workers is not None and workers < 1:
+        return {"error": "workers must be at least 1"}
+    if claims is not None:
+        records = ((None, c) for c in claims)
+        large = len(claims) >= walton.PARALLEL_THRESHOLD
+    elif input_path:
+        try:
+            input_path = _file_path(input_path)
+            large = os.path.getsize(input_path) >= 1 << 20
+        except ValueError as e:
+            return {"error": str(e)}
+        except OSError as e:
+            return _file_error(e)
+        records = _read_jsonl(input_path)
+    else:
+        return {"error": "Provide either claims or input_path."}
+    # Never more processes than WARRANT_WORKERS, or the CPUs when unset
+    limit = solvers.workers or os.cpu_count() or 1
+    workers = min(workers, limit) if workers is not None else (limit if large else 1)
+
+    # Per-record entries ride alongside the pairs, in input order; at most
+    # the pool's read-ahead is queued. Invalid records never reach the pool.
+    queued = deque()
+
+    def pairs():
+        for index, (lineno, record) in enumerate(records):
+            item = {"index": index}
+            if lineno is not None:
+                item["line"] = lineno
+            if isinstance(record, dict):
+                if record.get("id") is not None:
+                    item["id"] = record["id"]
+                queued.append(item)
+                yield str(record.get("claim", "")), str(record.get("context", ""))
+            else:
+                item["error"] = record.message if isinstance(record, _BadLine) \
+                    else "claim must be a JSON object"
+                queued.append(item)
+
+    results = []
+    errors = []
+    try:
+        output_path = _file_path(output_path) if output_path else None
+        if output_path and input_path:
+            _check_distinct(input_path, output_path)
+        sink = open(output_path, "w", encoding="utf-8") if output_path else None
+    except ValueError as e:
+        return {"error": str(e)}
+    except OSError as e:
+        return _file_error(e)
+
+    def emit(item):
+        if sink:
+            sink.write(json.dumps(item) + "\n")
+        else:
+            results.append(item)
+
+    def drain_errors():
+        while queued and "error" in queued[0]:
+            item = queued.popleft()
+            errors.append(item)
+            emit(item)
+
+    def collect():
+        for matches in walton.classify_claims(pairs(), workers):
+            drain_errors()
+            item = queued.popleft()
+            item["matches"] = matches
+            emit(item)
+            yield matches
+        drain_errors()
+
+    try:
+        frequencies = walton.scheme_frequencies(collect())
+    except OSError as e:
+        return _file_error(e)
+    finally:
+        if sink:
+            sink.close()
+    frequencies["processed"] += len(errors)
+    frequencies["errors"] = len(errors)
+
+    if sink:
+        return {"output": output_path, "frequencies": frequencies}
+    return {"results": results, "frequencies": frequencies}
+
+class _BadLine:
+    # Stands in for a JSONL record that could not be decoded
+    def __init__(self, message: str):
+        self.message = message
+
+def _read_jsonl(path: str):
+    # (line number, record) pairs; a malformed line is reported, not raised
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield lineno, json.loads(line)
+            except ValueError as e:
+                yield lineno, _BadLine(f"Invalid JSON: {e}")
+
+# 18. Open Scheme Instance
+@tool()
+def open_scheme_instance(scheme: str, claim: str) -> Dict[str, Any]:
+    """Track the critical questions of a Walton scheme applied to a claim."""
+    instance = questions.open_instance(cq_tracker(), scheme, claim)
+    return {"instance": instance}
+
+# 19. Answer Critical Question
+@tool()
+def answer_critical_question(
+    instance_id: str,
+    cq_id: str,
+    answer: str,
+    satisfied: bool
+) -> Dict[str, Any]:
+    """Record an answer to a tracked critical question (satisfied or failed)."""
+    cq = questions.answer_question(cq_tracker(), instance_id, cq_id, answer, satisfied)
+    return {"instance": instance_id, "question": cq, "status": questions.status_of(cq)}
+
+# 20. Query Critical Questions
+@tool()
+def query_critical_questions(
+    status: str = "open",
+    scheme: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """List open or failed critical questions across all tracked instances."""
+    if status not in ["open", "failed"]:
+        return {"error": f"Unknown status: {status}. Use open or failed."}
+    return {
+        "questions": questions.query_questions(cq_tracker(), status, scheme, limit),
+        "counts": questions.count_questions(cq_tracker())
+    }
+
+# 21. Session Statistics
+@tool()
+def session_stats() -> Dict[str, Any]:
+    """Report size, limits and eviction counts of the session stores."""
+    return {
+        "dialogues": dialogue_sessions.stats(),
+        "graphs": graph_sessions.stats(),
+        "questions": cq_sessions.stats(),
+        "solvers": solvers.stats(),
+        "persistence": journal is not None
+    }
+
+# 22. Get Dialogue
+@tool()
+def get_dialogue(
+    dialogue_id: str,
+    since_move: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Get a dialogue's state. Pass `since_move` (the moveCount you last saw)
+    to receive only newer moves and changed commitments.
+    """
+    d = dialogue_sessions.get(dialogue_id)
+    if not d:
+        return {"error": f"Dialogue not found: {dialogue_id}"}
+    if since_move is None:
+        return prakken.serialize_dialogue(d)
+    return _dialogue_view(d, since_move)
+
+# 23. Dialogue Status
+@tool()
+def dialogue_status(
+    dialogue_id: str,
+    include_tree: bool = False
+) -> Dict[str, Any]:
+    """
+    Who is currently winning a dialogue and which attacks still await a
+    reply, from the dialectical tree maintained move by move.
+    """
+    d = dialogue_sessions.get(dialogue_id)
+    if not d:
+        return {"error": f"Dialogue not found: {dialogue_id}"}
+    tree = prakken.tree_of(d)
+    result = dialectic.status(tree)
+    if include_tree:
+        result["nodes"] = [dialectic.serialize_node(tree, n) for n in tree.nodes]
+    return result
+
+# 24. Find Commitments
+@tool()
+def find_commitments(
+    proposition: Optional[str] = None,
+    participant: Optional[str] = None,
+    topic: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """
+    Look up commitments across all dialogues: who is committed to a
+    proposition (optionally only `participant`), which dialogues a
+    participant takes part in, and which dialogues share a topic.
+    """
+    if proposition is None and participant is None and topic is None:
+        return {"error": "Pass at least one of proposition, participant or topic"}
+    return commitment_index.query_commitments(
+        commitments(), proposition, participant, topic, limit
+    )
+
+# 25. Legal Moves
+@tool()
+def legal_moves(dialogue_id: str) -> Dict[str, Any]:
+    """
+    List the speech acts the dialogue's protocol allows next, and the open
+    challenges that may still be answered with since or retract.
+    """
+    d = dialogue_sessions.get(dialogue_id)
+    if not d:
+        return {"error": f"Dialogue not found: {dialogue_id}"}
+    return prakken.legal_moves(d)
+
+# 26. Build ASPIC+ Arguments
+@tool()
+async def build_aspic_arguments(
+    premises: List[str],
+    rules: List[Union[str, Dict[str, Any]]],
+    axioms: Optional[List[str]] = None,
+    preferences: Optional[List[str]] = None,
+    semantics: str = "grounded",
+    limit: int = 500,
+    profile: bool = False
+) -> Dict[str, Any]:
+    """
+    Construct all ASPIC+ arguments from a knowledge base and evaluate them.
+
+    Args:
+        premises: Ordinary (fallible) premises
+        rules: "name: a, b => c" (defeasible) or "a, b -> c" (strict), or
+            objects with antecedents, conclusion, type and name
+        axioms: Premises that cannot be attacked
+        preferences: "r1 > r2" over rule names or premises (last-link)
+        semantics: grounded, preferred or all
+        limit: Maximum arguments and attacks listed in the response
+        profile: Add phase timings and a cProfile summary
+    """
+    return await _solve(
+        profile, _build_aspic_arguments, premises, rules, axioms, preferences, semantics, limit
+    )
+
+def _build_aspic_arguments(
+    premises: List[str],
+    rules: List[Union[str, Dict[str, Any]]],
+    axioms: Optional[List[str]] = None,
+    preferences: Optional[List[str]] = None,
+    semantics: str = "grounded",
+    limit: int = 500
+) -> Dict[str, Any]:
+    if semantics not in ["grounded", "preferred", "all"]:
+        return {"error": f"Unknown semantics: {semantics}. Use grounded, preferred or all."}
+    try:
+        with spans.span("parse"):
+            theory = aspic.create_theory(premises, rules, axioms, preferences)
+        system = aspic.build_system(theory)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    args = system.arguments
+    cf = system.framework
+    name = aspic.argument_name
+    started = spans.start()
+    result = {
+        "arguments": [aspic.serialize_argument(a, args) for a in args[:limit]],
+        "argumentCount": len(args),
+        "attacks": [
+            {
+                "from": name(args[a.attacker]),
+                "to": name(args[a.target]),
+                "type": a.type,
+                "defeat": a.defeat
+            }
+            for a in system.attacks[:limit]
+        ],
+        "attackCount": len(system.attacks),
+        "defeatCount": sum(len(x) for x in cf.attackers)
+    }
+    spans.stop("serialize", started)
+
+    def conclusions(mask: int) -> List[str]:
+        return sorted({args[i].conclusion for i in dung.iter_bits(mask)})
+
+    if semantics in ["grounded", "all"]:
+        grounded = dung.grounded_mask(cf)
+        result["grounded"] = sorted(dung.mask_to_names(cf, grounded))
+        result["justified"] = conclusions(grounded)
+    if semantics in ["preferred", "all"]:
+        exts = dung.labelling_search(cf, "preferred")
+        result["preferred"] = [sorted(dung.mask_to_names(cf, m)) for m in exts]
+        skeptical = -1
+        for m in exts:
+            skeptical &= m
+        # Conclusions of arguments in every preferred extension
+        result["skepticallyAccepted"] = conclusions(skeptical if exts else 0)
+    return result
+
+# 27. Diagnose Panel
+@tool()
+async def diagnose_panel(
+    agents: List[Dict[str, Any]],
+    profile: bool = False
+) -> Dict[str, Any]:
+    """
+    Diagnose disagreements across a whole panel of agents in one call:
+    an N x N matrix of disagreement types, counts, clusters of agents
+    linked by each type, and camps of agents sharing a claim.
+    """
+    return await _solve(profile, _diagnose_panel, agents)
+
+def _diagnose_panel(agents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if len(agents) < 2:
+        return {"error": "A panel needs at least two agents"}
+    result = aspic.diagnose_panel(agents)
+    result["suggestedResolutions"] = {
+        t: aspic.suggest_resolution(aspic.make_diagnosis(t, "", ""))
+        for t, count in result["counts"].items()
+        if count
+    }
+    return result
+
+# 28. Server Statistics
+@tool()
+def server_stats(prometheus: bool = False) -> Dict[str, Any]:
+    """
+    Per-tool call counts, error counts, latency histograms, input sizes
+    (items per list parameter, e.g. arguments and attacks) and work
+    counters such as solver search nodes and session cache hits.
+    Set `prometheus` to also get the Prometheus text exposition.
+    """
+    result = metrics.snapshot()
+    result["sessions"] = {
+        "dialogues": dialogue_sessions.stats(),
+        "graphs": graph_sessions.stats(),
+        "questions": cq_sessions.stats()
+    }
+    result["solvers"] = solvers.stats()
+    if prometheus:
+        result["prometheus"] = metrics.prometheus()
+    return result
+
+def _encode_extension(cf: Any, mask: int, encoding: str) -> Union[List[str], List[int], str]:
+    if encoding == "indices":
+        return dung.mask_to_indices(mask)
+    if encoding == "bitmask":
+        return dung.mask_to_base64(mask, len(cf.names))
+    # compile_framework sorts the names, so ascending bits are sorted already
+    return [cf.names[i] for i in dung.mask_to_indices(mask)]
+
+def _dialogue_view(d: Any, since_move: int) -> Dict[str, Any]:
+    try:
+        return prakken.serialize_since(d, since_move)
+    except ValueError as e:
+        return {"error": str(e)}
+
+def enable_persistence(directory: str, snapshot_every: int = 500) -> int:
+    """
+    Enable the dialogue journal. The commitment index is rebuilt from each
+    stored dialogue's header, snapshot and the moves logged after it; the
+    dialogues themselves are loaded on first access, so the session limits
+    also hold right after a restart.
+    """
+    global journal
+    from .persistence import DialogueJournal
+    journal = DialogueJournal(directory, snapshot_every=snapshot_every)
+    stored = journal.dialogue_ids()
+    # Ids on disk stay reserved even if their logs turn out unreadable
+    for dialogue_id in stored:
+        suffix = dialogue_id.rsplit("_", 1)[-1]
+        if suffix.isdigit():
+            prakken.advance_counter(int(suffix))
+        try:
+            # lazy: the move history and dialectical tree are never built here
+            state = journal.load(dialogue_id, lazy=True)
+            commitment_index.register_dialogue(commitments(), state)
+        except (ValueError, KeyError):
+            continue
+    return len(stored)
 
 def main():
+    # Custom protocols first: stored dialogues may be of a custom type
+    protocols_dir = os.environ.get("WARRANT_PROTOCOLS_DIR")
+    if protocols_dir:
+        protocol.load_protocols(protocols_dir)
+    schemes_dir = os.environ.get("WARRANT_SCHEMES_DIR")
+    if schemes_dir:
+        walton.load_schemes(schemes_dir)
+    data_dir = os.environ.get("WARRANT_DATA_DIR")
+    if data_dir:
+        enable_persistence(data_dir)
     mcp.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TYPE_CHECKING
+from .core import counters
+
+if TYPE_CHECKING:
+    from .core.types import DialogueState, ArgumentGraph, SchemeInstance
+
+class SessionStore:
+    """
+    Bounded in-memory session map with LRU eviction.
+
+    Limits (each optional): number of sessions, an approximate byte budget
+    computed by `size_of`, and an idle TTL in seconds. Evicted sessions are
+    handed to `on_evict` (e.g. to spill them to disk) and can come back
+    through `loader` on a later miss.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        size_of: Optional[Callable[[Any], int]] = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None,
+        loader: Optional[Callable[[str], Any]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_of = size_of or (lambda value: 0)
+        self.on_evict = on_evict
+        self.loader = loader
+        self.clock = clock
+        # key -> (value, size, last access); ordered oldest access first
+        self._items: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._counts = {
+            "hits": 0,
+            "misses": 0,
+            "reloads": 0,
+            "evictedCount": 0,
+            "evictedBytes": 0,
+            "expired": 0
+        }
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = self.clock()
+        self._expire(now)
+        entry = self._items.get(key)
+        if entry is not None:
+            self._counts["hits"] += 1
+            counters.add("cacheHits")
+            self._items[key] = (entry[0], entry[1], now)
+            self._items.move_to_end(key)
+            return entry[0]
+
+        self._counts["misses"] += 1
+        counters.add("cacheMisses")
+        if self.loader:
+            value = self.loader(key)
+            if value is not None:
+                self._counts["reloads"] += 1
+                counters.add("cacheReloads")
+                self[key] = value
+                return value
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        now = self.clock()
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        size = self.size_of(value)
+        self._items[key] = (value, size, now)
+        self._bytes += size
+        self._expire(now)
+        self._enforce(keep=key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._items))
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        entry = self._items.pop(key, None)
+        if entry is None:
+            return default
+        self._bytes -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._bytes = 0
+
+    def _expire(self, now: float) -> None:
+        if self.ttl is None:
+            return
+        # Least recently used first, so stop at the first live session
+        while self._items:
+            key, (_, _, last) = next(iter(self._items.items()))
+            if now - last < self.ttl:
+                break
+            self._counts["expired"] += 1
+            self._evict(key)
+
+    def _enforce(self, keep: str) -> None:
+        while len(self._items) > 1 and self._over_limit():
+            key = next(iter(self._items))
+            if key == keep:
+                # The session just written is never evicted on its own write
+                self._items.move_to_end(key)
+                key = next(iter(self._items))
+            self._evict(key)
+
+    def _over_limit(self) -> bool:
+        if self.max_sessions is not None and len(self._items) > self.max_sessions:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
+
+    def _evict(self, key: str) -> None:
+        value, size, _ = self._items.pop(key)
+        self._bytes -= size
+        self._counts["evictedCount"] += 1
+        self._counts["evictedBytes"] += size
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._items),
+            "approxBytes": self._bytes,
+            "maxSessions": self.max_sessions,
+            "maxBytes": self.max_bytes,
+            "ttlSeconds": self.ttl,
+            **self._counts
+        }
+
+# Rough per-item costs of the in-memory structures, in bytes. They keep
+# the estimate O(1) per write instead of walking the whole session.
+MOVE_BYTES = 600
+COMMITMENT_BYTES = 120
+NODE_BYTES = 1200
+QUESTION_BYTES = 400
+SESSION_BYTES = 1000
+
+def dialogue_size(state: "DialogueState") -> int:
+    commitments = sum(len(v) for v in state.log.commitments.values())
+    return (
+        SESSION_BYTES
+        + state.log.move_count * MOVE_BYTES
+        + commitments * COMMITMENT_BYTES
+    )
+
+def graph_size(g: "ArgumentGraph") -> int:
+    return SESSION_BYTES + len(g.nodes) * NODE_BYTES
+
+def instance_size(instance: "SchemeInstance") -> int:
+    return SESSION_BYTES + len(instance.questions) * QUESTION_BYTES
@@ -0,0 +1,61 @@
+"""
+Standalone Dung solver with the ICCMA command-line interface:
+
+    warrant-mcp solve -p SE-PR -f instance.apx
+    warrant-mcp solve -p DC-ST -f instance.af -a 3
+    warrant-mcp solve -f instance.tgf --convert i23 > instance.af
+    warrant-mcp solve --problems
+    warrant-mcp solve --formats
+"""
+import argparse
+import sys
+from typing import List, Optional
+from .core import iccma
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="warrant-mcp solve",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("-p", dest="task", help="Task, e.g. DC-PR, DS-ST, SE-GR or EE-PR")
+    parser.add_argument("-f", dest="file", help="Instance file")
+    parser.add_argument("-fo", dest="format", choices=iccma.FORMATS,
+                        help="Instance format (default: from the file suffix)")
+    parser.add_argument("-a", dest="argument", help="Query argument for DC and DS")
+    parser.add_argument("--convert", choices=iccma.FORMATS,
+                        help="Write the instance to stdout in this format instead of solving")
+    parser.add_argument("--problems", action="store_true", help="List the supported tasks")
+    parser.add_argument("--formats", action="store_true", help="List the supported formats")
+    options = parser.parse_args(argv)
+
+    if options.problems:
+        tasks = [
+            f"{p}-{s}"
+            for p in iccma.PROBLEMS
+            for s in iccma.SEMANTICS
+            if (p, s) != ("EE", "CO")
+        ]
+        print("[" + ",".join(tasks) + "]")
+        return 0
+    if options.formats:
+        print("[" + ",".join(iccma.FORMATS) + "]")
+        return 0
+    if not options.file or not (options.task or options.convert):
+        parser.print_usage(sys.stderr)
+        return 2
+
+    try:
+        cf = iccma.read_framework(options.file, options.format)
+        if options.convert:
+            iccma.write_framework(cf, sys.stdout, options.convert)
+            return 0
+        answer = iccma.solve(cf, options.task, options.argument)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(iccma.format_answer(cf, options.task, answer))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import random
+from itertools import product
+import pytest
+from warrant_mcp.core import aspic
+from warrant_mcp.core.dung import grounded_mask, mask_to_names
+
+def _grounded_conclusions(system):
+    names = mask_to_names(system.framework, grounded_mask(system.framework))
+    return {a.conclusion for a in system.arguments if aspic.argument_name(a) in names}
+
+def test_tweety_rebut_and_undercut():
+    theory = aspic.create_theory(
+        ["bird", "penguin"],
+        ["r1: bird => flies", "r2: penguin -> not_flies", "r3: penguin => not_r1"]
+    )
+    system = aspic.build_system(theory)
+    kinds = sorted(a.type for a in system.attacks)
+    assert kinds == ["rebutting", "undercutting"]
+    assert _grounded_conclusions(system) == {"bird", "penguin", "not_flies", "not_r1"}
+
+def test_preferences_decide_rebuttals():
+    rules = ["r1: a => c", "r2: b => not_c"]
+    system = aspic.build_system(aspic.create_theory(["a", "b"], rules, preferences=["r1 > r2"]))
+    assert "c" in _grounded_conclusions(system)
+    assert "not_c" not in _grounded_conclusions(system)
+
+    # Without a preference both defeat each other and neither is grounded
+    system = aspic.build_system(aspic.create_theory(["a", "b"], rules))
+    assert not {"c", "not_c"} & _grounded_conclusions(system)
+
+def test_undermining_respects_premise_order_and_axioms():
+    system = aspic.build_system(aspic.create_theory(
+        ["a", "not_a"], [], preferences=["a > not_a"]
+    ))
+    assert _grounded_conclusions(system) == {"a"}
+
+    system = aspic.build_system(aspic.create_theory(
+        ["b"], ["b -> not_a"], axioms=["a"]
+    ))
+    # Axioms cannot be undermined
+    assert system.attacks == []
+
+def _naive_signatures(theory):
+    # Fixpoint over all rules and all combinations, no memoization
+    sigs = {p: {("premise", p)} for p in theory.axioms | theory.premises}
+    changed = True
+    while changed:
+        changed = False
+        for rule in theory.rules.values():
+            options = [list(sigs.get(a, ())) for a in rule.antecedents]
+            for combo in product(*options):
+                concl = set()
+                def collect(sig):
+                    if sig[0] == "premise":
+                        concl.add(sig[1])
+                    else:
+                        concl.add(sig[2])
+                        for s in sig[3]:
+                            collect(s)
+                for s in combo:
+                    collect(s)
+                if rule.conclusion in concl:
+                    continue
+                sig = ("rule", rule.name, rule.conclusion, combo)
+                if sig not in sigs.setdefault(rule.conclusion, set()):
+                    sigs[rule.conclusion].add(sig)
+                    changed = True
+    return sum(len(v) for v in sigs.values())
+
+def _random_theory(rng):
+    lits = [f"p{i}" for i in range(6)]
+    lits += ["not_" + l for l in lits]
+    rules = []
+    for i in range(rng.randint(3, 9)):
+        ants = rng.sample(lits, rng.randint(0, 2))
+        head = rng.choice(lits + ["not_r1", "not_r2"])
+        rules.append(f"r{i + 1}: {', '.join(ants)} {rng.choice(['=>', '->'])} {head}")
+    premises = rng.sample(lits, 3)
+    prefs = [f"r{rng.randint(1, 9)} > r{rng.randint(1, 9)}" for _ in range(2)]
+    return aspic.create_theory(premises, rules, preferences=prefs)
+
+def test_semi_naive_matches_naive_fixpoint():
+    rng = random.Random(5)
+    for _ in range(200):
+        theory = _random_theory(rng)
+        assert len(aspic.build_arguments(theory)) == _naive_signatures(theory)
+
+def test_defeats_reach_every_super_argument():
+    rng = random.Random(11)
+    for _ in range(200):
+        system = aspic.build_system(_random_theory(rng))
+        args = system.arguments
+
+        def subs(i):
+            result = {i}
+            for s in args[i].subs:
+                result |= subs(s)
+            return result
+
+        expected = {
+            (a.attacker, b.id)
+            for a in system.attacks if a.defeat
+            for b in args if a.on in subs(b.id)
+        }
+        actual = {
+            (a, b)
+            for b, attackers in enumerate(system.framework.attackers)
+            for a in attackers
+        }
+        assert actual == expected
+
+def test_argument_cap_and_parse_errors():
+    rules = [f"a{i} => b{i}" for i in range(10)] + [
+        f"{', '.join(f'b{i}' for i in range(10))} => c"
+    ]
+    premises = [f"a{i}" for i in range(10)]
+    with pytest.raises(ValueError):
+        aspic.build_arguments(aspic.create_theory(premises, rules), max_arguments=15)
+    with pytest.raises(ValueError):
+        aspic.create_theory([], ["no arrow here"])
+
+def _reference_type(a, b):
+    # The original pairwise list-scanning diagnosis
+    if a["claim"] == b["claim"]:
+        overlap = [p for p in a["priorities"] if p in b["priorities"]]
+        min_len = min(len(a["priorities"]), len(b["priorities"]))
+        if min_len > 0 and len(overlap) < min_len:
+            return "preferential"
+    for g in a["goals"]:
+        for g2 in b["goals"]:
+            if g.replace("not_", "") == g2.replace("not_", "") and (
+                g.startswith("not_") != g2.startswith("not_")
+            ):
+                return "goal_conflict"
+    shared = [p for p in a["premises"] if p in b["premises"]]
+    if len(shared) / max(len(a["premises"]), len(b["premises"]), 1) < 0.5:
+        return "factual"
+    return "inferential"
+
+def _random_position(rng, i):
+    pool = ["x", "y", "z", "not_x", "not_y", "w"]
+    return {
+        "name": f"agent{i}",
+        "claim": rng.choice(["A", "not_A", "B"]),
+        "premises": rng.choices(["e1", "e2", "e3", "e4"], k=rng.randint(0, 4)),
+        "priorities": rng.choices(["cost", "speed", "safety"], k=rng.randint(0, 3)),
+        "goals": rng.choices(pool, k=rng.randint(0, 2))
+    }
+
+def test_panel_matches_pairwise_diagnosis():
+    rng = random.Random(2)
+    panel = [_random_position(rng, i) for i in range(40)]
+    result = aspic.diagnose_panel(panel)
+    for i in range(len(panel)):
+        for j in range(i + 1, len(panel)):
+            expected = _reference_type(panel[i], panel[j])
+            assert aspic.diagnose_disagreement(panel[i], panel[j]).type == expected
+            assert result["matrix"][i][j] == result["matrix"][j][i] == expected
+    assert sum(result["counts"].values()) == 40 * 39 // 2
+
+def test_panel_clusters_and_camps():
+    panel = [
+        {"name": "a", "claim": "ship", "premises": ["p"], "goals": ["growth"]},
+        {"name": "b", "claim": "ship", "premises": ["p"], "goals": ["not_growth"]},
+        {"name": "c", "claim": "wait", "premises": ["q"]},
+    ]
+    result = aspic.diagnose_panel(panel)
+    assert result["matrix"][0][1] == "goal_conflict"
+    assert result["clusters"]["goal_conflict"] == [["a", "b"]]
+    assert result["clusters"]["factual"] == [["a", "b", "c"]]
+    assert result["camps"] == {"ship": ["a", "b"], "wait": ["c"]}
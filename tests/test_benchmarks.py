@@ -0,0 +1,22 @@
+from benchmarks import generators
+from benchmarks.run import compare, run_suite
+
+def test_generators_are_seeded():
+    assert generators.erdos_renyi(50, 0.1, 7) == generators.erdos_renyi(50, 0.1, 7)
+    assert generators.barabasi_albert(50, 2, 7) == generators.barabasi_albert(50, 2, 7)
+    assert generators.iccma(50, 7) != generators.iccma(50, 8)
+    args, attacks = generators.grid(25, 1)
+    assert len(args) == 25 and attacks
+
+def test_generated_dialogue_is_legal():
+    # The runner replays it through is_valid_move and raises on a bad move
+    results = run_suite(only=["make_move"], sizes=[300], repeat=1)
+    assert results["results"][0]["result"] == 300
+
+def test_compare_flags_slower_and_changed():
+    base = run_suite(only=["grounded_extension/er"], sizes=[50, 100], repeat=1)
+    current = {"results": [dict(r) for r in base["results"]]}
+    current["results"][0]["median"] = base["results"][0]["median"] * 3
+    current["results"][1]["result"] = -1
+    rows = compare(current, base)
+    assert [r["status"] for r in rows] == ["slower", "changed"]
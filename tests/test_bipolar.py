@@ -0,0 +1,45 @@
+from warrant_mcp.core.bipolar import (
+    create_bipolar_framework,
+    flatten_to_af,
+    grounded_extension,
+    preferred_extensions,
+    stable_extensions
+)
+
+def test_flatten_supported_attack():
+    # a supports b, b attacks c -> a attacks c
+    baf = create_bipolar_framework(["a", "b", "c"], [("b", "c")], [("a", "b")])
+    flat = flatten_to_af(baf)
+    assert "a->c" in flat.attacks
+
+def test_flatten_secondary_attack_through_chain():
+    # a attacks b, b supports c, c supports d -> a attacks c and d
+    baf = create_bipolar_framework(
+        ["a", "b", "c", "d"],
+        [("a", "b")],
+        [("b", "c"), ("c", "d")]
+    )
+    flat = flatten_to_af(baf)
+    assert {"a->b", "a->c", "a->d"} <= flat.attacks
+
+def test_d_preferred():
+    # b attacks a, c supports b: c indirectly attacks a
+    baf = create_bipolar_framework(["a", "b", "c"], [("b", "a")], [("c", "b")])
+    assert grounded_extension(baf) == {"b", "c"}
+    assert preferred_extensions(baf) == [{"b", "c"}]
+    assert stable_extensions(baf) == [{"b", "c"}]
+
+def test_s_admissible_excludes_unsafe_sets():
+    # a supports c, b attacks c: {a, b} is d-admissible but not safe
+    baf = create_bipolar_framework(["a", "b", "c"], [("b", "c")], [("a", "c")])
+    assert preferred_extensions(baf, "d") == [{"a", "b"}]
+    assert sorted(map(sorted, preferred_extensions(baf, "s"))) == [["a"], ["b"]]
+
+def test_c_admissible_requires_support_closure():
+    # a supports b, b is attacked by unattacked c: a cannot be kept closed
+    baf = create_bipolar_framework(["a", "b", "c"], [("c", "b")], [("a", "b")])
+    assert preferred_extensions(baf, "d") == [{"a", "c"}]
+    assert preferred_extensions(baf, "c") == [{"c"}]
+    baf2 = create_bipolar_framework(["a", "b"], [], [("a", "b")])
+    assert preferred_extensions(baf2, "c") == [{"a", "b"}]
+    assert stable_extensions(baf2, "c") == [{"a", "b"}]
@@ -0,0 +1,60 @@
+from warrant_mcp.core.commitment_index import (
+    create_index,
+    register_dialogue,
+    unregister_dialogue,
+    query_commitments
+)
+from warrant_mcp.core.prakken import create_dialogue, make_move, SpeechAct
+
+def _start(index, topic="topic"):
+    d = create_dialogue("persuasion", topic, ["P", "O"])
+    register_dialogue(index, d)
+    return d
+
+def test_moves_update_index():
+    index = create_index()
+    d = _start(index)
+    d = make_move(d, SpeechAct("P", "claim", "safe"), index)
+    d = make_move(d, SpeechAct("O", "why", "safe"), index)
+    d = make_move(d, SpeechAct("P", "since", "safe", ["airbag"]), index)
+
+    result = query_commitments(index, proposition="airbag")
+    assert result["committed"] == [{"dialogue": d.id, "participant": "P"}]
+
+    d = make_move(d, SpeechAct("O", "why", "airbag"), index)
+    d = make_move(d, SpeechAct("P", "retract", "airbag"), index)
+    assert query_commitments(index, proposition="airbag")["count"] == 0
+    assert query_commitments(index, participant="O")["dialogues"] == [d.id]
+    assert query_commitments(index, topic="topic")["topicDialogues"] == [d.id]
+
+def test_fork_resyncs_dialogue_entries():
+    index = create_index()
+    d = _start(index)
+    d = make_move(d, SpeechAct("P", "claim", "safe"), index)
+    base = d
+    d = make_move(d, SpeechAct("O", "claim", "unsafe"), index)
+    assert query_commitments(index, proposition="unsafe")["count"] == 1
+
+    make_move(base, SpeechAct("O", "concede", "safe"), index)
+    assert query_commitments(index, proposition="unsafe")["count"] == 0
+    result = query_commitments(index, proposition="safe", participant="O")
+    assert result["committed"] == [{"dialogue": d.id, "participant": "O"}]
+
+def test_unregister_and_scale():
+    index = create_index()
+    dialogues = []
+    for i in range(20000):
+        d = _start(index, topic=f"t{i % 50}")
+        d = make_move(d, SpeechAct("P", "claim", f"p{i % 1000}"), index)
+        dialogues.append(d)
+
+    # Lookups go straight to the proposition's holders; query timing lives
+    # in benchmarks/run.py (query_commitments/index)
+    assert len(index.propositions) == 1000
+    result = query_commitments(index, proposition="p7", limit=5)
+    assert result["count"] == 20 and len(result["committed"]) == 5
+    assert {c["dialogue"] for c in result["committed"]} <= {d.id for d in dialogues[7::1000]}
+
+    unregister_dialogue(index, dialogues[7])
+    assert query_commitments(index, proposition="p7")["count"] == 19
+    assert query_commitments(index, topic="t7")["topicCount"] == 399
@@ -0,0 +1,87 @@
+import random
+from warrant_mcp.core import dialectic
+from warrant_mcp.core.dung import grounded_extension
+from warrant_mcp.core.prakken import create_dialogue, make_move, SpeechAct
+from warrant_mcp.core.types import DialecticalTree
+
+def _play(moves):
+    d = create_dialogue("persuasion", "topic", ["P", "O"])
+    for m in moves:
+        d = make_move(d, m)
+    return d.log.tree
+
+def test_challenge_and_answer():
+    tree = _play([SpeechAct("P", "claim", "safe")])
+    assert dialectic.status(tree)["winner"] == "P"
+
+    tree = _play([
+        SpeechAct("P", "claim", "safe"),
+        SpeechAct("O", "why", "safe"),
+    ])
+    status = dialectic.status(tree)
+    assert status["label"] == "OUT"
+    assert status["winner"] == "O"
+    assert [i["kind"] for i in status["openIssues"]] == ["challenge"]
+
+    tree = _play([
+        SpeechAct("P", "claim", "safe"),
+        SpeechAct("O", "why", "safe"),
+        SpeechAct("P", "since", "safe", ["airbag"]),
+    ])
+    status = dialectic.status(tree)
+    assert status["winner"] == "P"
+    assert [i["kind"] for i in status["openIssues"]] == ["argument"]
+
+def test_premise_challenge_and_retract():
+    moves = [
+        SpeechAct("P", "claim", "safe"),
+        SpeechAct("O", "why", "safe"),
+        SpeechAct("P", "since", "safe", ["airbag"]),
+        SpeechAct("O", "why", "airbag"),
+    ]
+    assert dialectic.status(_play(moves))["winner"] == "O"
+    # Retracting the premise withdraws the argument built on it
+    tree = _play(moves + [SpeechAct("P", "retract", "airbag")])
+    status = dialectic.status(tree)
+    assert status["winner"] == "O"
+    assert status["openIssues"][0]["content"] == "safe"
+
+def test_concede_closes_own_attacks():
+    tree = _play([
+        SpeechAct("P", "claim", "safe"),
+        SpeechAct("O", "claim", "unsafe"),
+        SpeechAct("O", "concede", "safe"),
+    ])
+    status = dialectic.status(tree)
+    assert status["winner"] == "P"
+    assert status["openIssues"] == []
+
+def test_labels_match_grounded_semantics():
+    random.seed(3)
+    props = [f"p{i}" for i in range(5)]
+    acts = ["claim", "why", "why", "since", "since", "concede", "retract"]
+    for _ in range(100):
+        tree = DialecticalTree()
+        previous = None
+        for i in range(150):
+            act = random.choice(acts)
+            move = SpeechAct(
+                random.choice("PO"),
+                act,
+                random.choice(props),
+                random.sample(props, 2) if act == "since" else None
+            )
+            dialectic.apply_move(tree, move, i, previous)
+            previous = move
+        grounded = grounded_extension(dialectic.to_framework(tree))
+        labelled = {f"n{n.id}" for n in tree.nodes if dialectic.is_in(tree, n)}
+        assert labelled == grounded
+
+def test_fork_rebuilds_tree():
+    d = create_dialogue("persuasion", "topic", ["P", "O"])
+    d = make_move(d, SpeechAct("P", "claim", "safe"))
+    base = d
+    d = make_move(d, SpeechAct("O", "why", "safe"))
+    branch = make_move(base, SpeechAct("O", "concede", "safe"))
+    assert dialectic.status(d.log.tree)["winner"] == "O"
+    assert dialectic.status(branch.log.tree)["winner"] == "P"
@@ -6,7 +6,14 @@ from warrant_mcp.core.dung import (
     preferred_extensions,
     stable_extensions,
     get_attackers,
-    get_attacked
+    get_attacked,
+    find_all_admissible,
+    compile_framework,
+    grounded_mask,
+    mask_to_names,
+    mask_to_indices,
+    mask_to_base64,
+    base64_to_mask
 )
 
 def test_create_framework():
@@ -99,3 +106,47 @@ def test_stable_extensions():
     # Self-attack a->a
     af2 = create_framework(["a"], [("a", "a")])
     assert len(stable_extensions(af2)) == 0
+
+def test_preferred_odd_cycle():
+    # Odd cycle a->b->c->a plus d attacked by c: nothing is defensible
+    af = create_framework(
+        ["a", "b", "c", "d"],
+        [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d")]
+    )
+    assert preferred_extensions(af) == [set()]
+    assert stable_extensions(af) == []
+
+def test_extensions_match_brute_force():
+    import random
+    random.seed(7)
+    for _ in range(50):
+        args = [f"a{i}" for i in range(8)]
+        rels = [(a, b) for a in args for b in args if random.random() < 0.2]
+        af = create_framework(args, rels)
+        admissible = find_all_admissible(af)
+        expected = [s for s in admissible if not any(s < o for o in admissible)]
+        got = preferred_extensions(af)
+        assert sorted(map(sorted, got)) == sorted(map(sorted, expected))
+        for ext in stable_extensions(af):
+            assert ext in expected
+
+def test_compiled_framework():
+    af = create_framework(["a", "b", "c"], [("a", "b"), ("b", "c")])
+    cf = compile_framework(af)
+    assert cf.names == ["a", "b", "c"]
+    assert cf.attackers[cf.index["c"]] == [cf.index["b"]]
+    assert mask_to_names(cf, grounded_mask(cf)) == {"a", "c"}
+
+def test_large_chain_grounded():
+    args = [f"a{i:05d}" for i in range(5000)]
+    af = create_framework(args, list(zip(args, args[1:])))
+    assert grounded_extension(af) == set(args[::2])
+
+def test_mask_encodings():
+    mask = (1 << 0) | (1 << 3) | (1 << 9)
+    assert mask_to_indices(mask) == [0, 3, 9]
+    assert mask_to_indices(0) == []
+    # 10 arguments need two bytes, padded even when the high bits are empty
+    assert mask_to_base64(1, 10) == "AQA="
+    assert base64_to_mask(mask_to_base64(mask, 10)) == mask
+    assert mask_to_base64(0, 0) == ""
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+import pytest
+from warrant_mcp import server
+from warrant_mcp.executor import SolverPool
+from warrant_mcp.core import cancel, dung
+
+def _pairs(n):
+    # n mutual attacks: 2^n preferred extensions
+    args = [f"{s}{i}" for i in range(n) for s in "ab"]
+    attacks = [[f"a{i}", f"b{i}"] for i in range(n)] + [[f"b{i}", f"a{i}"] for i in range(n)]
+    return args, attacks
+
+def test_set_token_stops_search():
+    args, attacks = _pairs(8)
+    cf = dung.compile_framework(dung.create_framework(args, [tuple(a) for a in attacks]))
+    token = threading.Event()
+    token.set()
+    with pytest.raises(cancel.Cancelled):
+        cancel.run_with(token, dung.labelling_search, cf, "preferred")
+    # Without a token the search is unaffected
+    assert len(dung.labelling_search(cf, "preferred")) == 2 ** 8
+
+def test_cheap_tools_answer_while_solver_runs():
+    async def run():
+        solve = asyncio.create_task(
+            server.compute_extensions(*_pairs(20), semantics="preferred")
+        )
+        # Let the solver start, then await cheap and batch tools on the same loop
+        await asyncio.sleep(0.05)
+        cheap = await server.create_dialogue("topic", ["P", "O"])
+        claims = await server.classify_claims(claims=[{"claim": "Experts agree"}] * 50)
+        batch = await server.build_arguments_batch(
+            arguments=[{"claim": "x", "data": [{"content": "d", "type": "objective"}]}] * 50
+        )
+        pending = not solve.done()
+        solve.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await solve
+        return cheap, claims, batch, pending
+
+    cheap, claims, batch, pending = asyncio.run(run())
+    assert cheap["id"]
+    assert claims["frequencies"]["processed"] == 50
+    assert batch["summary"]["processed"] == 50
+    # An inline solver would have finished before the loop got back to us
+    assert pending
+
+def test_running_follows_the_worker_not_the_caller():
+    pool = SolverPool("thread", workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def job():
+        # Ignores the cancel token, like code between two checkpoints
+        started.set()
+        release.wait(5)
+
+    async def run():
+        task = asyncio.create_task(pool.run(job))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return pool.stats()["running"]
+
+    assert asyncio.run(run()) == 1
+    release.set()
+    deadline = time.monotonic() + 5
+    while pool.stats()["running"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.stats()["running"] == 0
+    pool.shutdown()
+
+def test_cancel_stops_running_solver():
+    pool = SolverPool("thread", workers=1)
+    args, attacks = _pairs(22)
+
+    async def run():
+        task = asyncio.create_task(
+            pool.run(server._compute_extensions, args, attacks, "preferred")
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    deadline = time.monotonic() + 5
+    while pool.stats()["running"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The worker gave up instead of enumerating 2^22 extensions
+    done = pool._executor.submit(lambda: True)
+    assert done.result(timeout=5)
+    assert pool.stats()["cancelled"] == 1
+    pool.shutdown()
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        SolverPool("gpu")
@@ -0,0 +1,60 @@
+import pytest
+from warrant_mcp.core.graph import (
+    create_graph,
+    add_argument,
+    add_defeater,
+    to_framework
+)
+from warrant_mcp.core.toulmin import create_argument
+from warrant_mcp.core.pollock import create_defeater, defeater_penalty
+from warrant_mcp.core.dung import grounded_extension
+
+def test_add_argument_is_unattacked():
+    g = create_graph()
+    node = add_argument(g, create_argument("X", ["E"], warrant="W"))
+    assert node.label == "IN"
+    assert node.score == pytest.approx(node.weight)
+
+def test_defeater_by_claim_text():
+    g = create_graph()
+    arg = add_argument(g, create_argument("X", ["E"], warrant="W"))
+    d = create_defeater("X", "not X", "rebutting", "certain")
+    changed = add_defeater(g, d)
+
+    assert [n.id for n in changed] == [changed[0].id, arg.id]
+    assert arg.label == "OUT"
+    expected = arg.weight / (1.0 + defeater_penalty(d) * 1.0)
+    assert arg.score == pytest.approx(expected)
+
+def test_reinstatement_and_region():
+    g = create_graph()
+    a = add_argument(g, create_argument("A", ["E"]))
+    b = add_argument(g, create_argument("B", ["E"]))
+    d1 = add_defeater(g, create_defeater(a.id, "attack A", "undercutting", "objective"))[0]
+    changed = add_defeater(g, create_defeater(d1.id, "attack d1", "rebutting", "certain"))
+
+    # Only the new defeater, d1 and A are touched; B is outside the region
+    assert {n.id for n in changed} == {changed[0].id, d1.id, a.id}
+    assert d1.label == "OUT"
+    assert a.label == "IN"
+    assert b.label == "IN"
+
+def test_matches_dung_grounded():
+    g = create_graph()
+    a = add_argument(g, create_argument("A", ["E"]))
+    d1 = add_defeater(g, create_defeater(a.id, "x", "rebutting"))[0]
+    d2 = add_defeater(g, create_defeater(d1.id, "y", "rebutting"))[0]
+    # d1 gets a second attacker d3, itself defeated by an unattacked node:
+    # the incremental labels must still equal Dung's grounded extension
+    d3 = add_defeater(g, create_defeater(d1.id, "z", "rebutting"))[0]
+    add_defeater(g, create_defeater(d3.id, "w", "rebutting"))
+
+    af = to_framework(g)
+    grounded = {n.id for n in g.nodes.values() if n.label == "IN"}
+    assert grounded == grounded_extension(af)
+    assert a.id in grounded and d2.id in grounded
+
+def test_unknown_target():
+    g = create_graph()
+    with pytest.raises(ValueError):
+        add_defeater(g, create_defeater("missing", "c", "rebutting"))
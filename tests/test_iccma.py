@@ -0,0 +1,77 @@
+import io
+import random
+import pytest
+from warrant_mcp import solve as cli
+from warrant_mcp.core import dung, iccma
+
+APX = b"""arg(a).
+arg(b).
+arg(c). arg(d).
+% comment
+att(a,b).
+att(b,c).
+att(c,d). att(d,c).
+"""
+
+TGF = b"a\nb\nc\nd\n#\na b\nb c\nc d\nd c\n"
+
+I23 = b"p af 4\n# a=1 b=2 c=3 d=4\n1 2\n2 3\n3 4\n4 3\n"
+
+def _edges(cf):
+    return sorted((cf.names[a], cf.names[b]) for a, ts in enumerate(cf.targets) for b in ts)
+
+def test_formats_agree():
+    apx = iccma.read_framework(io.BytesIO(APX), "apx")
+    tgf = iccma.read_framework(io.BytesIO(TGF), "tgf")
+    i23 = iccma.read_framework(io.BytesIO(I23), "i23")
+    assert _edges(apx) == _edges(tgf) == [("a", "b"), ("b", "c"), ("c", "d"), ("d", "c")]
+    assert _edges(i23) == [("1", "2"), ("2", "3"), ("3", "4"), ("4", "3")]
+
+@pytest.mark.parametrize("fmt", iccma.FORMATS)
+def test_write_read_roundtrip(fmt):
+    cf = iccma.read_framework(io.BytesIO(APX), "apx")
+    out = io.StringIO()
+    iccma.write_framework(cf, out, fmt)
+    back = iccma.read_framework(io.BytesIO(out.getvalue().encode()), fmt)
+    assert len(back.names) == 4 and len(_edges(back)) == 4
+
+def test_malformed_input():
+    with pytest.raises(ValueError):
+        iccma.read_framework(io.BytesIO(b"arg(a).\natt(a,z).\n"), "apx")
+    with pytest.raises(ValueError):
+        iccma.read_framework(io.BytesIO(b"1 2\n"), "i23")
+    with pytest.raises(ValueError):
+        iccma.solve(iccma.read_framework(io.BytesIO(APX), "apx"), "EE-CO")
+
+def test_tasks_match_named_solvers():
+    rng = random.Random(3)
+    for _ in range(20):
+        names = [f"x{i}" for i in range(8)]
+        attacks = [(a, b) for a in names for b in names if rng.random() < 0.2]
+        af = dung.create_framework(names, attacks)
+        cf = dung.compile_framework(af)
+        preferred = dung.preferred_extensions(af)
+        stable = dung.stable_extensions(af)
+        grounded = dung.grounded_extension(af)
+        for x in names:
+            assert iccma.solve(cf, "DC-PR", x) == any(x in e for e in preferred)
+            assert iccma.solve(cf, "DS-PR", x) == all(x in e for e in preferred)
+            assert iccma.solve(cf, "DC-ST", x) == any(x in e for e in stable)
+            assert iccma.solve(cf, "DS-GR", x) == (x in grounded)
+            assert iccma.solve(cf, "DC-CO", x) == iccma.solve(cf, "DC-PR", x)
+        assert len(iccma.solve(cf, "EE-PR")) == len(preferred)
+        se = iccma.solve(cf, "SE-ST")
+        assert (se is None) == (not stable)
+
+def test_cli(tmp_path, capsys):
+    path = tmp_path / "inst.apx"
+    path.write_bytes(APX)
+    assert cli.main(["-p", "SE-GR", "-f", str(path)]) == 0
+    assert capsys.readouterr().out.split() == ["w", "a"]
+    assert cli.main(["-p", "EE-PR", "-f", str(path)]) == 0
+    assert sorted(capsys.readouterr().out.strip()[2:-2].split("],[")) == ["a,c", "a,d"]
+    assert cli.main(["-p", "DC-ST", "-f", str(path), "-a", "b"]) == 0
+    assert capsys.readouterr().out.strip() == "NO"
+    assert cli.main(["-f", str(path), "--convert", "i23"]) == 0
+    assert capsys.readouterr().out.startswith("p af 4\n")
+    assert cli.main(["-p", "DC-PR", "-f", str(path), "-a", "zz"]) == 1
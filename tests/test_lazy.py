@@ -0,0 +1,31 @@
+import subprocess
+import sys
+import pytest
+from warrant_mcp.lazy import lazy_import
+
+IMPORT_SERVER = """
+import sys
+import warrant_mcp.server
+loaded = sorted(
+    m for m in list(sys.modules)
+    if m.startswith("warrant_mcp.core.") and type(sys.modules[m]).__name__ != "_LazyModule"
+)
+print(" ".join(loaded))
+"""
+
+def test_server_import_leaves_core_modules_lazy():
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", IMPORT_SERVER],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    # Only the context-local helpers used by the tool wrappers run at import
+    assert set(out) <= {"warrant_mcp.core.cancel", "warrant_mcp.core.counters"}
+
+def test_lazy_module_loads_on_first_use():
+    walton = lazy_import("warrant_mcp.core.walton")
+    assert "expert_opinion" in walton.SCHEMES
+    assert lazy_import("warrant_mcp.core.walton") is walton
+
+def test_lazy_import_unknown_module():
+    with pytest.raises(ModuleNotFoundError, match="nonexistent"):
+        lazy_import("warrant_mcp.core.nonexistent")
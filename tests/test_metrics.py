@@ -0,0 +1,79 @@
+import asyncio
+import inspect
+import logging
+import threading
+from warrant_mcp import server
+from warrant_mcp.core import counters
+from warrant_mcp.metrics import Metrics
+
+def test_instrument_records_calls_sizes_and_errors():
+    metrics = Metrics()
+
+    @metrics.instrument
+    def tool(arguments: list, attacks: list, fail: bool = False) -> dict:
+        counters.add("searchNodes", 7)
+        return {"error": "bad"} if fail else {"ok": True}
+
+    assert list(inspect.signature(tool).parameters) == ["arguments", "attacks", "fail"]
+    tool(["a", "b"], [["a", "b"]])
+    tool(arguments=["a", "b", "c", "d"], attacks=[], fail=True)
+
+    stats = metrics.snapshot()["tools"]["tool"]
+    assert stats["calls"] == 2 and stats["errors"] == 1
+    assert stats["inputSizes"]["arguments"] == {"total": 6, "max": 4, "mean": 3.0}
+    assert stats["counters"] == {"searchNodes": 14}
+    assert stats["latency"]["le_inf"] == 2
+
+def test_async_tools_and_exceptions():
+    metrics = Metrics()
+
+    @metrics.instrument
+    async def tool(x: int) -> dict:
+        if x < 0:
+            raise ValueError(x)
+        return {}
+
+    async def run():
+        await tool(1)
+        try:
+            await tool(-1)
+        except ValueError:
+            pass
+
+    asyncio.run(run())
+    stats = metrics.snapshot()["tools"]["tool"]
+    assert stats["calls"] == 2 and stats["errors"] == 1
+
+def test_prometheus_dump(tmp_path):
+    path = tmp_path / "warrant.prom"
+    metrics = Metrics(path=str(path), interval=0)
+    metrics.instrument(lambda: {})()
+    metrics.flush()
+    text = path.read_text()
+    assert 'warrant_tool_calls_total{tool="<lambda>"} 1' in text
+    assert 'warrant_tool_latency_seconds_bucket{tool="<lambda>",le="+Inf"} 1' in text
+
+def test_search_nodes_reach_server_stats():
+    # Counted in a pool worker and merged back into the tool's record
+    asyncio.run(server.compute_extensions(
+        ["a", "b", "c"], [["a", "b"], ["b", "a"], ["b", "c"]], semantics="preferred"
+    ))
+    stats = server.server_stats()["tools"]["compute_extensions"]
+    assert stats["counters"]["searchNodes"] > 0
+    assert stats["inputSizes"]["attacks"]["max"] >= 3
+
+def test_dump_failure_does_not_fail_tools(tmp_path, caplog):
+    metrics = Metrics(path=str(tmp_path / "missing" / "warrant.prom"), interval=0)
+    with caplog.at_level(logging.WARNING, logger="warrant_mcp.metrics"):
+        assert metrics.instrument(lambda: {"ok": True})() == {"ok": True}
+        metrics.flush()
+    assert "Could not write metrics" in caplog.text
+    assert metrics.snapshot()["calls"] == 1
+
+def test_dump_runs_off_the_calling_thread(tmp_path, monkeypatch):
+    metrics = Metrics(path=str(tmp_path / "warrant.prom"), interval=0)
+    writers = []
+    monkeypatch.setattr(metrics, "prometheus", lambda: writers.append(threading.current_thread()) or "")
+    metrics.instrument(lambda: {})()
+    metrics.flush()
+    assert writers and writers[0] is not threading.current_thread()
@@ -0,0 +1,119 @@
+import pytest
+from warrant_mcp.persistence import DialogueJournal
+from warrant_mcp.core.prakken import (
+    create_dialogue,
+    make_move,
+    serialize_dialogue,
+    SpeechAct
+)
+
+def _play(journal, moves):
+    d = create_dialogue("persuasion", "topic", ["P", "O"])
+    journal.create(d)
+    for m in moves:
+        d = make_move(d, m)
+        journal.append(d)
+    return d
+
+MOVES = [
+    SpeechAct("P", "claim", "safe"),
+    SpeechAct("O", "why", "safe"),
+    SpeechAct("P", "since", "safe", ["airbag"]),
+    SpeechAct("O", "concede", "safe"),
+    SpeechAct("P", "claim", "cheap"),
+    SpeechAct("O", "why", "cheap"),
+    SpeechAct("P", "retract", "cheap"),
+]
+
+def test_roundtrip_without_snapshot(tmp_path):
+    journal = DialogueJournal(str(tmp_path), snapshot_every=1000)
+    d = _play(journal, MOVES)
+
+    restored = journal.load(d.id)
+    assert serialize_dialogue(restored) == serialize_dialogue(d)
+    assert restored.commitments == d.commitments
+
+def test_snapshot_plus_tail_replay(tmp_path):
+    journal = DialogueJournal(str(tmp_path), snapshot_every=3)
+    d = _play(journal, MOVES)
+    assert (tmp_path / f"{d.id}.snapshot.json").exists()
+
+    restored = journal.load(d.id)
+    assert restored.length == len(MOVES)
+    assert restored.commitments == {"P": {"safe", "airbag"}, "O": {"safe"}}
+
+    # Restored dialogues keep accepting moves
+    restored = make_move(restored, SpeechAct("P", "claim", "green"))
+    journal.append(restored)
+    assert "green" in journal.load(d.id).commitments["P"]
+
+def test_load_parses_only_the_tail(tmp_path):
+    journal = DialogueJournal(str(tmp_path), snapshot_every=4)
+    d = _play(journal, MOVES)
+    path = tmp_path / f"{d.id}.jsonl"
+    lines = path.read_bytes().split(b"\n")
+    # Garble a move before the snapshot without moving any offset
+    lines[1] = b"x" * len(lines[1])
+    path.write_bytes(b"\n".join(lines))
+
+    restored = journal.load(d.id)
+    assert not restored.log.loaded
+    assert restored.length == len(MOVES)
+    assert restored.commitments == d.commitments
+    # The older history is only parsed when something reads it
+    with pytest.raises(ValueError):
+        restored.moves
+
+def test_history_loads_on_first_use(tmp_path):
+    journal = DialogueJournal(str(tmp_path), snapshot_every=4)
+    d = _play(journal, MOVES)
+    restored = journal.load(d.id)
+    assert serialize_dialogue(restored) == serialize_dialogue(d)
+    assert restored.log.loaded
+    assert serialize_dialogue(restored)["commitments"] == {"P": ["airbag", "safe"], "O": ["safe"]}
+
+def test_snapshot_past_the_log_is_ignored(tmp_path):
+    journal = DialogueJournal(str(tmp_path), snapshot_every=4)
+    d = _play(journal, MOVES)
+    path = tmp_path / f"{d.id}.jsonl"
+    lines = path.read_bytes().split(b"\n")
+    # The log lost its tail, including the move the snapshot ends on
+    path.write_bytes(b"\n".join(lines[:3]) + b"\n")
+
+    restored = journal.load(d.id)
+    assert restored.length == 2
+    assert restored.commitments == {"P": {"safe"}, "O": set()}
+
+def test_torn_last_line_is_dropped(tmp_path):
+    journal = DialogueJournal(str(tmp_path))
+    d = _play(journal, MOVES[:3])
+    path = tmp_path / f"{d.id}.jsonl"
+    with open(path, "ab") as f:
+        f.write(b'{"speaker": "O", "act": "conc')
+
+    torn = path.read_bytes()
+    restored = journal.load(d.id)
+    assert restored.length == 3
+    # Loading is read-only; the next append cuts the torn line off
+    assert path.read_bytes() == torn
+    restored = make_move(restored, SpeechAct("O", "concede", "safe"))
+    journal.append(restored)
+    assert journal.load(d.id).length == 4
+    assert b"conc\n" not in path.read_bytes()
+
+def test_load_all(tmp_path):
+    journal = DialogueJournal(str(tmp_path))
+    a = _play(journal, MOVES[:2])
+    b = _play(journal, MOVES[:4])
+    sessions = journal.load_all()
+    assert set(sessions) == {a.id, b.id}
+    assert sessions[b.id].length == 4
+
+def test_rejects_ids_outside_the_journal(tmp_path):
+    journal = DialogueJournal(str(tmp_path / "data"))
+    victim = tmp_path / "x.jsonl"
+    victim.write_bytes(b'{"keep": "me"')
+    assert not journal.exists("../x")
+    with pytest.raises(ValueError, match="Invalid dialogue id"):
+        journal.load("../x")
+    assert victim.read_bytes() == b'{"keep": "me"'
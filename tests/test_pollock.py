@@ -1,6 +1,9 @@
+import pytest
 from warrant_mcp.core.pollock import (
     create_defeater,
-    assess_strength
+    assess_strength,
+    defeater_penalty,
+    assess_defeaters
 )
 
 def test_classification():
@@ -34,3 +37,38 @@ def test_undercutting_stronger():
     
     assert assess_strength(rebutting) == "medium"
     assert assess_strength(undercutting) == "strong"
+
+def test_penalty_table():
+    assert defeater_penalty(create_defeater("t", "c", "rebutting", "certain")) == 0.15
+    assert defeater_penalty(create_defeater("t", "c", "undercutting", "certain")) == pytest.approx(0.195)
+    # Unknown evidence falls back to "uncertain"
+    d = create_defeater("t", "c", "rebutting", "rumour")
+    assert assess_strength(d) == "medium"
+
+def test_assess_defeaters_bulk():
+    defeaters = [
+        create_defeater("A", "c1", "rebutting", "certain"),
+        create_defeater("A", "c2", "undercutting", "subjective"),
+        create_defeater("B", "c3", "rebutting", "hypothetical")
+    ]
+    result = assess_defeaters(defeaters)
+    assert result["strengths"] == [assess_strength(d) for d in defeaters]
+    assert result["penalties"] == [defeater_penalty(d) for d in defeaters]
+
+    a = result["targets"]["A"]
+    assert a["count"] == 2
+    assert a["rebutting"] == 1 and a["undercutting"] == 1
+    assert a["totalPenalty"] == pytest.approx(0.15 + 0.03 * 1.3)
+    assert a["strongest"] == "strong"
+    assert result["targets"]["B"]["strongest"] == "weak"
+
+def test_unknown_types_are_flagged():
+    defeaters = [
+        create_defeater("A", "c1", "rebuting", "certain"),
+        create_defeater("A", "c2", "rebutting", "certain")
+    ]
+    result = assess_defeaters(defeaters)
+    assert result["unknownTypes"] == [0]
+    assert result["penalties"] == [0.15, 0.15]
+    a = result["targets"]["A"]
+    assert a["rebutting"] == 1 and a["unknown"] == 1
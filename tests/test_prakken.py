@@ -3,6 +3,7 @@ from warrant_mcp.core.prakken import (
     make_move,
     is_valid_move,
     get_commitments,
+    serialize_dialogue,
     SpeechAct
 )
 
@@ -63,3 +64,74 @@ def test_full_dialogue_replay():
     assert "airbag" in get_commitments(d, "Olga")
     
     assert len(d.moves) == 4
+
+def test_snapshots_are_unchanged_by_later_moves():
+    d0 = create_dialogue("persuasion", "topic", ["P", "O"])
+    d1 = make_move(d0, SpeechAct("P", "claim", "safe"))
+    d2 = make_move(d1, SpeechAct("O", "why", "safe"))
+    d3 = make_move(d2, SpeechAct("P", "retract", "safe"))
+
+    assert get_commitments(d3, "P") == set()
+    assert get_commitments(d2, "P") == {"safe"}
+    assert get_commitments(d0, "P") == set()
+    assert [m.act for m in d1.moves] == ["claim"]
+    assert len(d3.moves) == 3
+
+def test_move_from_older_snapshot_forks_history():
+    d0 = create_dialogue("persuasion", "topic", ["P", "O"])
+    d1 = make_move(d0, SpeechAct("P", "claim", "safe"))
+    main = make_move(d1, SpeechAct("O", "concede", "safe"))
+    branch = make_move(d1, SpeechAct("O", "claim", "unsafe"))
+
+    assert [m.act for m in main.moves] == ["claim", "concede"]
+    assert [m.act for m in branch.moves] == ["claim", "claim"]
+    assert get_commitments(main, "O") == {"safe"}
+    assert get_commitments(branch, "O") == {"unsafe"}
+    # The original line can still be extended after the fork
+    main2 = make_move(main, SpeechAct("P", "claim", "cheap"))
+    assert get_commitments(main2, "P") == {"safe", "cheap"}
+
+def test_long_dialogue_is_linear():
+    d = create_dialogue("persuasion", "topic", ["P", "O"])
+    d = make_move(d, SpeechAct("O", "claim", "p0"))
+    log, early = d.log, d
+    for i in range(1, 20000):
+        d = make_move(d, SpeechAct("P" if i % 2 else "O", "claim", f"p{i}"))
+        # Each move appends to one shared log instead of copying the history
+        assert d.log is log
+    assert len(log.moves) == len(log.deltas) == len(log.serialized) == 20000
+    assert early.length == 1 and early.moves == log.moves[:1]
+    assert len(get_commitments(d, "P")) == 10000
+    assert serialize_dialogue(d)["moveCount"] == 20000
+    # Move timing is tracked by benchmarks/run.py (make_move/dialogue)
+
+def test_serialize_since_returns_only_new_moves_and_net_changes():
+    from warrant_mcp.core.prakken import serialize_since
+    d = create_dialogue("persuasion", "topic", ["P", "O"])
+    d = make_move(d, SpeechAct("P", "claim", "safe"))
+    cursor = d.length
+    d = make_move(d, SpeechAct("O", "why", "safe"))
+    d = make_move(d, SpeechAct("P", "since", "safe", ["airbag"]))
+    d = make_move(d, SpeechAct("O", "concede", "safe"))
+    d = make_move(d, SpeechAct("P", "claim", "cheap"))
+    d = make_move(d, SpeechAct("O", "why", "cheap"))
+    d = make_move(d, SpeechAct("P", "retract", "cheap"))
+
+    view = serialize_since(d, cursor)
+    assert [m["act"] for m in view["moves"]] == [
+        "why", "since", "concede", "claim", "why", "retract"
+    ]
+    # "cheap" was added and retracted after the cursor: no net change
+    assert view["commitmentChanges"] == {
+        "P": {"added": ["airbag"], "removed": []},
+        "O": {"added": ["safe"], "removed": []}
+    }
+
+    d = make_move(d, SpeechAct("P", "claim", "fast"))
+    d = make_move(d, SpeechAct("O", "why", "fast"))
+    d = make_move(d, SpeechAct("P", "retract", "safe"))
+    view = serialize_since(d, cursor + 6)
+    assert view["commitmentChanges"] == {
+        "P": {"added": ["fast"], "removed": ["safe"]}
+    }
+    assert serialize_since(d, d.length)["moves"] == []
@@ -0,0 +1,55 @@
+import asyncio
+import pstats
+from warrant_mcp import profiling, server
+from warrant_mcp.core import dung, spans
+
+def _af():
+    return dung.create_framework(["a", "b", "c"], [("a", "b"), ("b", "a"), ("b", "c")])
+
+def test_spans_only_inside_scope():
+    with spans.span("outside"):
+        pass
+    with spans.scope() as recorded:
+        dung.preferred_extensions(_af())
+    assert set(recorded) >= {"compile", "preprocess", "search"}
+    assert "outside" not in recorded
+
+def test_profiled_writes_cprofile_dump(tmp_path):
+    path = str(tmp_path / "call.prof")
+    result, report = profiling.profiled(path, dung.preferred_extensions, _af())
+    assert len(result) == 2
+    assert report["file"] == path
+    assert pstats.Stats(path).total_calls > 0
+    assert any("labelling_search" in h["function"] for h in report["hotspots"])
+
+def test_profile_flag_adds_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_DIR", str(tmp_path))
+    result = asyncio.run(server.compute_extensions(
+        ["a", "b"], [["a", "b"]], semantics="preferred", profile=True
+    ))
+    assert result["preferred"] == [["a"]]
+    assert {"parse", "search", "serialize"} <= set(result["profile"]["spans"])
+    assert list(tmp_path.glob("compute_extensions-*.prof"))
+
+    plain = asyncio.run(server.compute_extensions(["a"], [], semantics="grounded"))
+    assert "profile" not in plain
+
+def test_concurrent_profiled_calls_all_succeed(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_DIR", str(tmp_path))
+    args = [f"{s}{i}" for i in range(10) for s in "ab"]
+    attacks = [[f"a{i}", f"b{i}"] for i in range(10)] + [[f"b{i}", f"a{i}"] for i in range(10)]
+
+    async def run():
+        return await asyncio.gather(*(
+            server.compute_extensions(args, attacks, "preferred", profile=True)
+            for _ in range(4)
+        ))
+
+    results = asyncio.run(run())
+    assert all(len(r["preferred"]) == 2 ** 10 for r in results)
+    # Overlapping calls fall back to spans; none fails on the busy profiler
+    assert all("search" in r["profile"]["spans"] for r in results)
+    profiled = [r for r in results if "file" in r["profile"]]
+    assert profiled and all(
+        "file" in r["profile"] or "cprofile" in r["profile"] for r in results
+    )
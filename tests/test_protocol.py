@@ -0,0 +1,77 @@
+import json
+import typing
+import pytest
+from warrant_mcp.core import protocol
+from warrant_mcp.core.types import DialogueType
+from warrant_mcp.core.prakken import (
+    create_dialogue,
+    make_move,
+    is_valid_move,
+    legal_moves,
+    SpeechAct
+)
+
+def test_builtin_protocol_for_every_dialogue_type():
+    assert set(typing.get_args(DialogueType)) <= set(protocol.list_protocols())
+
+def test_compiled_tables():
+    p = protocol.get_protocol("persuasion")
+    assert p.legal[p.index["why"]] == ("since", "retract")
+    # Closing acts hand the floor back to the openers
+    assert p.legal[p.index["concede"]] == ("claim", "question")
+
+def test_earlier_open_challenge_can_be_answered():
+    d = create_dialogue("persuasion", "topic", ["P", "O"])
+    d = make_move(d, SpeechAct("P", "claim", "safe"))
+    d = make_move(d, SpeechAct("O", "why", "safe"))
+    d = make_move(d, SpeechAct("P", "since", "safe", ["airbag"]))
+    d = make_move(d, SpeechAct("O", "why", "airbag"))
+    assert set(d.log.challenges) == {"airbag"}
+
+    d = make_move(d, SpeechAct("P", "claim", "tested"))
+    # "since" is not a reply to a claim, but answers the open challenge
+    assert is_valid_move(d, SpeechAct("P", "since", "airbag", ["tested"]))
+    assert not is_valid_move(d, SpeechAct("P", "since", "cheap", ["tested"]))
+
+    moves = legal_moves(d)
+    assert moves["acts"] == ["why", "claim", "concede"]
+    assert [c["content"] for c in moves["openChallenges"]] == ["airbag"]
+
+    d = make_move(d, SpeechAct("P", "since", "airbag", ["tested"]))
+    assert legal_moves(d)["openChallenges"] == []
+
+def test_snapshot_replays_challenges():
+    d = create_dialogue("persuasion", "topic", ["P", "O"])
+    d = make_move(d, SpeechAct("P", "claim", "safe"))
+    d = make_move(d, SpeechAct("O", "why", "safe"))
+    older = d
+    d = make_move(d, SpeechAct("P", "retract", "safe"))
+    assert legal_moves(d)["openChallenges"] == []
+    assert [c["content"] for c in legal_moves(older)["openChallenges"]] == ["safe"]
+
+def test_custom_protocol(tmp_path, monkeypatch):
+    monkeypatch.setattr(protocol, "_protocols", {})
+    (tmp_path / "auction.json").write_text(json.dumps({
+        "name": "auction",
+        "openers": ["claim"],
+        "replies": {"claim": ["claim", "concede"], "concede": []}
+    }))
+    assert protocol.load_protocols(str(tmp_path)) == ["auction"]
+    assert "persuasion" in protocol.list_protocols()
+
+    d = create_dialogue("auction", "lot 7", ["A", "B"])
+    d = make_move(d, SpeechAct("A", "claim", "100"))
+    assert not is_valid_move(d, SpeechAct("B", "why", "100"))
+    assert legal_moves(d)["acts"] == ["claim", "concede"]
+
+def test_invalid_protocol_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(protocol, "_protocols", {})
+    (tmp_path / "broken.json").write_text(json.dumps({"name": "broken"}))
+    with pytest.raises(ValueError, match="broken.json"):
+        protocol.load_protocols(str(tmp_path))
+
+def test_unknown_dialogue_type_is_rejected():
+    with pytest.raises(ValueError, match="Unknown dialogue type: persuation.*persuasion"):
+        protocol.get_protocol("persuation")
+    with pytest.raises(ValueError, match="Unknown dialogue type"):
+        create_dialogue("persuation", "topic", ["P", "O"])
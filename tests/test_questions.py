@@ -0,0 +1,64 @@
+import pytest
+from warrant_mcp.core.questions import (
+    create_tracker,
+    open_instance,
+    answer_question,
+    query_questions,
+    count_questions,
+    forget_instance
+)
+from warrant_mcp.sessions import SessionStore
+
+def test_open_instance_indexes_all_questions():
+    t = create_tracker()
+    inst = open_instance(t, "analogy", "Go is like Rust")
+    assert list(inst.questions) == ["CQ1", "CQ2", "CQ3"]
+    assert count_questions(t) == {"open": {"analogy": 3}, "failed": {}}
+
+def test_answers_move_between_indexes():
+    t = create_tracker()
+    a = open_instance(t, "analogy", "A")
+    b = open_instance(t, "expert_opinion", "B")
+
+    answer_question(t, a.id, "CQ1", "Yes, same runtime", True)
+    cq = answer_question(t, a.id, "CQ2", "GC differs", False)
+    assert cq.satisfied is False and cq.answer == "GC differs"
+
+    open_analogy = query_questions(t, "open", "analogy")
+    assert [q["id"] for q in open_analogy] == ["CQ3"]
+    failed = query_questions(t, "failed")
+    assert [(q["instance"], q["id"]) for q in failed] == [(a.id, "CQ2")]
+    assert len(query_questions(t, "open")) == 1 + len(b.questions)
+    assert len(query_questions(t, "open", limit=2)) == 2
+
+    # Re-answering a failed question as satisfied clears it
+    answer_question(t, a.id, "CQ2", "Not relevant here", True)
+    assert query_questions(t, "failed") == []
+
+def test_catalog_scheme_is_not_mutated():
+    from warrant_mcp.core.walton import get_scheme
+    t = create_tracker()
+    inst = open_instance(t, "sign", "S")
+    answer_question(t, inst.id, "CQ1", "weak", False)
+    assert get_scheme("sign").criticalQuestions[0].satisfied is None
+
+def test_errors():
+    t = create_tracker()
+    with pytest.raises(ValueError):
+        open_instance(t, "nope", "x")
+    inst = open_instance(t, "sign", "S")
+    with pytest.raises(ValueError):
+        answer_question(t, inst.id, "CQ9", "a", True)
+    with pytest.raises(ValueError):
+        query_questions(t, "satisfied")
+
+def test_evicted_instances_leave_the_indexes():
+    t = None
+    store = SessionStore(max_sessions=1, on_evict=lambda k, inst: forget_instance(t, inst))
+    t = create_tracker(store)
+    a = open_instance(t, "analogy", "A")
+    answer_question(t, a.id, "CQ1", "No", False)
+    b = open_instance(t, "analogy", "B")
+    assert a.id not in store and b.id in store
+    assert count_questions(t) == {"open": {"analogy": 3}, "failed": {}}
+    assert {q["instance"] for q in query_questions(t, "open")} == {b.id}
@@ -0,0 +1,212 @@
+import asyncio
+from warrant_mcp import server
+from warrant_mcp.persistence import DialogueJournal, JournaledLog
+from warrant_mcp.sessions import NODE_BYTES
+from warrant_mcp.core import dung, prakken
+from warrant_mcp.core.prakken import SpeechAct
+
+def test_concurrent_moves_are_serialized():
+    async def run():
+        d = await server.create_dialogue("topic", ["P", "O"])
+        await server.dialogue_move(d["id"], "P", "claim", "safe")
+
+        async def challenge(i):
+            return await server.dialogue_move(d["id"], "O", "claim", f"unsafe{i}")
+
+        results = await asyncio.gather(*(challenge(i) for i in range(20)))
+        return d["id"], results
+
+    dialogue_id, results = asyncio.run(run())
+    assert server.dialogue_sessions.get(dialogue_id).length == 21
+    assert sorted(r["moveCount"] for r in results) == list(range(2, 22))
+
+def test_expected_move_count_rejects_stale_move():
+    async def run():
+        d = await server.create_dialogue("topic", ["P", "O"])
+        await server.dialogue_move(d["id"], "P", "claim", "safe")
+        stale = await server.dialogue_move(
+            d["id"], "O", "why", "safe", expected_move_count=0
+        )
+        fresh = await server.dialogue_move(
+            d["id"], "O", "why", "safe", expected_move_count=1
+        )
+        return stale, fresh
+
+    stale, fresh = asyncio.run(run())
+    assert stale["moveCount"] == 1 and "error" in stale
+    assert fresh["moveCount"] == 2
+
+def test_bad_since_move_leaves_dialogue_unchanged():
+    async def run():
+        d = await server.create_dialogue("topic", ["P", "O"])
+        bad = await server.dialogue_move(d["id"], "P", "claim", "safe", since_move=5)
+        good = await server.dialogue_move(d["id"], "P", "claim", "safe", since_move=0)
+        return d["id"], bad, good
+
+    dialogue_id, bad, good = asyncio.run(run())
+    assert bad == {"error": "since_move must be between 0 and 0"}
+    assert good["moveCount"] == 1 and len(good["moves"]) == 1
+    assert server.dialogue_sessions.get(dialogue_id).length == 1
+
+def test_ids_continue_after_advance():
+    prakken.advance_counter(500)
+    assert int(prakken.next_dialogue_id().rsplit("_", 1)[1]) > 500
+
+def test_compact_extensions_match_names():
+    args = ["c", "a", "b", "d"]
+    attacks = [["a", "b"], ["b", "a"], ["c", "d"]]
+    plain = asyncio.run(server.compute_extensions(args, attacks))
+    indices = asyncio.run(server.compute_extensions(args, attacks, encoding="indices"))
+    bitmask = asyncio.run(server.compute_extensions(args, attacks, encoding="bitmask"))
+
+    names = indices["arguments"]
+    assert names == ["a", "b", "c", "d"] and bitmask["arguments"] == names
+    assert [names[i] for i in indices["grounded"]] == plain["grounded"] == ["c"]
+    for semantics in ["preferred", "stable"]:
+        assert [[names[i] for i in e] for e in indices[semantics]] == plain[semantics]
+        decoded = [dung.mask_to_indices(dung.base64_to_mask(e)) for e in bitmask[semantics]]
+        assert decoded == indices[semantics]
+    assert "encoding" not in plain
+
+def test_compact_scores_are_parallel():
+    args, attacks = ["b", "a"], [["a", "b"]]
+    plain = asyncio.run(server.score_arguments(args, attacks))
+    compact = asyncio.run(server.score_arguments(args, attacks, encoding="indices"))
+    assert compact["arguments"] == ["a", "b"]
+    assert compact["scores"] == [plain["scores"]["a"], plain["scores"]["b"]]
+
+def test_unknown_encoding():
+    result = asyncio.run(server.compute_extensions(["a"], [], encoding="msgpack"))
+    assert "Unknown encoding" in result["error"]
+    assert "error" in asyncio.run(server.score_arguments(["a"], [], encoding="msgpack"))
+
+def test_restart_indexes_commitments_without_history(tmp_path, monkeypatch):
+    ids = []
+    # "cars" has a snapshot after two moves, "bikes" none at all
+    for topic, every in [("cars", 2), ("bikes", 1000)]:
+        journal = DialogueJournal(str(tmp_path), snapshot_every=every)
+        d = prakken.create_dialogue("persuasion", topic, ["P", "O"])
+        journal.create(d)
+        for move in [SpeechAct("P", "claim", "safe"), SpeechAct("O", "why", "safe"),
+                     SpeechAct("P", "since", "safe", [f"{topic}-data"])]:
+            d = prakken.make_move(d, move)
+            journal.append(d)
+        ids.append(d.id)
+
+    def no_history(self):
+        raise AssertionError("history parsed during startup")
+
+    monkeypatch.setattr(server, "journal", None)
+    monkeypatch.setattr(server, "_commitments", None)
+    monkeypatch.setattr(JournaledLog, "_history", no_history)
+    assert server.enable_persistence(str(tmp_path)) == 2
+
+    result = server.find_commitments(proposition="bikes-data")
+    assert result["committed"] == [{"dialogue": ids[1], "participant": "P"}]
+    assert server.find_commitments(topic="cars")["topicDialogues"] == [ids[0]]
+
+def test_classify_claims_reports_bad_lines(tmp_path):
+    path = tmp_path / "claims.jsonl"
+    path.write_text(
+        '{"id": "a", "claim": "Experts agree it is safe"}\n'
+        '{"claim": "broken\n'
+        '\n'
+        '["not", "an", "object"]\n'
+        '{"id": "b", "claim": "This will lead to serious consequences"}\n'
+    )
+    result = asyncio.run(server.classify_claims(input_path=str(path)))
+    items = result["results"]
+    assert [i["index"] for i in items] == [0, 1, 2, 3]
+    assert [i.get("line") for i in items] == [1, 2, 4, 5]
+    assert "Invalid JSON" in items[1]["error"] and "object" in items[2]["error"]
+    assert items[0]["id"] == "a" and items[3]["id"] == "b"
+    assert result["frequencies"]["processed"] == 4
+    assert result["frequencies"]["errors"] == 2
+
+    inline = asyncio.run(server.classify_claims(claims=[{"claim": "x"}, "oops"]))
+    assert "error" in inline["results"][1] and "matches" in inline["results"][0]
+
+def test_batch_file_errors_are_reported(tmp_path, monkeypatch):
+    missing = str(tmp_path / "missing.jsonl")
+    result = asyncio.run(server.build_arguments_batch(input_path=missing, output_path=str(tmp_path / "out.jsonl")))
+    assert "Cannot access" in result["error"]
+    result = asyncio.run(server.classify_claims(input_path=missing))
+    assert "Cannot access" in result["error"]
+
+    (tmp_path / "in.jsonl").write_text('{"claim": "x", "data": []}\n')
+    result = asyncio.run(server.build_arguments_batch(
+        input_path=str(tmp_path / "in.jsonl"), output_path=str(tmp_path / "no" / "out.jsonl")
+    ))
+    assert "Cannot access" in result["error"]
+
+    monkeypatch.setattr(server, "FILES_DIR", str(tmp_path))
+    result = asyncio.run(server.build_arguments_batch(input_path="in.jsonl", output_path="out.jsonl"))
+    assert result["summary"]["processed"] == 1 and (tmp_path / "out.jsonl").exists()
+    result = asyncio.run(server.classify_claims(input_path="../in.jsonl"))
+    assert "outside WARRANT_FILES_DIR" in result["error"]
+
+def test_batch_output_cannot_overwrite_its_input(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "FILES_DIR", None)
+    corpus = tmp_path / "in.jsonl"
+    corpus.write_text('{"claim": "x", "data": []}\n')
+    alias = tmp_path / "sub" / ".." / "in.jsonl"
+    (tmp_path / "sub").mkdir()
+    result = asyncio.run(server.build_arguments_batch(
+        input_path=str(corpus), output_path=str(alias)
+    ))
+    assert "must differ" in result["error"]
+    result = asyncio.run(server.classify_claims(input_path=str(corpus), output_path=str(corpus)))
+    assert "must differ" in result["error"]
+    assert corpus.read_text() == '{"claim": "x", "data": []}\n'
+
+def test_classify_defeaters_reports_bad_items():
+    result = asyncio.run(server.classify_defeaters([
+        {"target": "A", "content": "c1", "type": "rebutting", "evidence_type": "certain"},
+        {"content": "no target", "type": "rebutting"},
+        "not an object",
+        {"target": "A", "content": "c2", "type": "undercuting"}
+    ]))
+    first, missing, wrong, typo = result["defeaters"]
+    assert first["penalty"] == 0.15
+    assert missing == {"index": 1, "error": "Missing or non-string field: target"}
+    assert wrong["index"] == 2 and "error" in wrong
+    assert "Unknown type: undercuting" in typo["warning"]
+    a = result["targets"]["A"]
+    assert a["count"] == 2 and a["rebutting"] == 1 and a["unknown"] == 1
+
+def test_main_loads_protocols_before_stored_dialogues(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setenv("WARRANT_PROTOCOLS_DIR", str(tmp_path / "protocols"))
+    monkeypatch.setenv("WARRANT_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.delenv("WARRANT_SCHEMES_DIR", raising=False)
+    monkeypatch.setattr(server.protocol, "load_protocols", lambda d: calls.append("protocols"))
+    monkeypatch.setattr(server, "enable_persistence", lambda d: calls.append("persistence"))
+    monkeypatch.setattr(server.mcp, "run", lambda: calls.append("run"))
+    server.main()
+    assert calls == ["protocols", "persistence", "run"]
+
+def test_graph_size_follows_its_nodes():
+    async def run():
+        g = server.create_argument_graph()
+        before = server.graph_sessions.stats()["approxBytes"]
+        node = await server.add_graph_argument(g["id"], "claim", [{"content": "d", "type": "objective"}])
+        await server.add_graph_defeater(g["id"], node["node"]["id"], "no", "rebutting")
+        return before, server.graph_sessions.stats()["approxBytes"]
+
+    before, after = asyncio.run(run())
+    assert after == before + 2 * NODE_BYTES
+
+def test_classify_claims_bounds_workers(monkeypatch):
+    seen = []
+
+    def fake(pairs, workers):
+        seen.append(workers)
+        return ([] for _ in pairs)
+
+    monkeypatch.setattr(server.walton, "classify_claims", fake)
+    monkeypatch.setattr(server.solvers, "workers", 4)
+    claims = [{"claim": "x"}]
+    assert "error" in asyncio.run(server.classify_claims(claims=claims, workers=0))
+    asyncio.run(server.classify_claims(claims=claims, workers=100000))
+    asyncio.run(server.classify_claims(claims=claims, workers=2))
+    assert seen == [4, 2]
@@ -0,0 +1,53 @@
+from warrant_mcp.sessions import SessionStore
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_lru_eviction_by_count():
+    evicted = []
+    store = SessionStore(max_sessions=2, on_evict=lambda k, v: evicted.append(k))
+    store["a"] = 1
+    store["b"] = 2
+    store.get("a")
+    store["c"] = 3
+    assert evicted == ["b"]
+    assert "a" in store and "c" in store
+    assert store.stats()["evictedCount"] == 1
+
+def test_byte_budget_keeps_newest():
+    store = SessionStore(max_bytes=100, size_of=lambda v: v)
+    store["a"] = 60
+    store["b"] = 60
+    assert list(store) == ["b"]
+    # A single oversized session is kept rather than dropped on its own write
+    store["c"] = 500
+    assert list(store) == ["c"]
+    assert store.stats()["approxBytes"] == 500
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    store = SessionStore(ttl=10, clock=clock)
+    store["a"] = 1
+    clock.now = 5
+    store["b"] = 2
+    clock.now = 12
+    assert store.get("a") is None
+    assert store.get("b") == 2
+    assert store.stats()["expired"] == 1
+
+def test_loader_brings_back_evicted():
+    spilled = {}
+    store = SessionStore(
+        max_sessions=1,
+        on_evict=lambda k, v: spilled.__setitem__(k, v),
+        loader=spilled.get
+    )
+    store["a"] = "first"
+    store["b"] = "second"
+    assert "a" not in store
+    assert store.get("a") == "first"
+    assert store.stats()["reloads"] == 1
@@ -1,7 +1,11 @@
+import pytest
 from warrant_mcp.core.toulmin import (
     create_argument,
     validate_argument,
     score_argument,
+    evaluate_records,
+    evaluate_jsonl,
+    summarize_results,
     Evidence
 )
 
@@ -69,3 +73,44 @@ def test_score_argument():
     )
     score_uncertain = score_argument(arg_uncertain)
     assert score.total > score_uncertain.total
+
+def test_evaluate_records():
+    results = list(evaluate_records([
+        {"id": "a1", "claim": "X", "data": [{"content": "E", "type": "certain"}], "warrant": "W"},
+        {"claim": "", "data": ["E"]},
+        {"claim": "X", "data": [{"content": "E", "kind": "bogus"}]}
+    ]))
+    assert results[0]["id"] == "a1"
+    assert results[0]["valid"] and results[0]["strength"] == "moderate"
+    assert not results[1]["valid"]
+    assert "error" in results[2]
+
+    summary = summarize_results(results)
+    assert summary["processed"] == 3
+    assert summary["valid"] == 1
+    assert summary["errors"] == 1
+
+def test_evaluate_jsonl_streams_in_chunks():
+    import io
+    import json
+    lines = [json.dumps({"claim": f"C{i}", "data": ["E"]}) for i in range(25)]
+    lines.insert(3, "{not json")
+    source = io.StringIO("\n".join(lines) + "\n\n")
+    sink = io.StringIO()
+
+    summary = evaluate_jsonl(source, sink, chunk_size=4)
+    out = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert summary["processed"] == 26
+    assert summary["valid"] == 25
+    assert summary["errors"] == 1
+    assert len(out) == 26
+    assert out[3]["line"] == 4 and "error" in out[3]
+    assert out[-1]["line"] == 26
+
+def test_score_argument_rebuttal_penalty():
+    arg = create_argument(claim="X", data=[Evidence(content="E1", type="certain")])
+    base = score_argument(arg)
+    penalized = score_argument(arg, rebuttal_penalty=0.1)
+    assert penalized.rebuttalPenalty == 0.1
+    assert penalized.total == pytest.approx(base.total - 0.1)
+    assert score_argument(arg, rebuttal_penalty=5.0).total == 0.0
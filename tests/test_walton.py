@@ -0,0 +1,119 @@
+import json
+import pytest
+from warrant_mcp.core import walton
+from warrant_mcp.core.walton import (
+    identify_scheme,
+    match_indicators,
+    get_scheme,
+    list_schemes,
+    scheme_summaries,
+    schemes_for_keyword,
+    load_schemes,
+    classify_claims,
+    scheme_frequencies
+)
+
+def test_get_scheme():
+    s = get_scheme("expert_opinion")
+    assert s.name == "Argument from Expert Opinion"
+    assert len(s.criticalQuestions) == 6
+    assert get_scheme("missing") is None
+    assert "sunk_cost" in list_schemes()
+
+def test_identify_scheme_ranks_matches():
+    matches = identify_scheme(
+        "According to the expert study, we should migrate",
+        "research shows it"
+    )
+    assert matches[0]["scheme"] == "expert_opinion"
+    assert matches[0]["matched"] == ["according to", "expert", "study", "research shows"]
+    assert matches[0]["confidence"] == 0.8
+    assert {"practical_reasoning"} < {m["scheme"] for m in matches}
+
+def test_word_boundaries():
+    # "like" must not fire inside "likely", nor "must" inside "mustard"
+    assert identify_scheme("It is likely to pass the mustard test", "") == []
+    assert match_indicators("Works LIKE a charm") == {"analogy": ["like"]}
+
+def test_inflected_keywords_match():
+    # Whole-word matching must not lose plurals and verb forms
+    assert match_indicators("Experts agree") == {"expert_opinion": ["expert"]}
+    assert match_indicators("Two studies and an expert") == {"expert_opinion": ["study", "expert"]}
+    assert match_indicators("The consequences are clear") == {"consequences": ["consequence"]}
+    assert match_indicators("Symptoms appeared") == {"sign": ["symptom"]}
+    assert match_indicators("Our goals") == {"practical_reasoning": ["goal"]}
+    assert match_indicators("the expertise, the mustard") == {}
+
+def test_multiword_keywords_span_whitespace():
+    assert match_indicators("this   leads\nto outages") == {"consequences": ["leads to"]}
+
+def test_catalog_is_shared_and_frozen():
+    import dataclasses
+    s = get_scheme("analogy")
+    assert get_scheme("analogy") is s
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        s.name = "changed"
+    summary = {x.name: x for x in scheme_summaries()}["analogy"]
+    assert summary.title == "Argument from Analogy"
+    assert summary.criticalQuestions == 3
+
+@pytest.fixture
+def restore_catalog(monkeypatch):
+    # Loading swaps the module-level catalog; put the built-ins back after
+    for name in ["_catalog", "_indicators", "_summaries", "_matcher"]:
+        monkeypatch.setattr(walton, name, getattr(walton, name))
+
+def test_load_custom_schemes(tmp_path, restore_catalog):
+    (tmp_path / "fear.json").write_text(json.dumps({
+        "key": "fear_appeal",
+        "name": "Argument from Fear Appeal",
+        "majorPremise": "If you do A, then B will happen.",
+        "minorPremise": "B is very bad for you.",
+        "conclusion": "Therefore, you should not do A.",
+        "criticalQuestions": ["Is B really that bad?", {"id": "CQ2", "question": "Will A cause B?"}],
+        "indicators": ["dire risk", "catastrophe"]
+    }))
+    (tmp_path / "more.toml").write_text(
+        '[[schemes]]\n'
+        'key = "waste"\n'
+        'majorPremise = "M"\n'
+        'minorPremise = "m"\n'
+        'conclusion = "C"\n'
+        'criticalQuestions = [["CQ1", "Q?"]]\n'
+        'indicators = ["catastrophe", "squander"]\n'
+    )
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    assert sorted(load_schemes(str(tmp_path))) == ["fear_appeal", "waste"]
+    assert get_scheme("fear_appeal").criticalQuestions[0].id == "CQ1"
+    assert {x.name for x in scheme_summaries()} >= {"fear_appeal", "waste", "analogy"}
+    assert schemes_for_keyword("Catastrophe") == ["fear_appeal", "waste"]
+
+    matches = identify_scheme("This is a dire   risk", "")
+    assert matches[0]["scheme"] == "fear_appeal"
+    assert matches[0]["confidence"] == 0.5
+
+def test_load_invalid_scheme(tmp_path):
+    (tmp_path / "bad.json").write_text(json.dumps({"key": "bad"}))
+    with pytest.raises(ValueError, match="bad.json"):
+        load_schemes(str(tmp_path))
+
+def test_classify_claims_in_order():
+    pairs = [
+        ("We should migrate", ""),
+        ("Nothing here", ""),
+        ("According to the expert", "it leads to outages")
+    ]
+    results = list(classify_claims(pairs))
+    assert results == [identify_scheme(c, ctx) for c, ctx in pairs]
+
+    freq = scheme_frequencies(results)
+    assert freq["processed"] == 3
+    assert freq["unmatched"] == 1
+    assert freq["top"] == {"practical_reasoning": 1, "expert_opinion": 1}
+    assert freq["matched"]["consequences"] == 1
+
+def test_classify_claims_process_pool():
+    pairs = [(f"claim {i} should be like the expert said", "") for i in range(50)]
+    parallel = list(classify_claims(iter(pairs), workers=2, chunk_size=7))
+    assert parallel == list(classify_claims(pairs, workers=1))